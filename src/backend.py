@@ -0,0 +1,207 @@
+import sympy as sp
+import numpy as np
+from fractions import Fraction
+from math import lcm
+from src.sparse import SparseMatrix
+
+try:
+    # Optional: GMP integers make exact arithmetic on values beyond int64 several times faster
+    from gmpy2 import mpz as big_int
+except ImportError:
+    big_int = int
+
+# Element kinds, from cheapest to most general arithmetic
+EXACT = "exact"
+FLOAT = "float"
+SYMBOLIC = "symbolic"
+
+def element_kind(x):
+    """Classifies a single matrix element as exact, float or symbolic."""
+    kind = _TYPE_KINDS.get(type(x))
+    if kind is not None:
+        return kind
+    if isinstance(x, (int, Fraction, np.integer)):
+        return EXACT
+    if isinstance(x, (float, complex, np.floating, np.complexfloating)):
+        return FLOAT
+    if isinstance(x, sp.Rational):
+        return EXACT
+    if isinstance(x, sp.Float):
+        return FLOAT
+    # Numbers such as 1.5 + 2*I are already approximate, so they can go through floats
+    if isinstance(x, sp.Basic) and x.is_number and x.has(sp.Float):
+        return FLOAT
+    return SYMBOLIC
+
+# Element types whose kind follows from the type alone (the common case, checked first)
+_TYPE_KINDS = {int: EXACT, Fraction: EXACT, float: FLOAT, complex: FLOAT, sp.Integer: EXACT, sp.Rational: EXACT,
+               sp.Float: FLOAT, type(sp.S.Zero): EXACT, type(sp.S.One): EXACT, type(sp.S.NegativeOne): EXACT,
+               type(sp.S.Half): EXACT, type(big_int(0)): EXACT}
+
+def matrix_kind(matrix):
+    """Returns the most general element kind found in a matrix."""
+    if isinstance(matrix, SparseMatrix):
+        # The implicit zeros are exact, so only the stored values matter
+        return matrix_kind(matrix.values.reshape(1, -1))
+    if is_numeric_array(matrix):
+        return FLOAT if matrix.dtype.kind in "fc" else EXACT
+    kinds = set()
+    for row in matrix:
+        for x in row:
+            kind = element_kind(x)
+            if kind == SYMBOLIC:
+                return SYMBOLIC
+            kinds.add(kind)
+    return FLOAT if FLOAT in kinds else EXACT
+
+def is_numeric_array(matrix):
+    """True for the compact NumPy arrays parse_matrix builds from plain numbers."""
+    return isinstance(matrix, np.ndarray) and matrix.dtype.kind in "biufc"
+
+def to_rows(matrix):
+    """Returns a matrix as a list of row lists (arrays are converted)."""
+    matrix = dense(matrix)
+    return matrix.tolist() if isinstance(matrix, np.ndarray) else matrix
+
+def dense(matrix):
+    """Expands a sparse matrix for operations without sparse support; other matrices pass through."""
+    return matrix.to_dense() if isinstance(matrix, SparseMatrix) else matrix
+
+def to_array(matrix):
+    """NumPy array of any dense matrix: numeric when possible, else of SymPy objects."""
+    arrays = numeric_arrays([matrix])
+    if arrays is not None:
+        return arrays[0]
+    array = np.empty((len(matrix), len(matrix[0])), dtype=object)
+    array[:] = [list(row) for row in matrix]
+    return array
+
+def to_float_array(matrix):
+    """Converts a numeric matrix to a float (or complex) NumPy array."""
+    matrix = dense(matrix)
+    if is_numeric_array(matrix) and matrix.dtype.kind == "c":
+        return matrix.astype(complex)
+    try:
+        return np.array(matrix, dtype=float)
+    except TypeError:
+        return np.array([[complex(x) for x in row] for row in matrix], dtype=complex)
+
+def to_fraction(x):
+    """Converts an exact element to a Python int or Fraction."""
+    if isinstance(x, (int, Fraction)):
+        return x
+    if isinstance(x, np.integer):
+        return int(x)
+    if isinstance(x, sp.Integer):
+        return int(x)
+    return Fraction(int(x.p), int(x.q))
+
+def ratio(x):
+    """Numerator and denominator of an exact element as Python ints."""
+    if isinstance(x, sp.Rational):
+        return int(x.p), int(x.q)
+    if isinstance(x, Fraction):
+        return x.numerator, x.denominator
+    return int(x), 1
+
+def to_sympy(q):
+    """Converts a Python int or Fraction back to a SymPy number."""
+    if isinstance(q, Fraction):
+        return sp.Rational(q.numerator, q.denominator)
+    return sp.Integer(q)
+
+# --- NumPy fast path for purely numeric matrices ---
+
+INT64_MAX = np.iinfo(np.int64).max
+
+def is_integer_matrix(matrix):
+    """Checks whether every element is an integer."""
+    if isinstance(matrix, SparseMatrix):
+        return is_integer_matrix(matrix.values.reshape(1, -1))
+    if is_numeric_array(matrix):
+        return matrix.dtype.kind in "biu"
+    return all(isinstance(x, (int, np.integer, sp.Integer, big_int)) for row in matrix for x in row)
+
+def to_int_array(matrix):
+    """Converts an integer matrix to int64, or to Python-int objects if it does not fit."""
+    matrix = dense(matrix)
+    try:
+        return np.array(matrix, dtype=np.int64)
+    except OverflowError:
+        return np.array([[int(x) for x in row] for row in matrix], dtype=object)
+
+def numeric_arrays(matrices):
+    """Returns NumPy arrays for all-numeric input, or None when SymPy is needed."""
+    return _numeric_arrays(matrices, [matrix_kind(m) for m in matrices])
+
+def _numeric_arrays(matrices, kinds):
+    if SYMBOLIC in kinds:
+        return None
+    if FLOAT in kinds:
+        return [to_float_array(m) for m in matrices]
+    if all(is_integer_matrix(m) for m in matrices):
+        return [to_int_array(m) for m in matrices]
+    # Rationals stay exact through SymPy (or scaled_arrays)
+    return None
+
+def max_abs(a):
+    """Largest absolute value in an integer array, as a Python int."""
+    if a.size == 0:
+        return 0
+    return max(abs(int(a.max())), abs(int(a.min())))
+
+def overflow_safe(A, B, op):
+    """Promotes int64 operands to Python-int object arrays when op could overflow."""
+    if np.int64 not in (A.dtype, B.dtype):
+        return A, B
+    a, b = max_abs(A), max_abs(B)
+    bound = {"add": a + b, "multiply": a * b, "matmul": a * b * A.shape[-1]}[op]
+    if bound > INT64_MAX:
+        return A.astype(object), B.astype(object)
+    return A, B
+
+def from_array(a):
+    """Converts an array back to the list-of-lists shape used by the GUI."""
+    return a.tolist()
+
+# --- Exact rational fast path: integer arrays over a common denominator ---
+
+def scaled_arrays(matrices):
+    """numeric_arrays that also covers rational input; returns (arrays, d, exact) or None when SymPy is needed.
+
+    Each matrix equals its array / d. Integer and float input comes back
+    with d = 1; rational matrices are brought to one common denominator so
+    their arithmetic runs on int64 (or big integers) instead of SymPy
+    numbers. exact is True when the input is exact and holds SymPy numbers,
+    so from_scaled gives back SymPy numbers, as the SymPy path would.
+    """
+    kinds = [matrix_kind(m) for m in matrices]
+    arrays = _numeric_arrays(matrices, kinds)
+    if arrays is not None:
+        return arrays, 1, FLOAT not in kinds and any(_holds_sympy(m) for m in matrices)
+    if SYMBOLIC in kinds:
+        return None
+    parts = [[[ratio(x) for x in row] for row in to_rows(m)] for m in matrices]
+    d = lcm(*(q for part in parts for row in part for _, q in row))
+    return [to_big_int_array([[p * (d // q) for p, q in row] for row in part]) for part in parts], d, True
+
+def _holds_sympy(matrix):
+    return not is_numeric_array(matrix) and any(isinstance(x, sp.Basic) for row in matrix for x in row)
+
+def to_big_int_array(rows):
+    """to_int_array, with big_int elements when the values do not fit int64."""
+    a = to_int_array(rows)
+    if a.dtype == object and big_int is not int:
+        a = np.frompyfunc(big_int, 1, 1)(a)
+    return a
+
+def from_scaled(a, d, exact):
+    """List rows of the values a / d (see scaled_arrays): sp.Integer/sp.Rational when exact, machine numbers otherwise."""
+    if not exact:
+        # Machine numbers are never scaled (d = 1)
+        return from_array(a)
+    if a.dtype != object and d <= INT64_MAX:
+        g = np.gcd(a, d)
+        return [[sp.Integer(p) if q == 1 else sp.Rational(p, q) for p, q in zip(nums, dens)]
+                for nums, dens in zip((a // g).tolist(), (d // g).tolist())]
+    return [[sp.Rational(int(x), d) for x in row] for row in a.tolist()]
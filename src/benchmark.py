@@ -0,0 +1,301 @@
+"""Benchmark harness for the matrix engine.
+
+Times every public operation in src/logic.py (plus parsing and result
+formatting) for integer, float, rational and symbolic input, doubling the
+size from 2x2 until a run exceeds the time budget. Each measurement runs in
+a worker process so a runaway case can be stopped at the timeout.
+
+Usage: python -m src.benchmark [-o results.json] [--baseline old.json] [--ops ...] [--kinds ...]
+       python -m src.benchmark --scaling [--workers N] [--kinds ...]
+
+Results are JSON; with --baseline, cases that got slower than the tolerance
+are flagged and the exit status is 1. --scaling instead times one large
+multiplication per kind with 1, 2, 4, ... block workers (see src/parallel.py)
+and reports the speedup over one worker.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import sympy as sp
+import src.logic as logic
+from src import parallel
+from src.jobs import JobRunner
+
+KINDS = ("int", "float", "rational", "bigint", "symbolic")
+SIZES = (2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+
+# Results below this many seconds are too noisy to flag as regressions
+NOISE_FLOOR = 1e-3
+
+def matrix_text(kind, n, m=None, seed=0):
+    """Generates matrix input text of the given element kind, as typed in the GUI."""
+    rng = random.Random(f"{kind}-{n}-{m}-{seed}")
+    m = m or n
+
+    def element(i, j):
+        if kind == "float":
+            return f"{rng.uniform(-10, 10):.6f}"
+        if kind == "rational":
+            return f"{rng.randint(-9, 9)}/{rng.randint(1, 9)}"
+        if kind == "bigint":
+            # Products overflow int64
+            return str(rng.randint(-10**12, 10**12))
+        if kind == "symbolic" and (i + j) % 5 == 0:
+            return "x"
+        return str(rng.randint(-9, 9))
+
+    return "\n".join(", ".join(element(i, j) for j in range(m)) for i in range(n))
+
+def build_matrix(kind, n, seed=0):
+    return logic.parse_matrix(matrix_text(kind, n, seed=seed))
+
+def spd_matrix(kind, n):
+    """A symmetric positive-definite matrix: A·Aᵀ + n·I, mirrored so rounding cannot break the symmetry."""
+    A = build_matrix(kind, n)
+    S = logic.multiply_matrices([A, logic.transpose(A)])
+    return [[S[i][j] + n if i == j else S[max(i, j)][min(i, j)] for j in range(n)] for i in range(n)]
+
+def chain(n, seed=0):
+    """A chain of n matrices of random small shapes, for planning the multiplication order."""
+    rng = random.Random(f"chain-{n}-{seed}")
+    dims = [rng.randint(1, 8) for _ in range(n + 1)]
+    return [[[0] * dims[i + 1] for _ in range(dims[i])] for i in range(n)]
+
+# .npy holds machine numbers exactly; the rest round-trips through .sym
+FILE_TYPES = {"int": ".npy", "float": ".npy", "rational": ".sym", "bigint": ".sym", "symbolic": ".sym"}
+
+def file_case(kind, n, load):
+    """Saving to, or loading from, a file of the kind's format; the third item deletes the file."""
+    handle, path = tempfile.mkstemp(suffix=FILE_TYPES[kind])
+    os.close(handle)
+    matrix = build_matrix(kind, n)
+    if load:
+        logic.save_matrix(matrix, path)
+        return logic.load_matrix, (path,), lambda: os.remove(path)
+    return logic.save_matrix, (matrix, path), lambda: os.remove(path)
+
+SCALARS = {"int": "3", "float": "1.5", "rational": "3/2", "bigint": "1000000000007", "symbolic": "y"}
+
+# Operation name -> function building (callable, args[, cleanup]) for a kind and size
+CASES = {
+    "parse_matrix": lambda k, n: (logic.parse_matrix, (matrix_text(k, n),)),
+    "format_matrix": lambda k, n: (logic.format_matrix, (build_matrix(k, n),)),
+    "add_matrices": lambda k, n: (logic.add_matrices, ([build_matrix(k, n), build_matrix(k, n, 1)],)),
+    "subtract_matrices": lambda k, n: (logic.subtract_matrices, ([build_matrix(k, n), build_matrix(k, n, 1)],)),
+    "multiply_matrices": lambda k, n: (logic.multiply_matrices, ([build_matrix(k, n), build_matrix(k, n, 1)],)),
+    "elementwise_multiply": lambda k, n: (logic.elementwise_multiply, ([build_matrix(k, n), build_matrix(k, n, 1)],)),
+    "scalar_multiply": lambda k, n: (logic.scalar_multiply, (build_matrix(k, n), sp.sympify(SCALARS[k]))),
+    "matrix_power": lambda k, n: (logic.matrix_power, (build_matrix(k, n), 8)),
+    "determinant": lambda k, n: (logic.determinant, (build_matrix(k, n),)),
+    "inverse": lambda k, n: (logic.inverse, (build_matrix(k, n),)),
+    "transpose": lambda k, n: (logic.transpose, (build_matrix(k, n),)),
+    "trace": lambda k, n: (logic.trace, (build_matrix(k, n),)),
+    "characteristics": lambda k, n: (logic.characteristics, (build_matrix(k, n),)),
+    "characteristic_polynomial": lambda k, n: (logic.characteristic_polynomial, (build_matrix(k, n),)),
+    "eigenvalues": lambda k, n: (logic.eigenvalues, (build_matrix(k, n), "exact")),
+    "eigenvalues_numeric": lambda k, n: (logic.eigenvalues, (build_matrix(k, n), "numeric")),
+    "eigenvectors": lambda k, n: (logic.eigenvectors, (build_matrix(k, n), "exact")),
+    "eigenvectors_numeric": lambda k, n: (logic.eigenvectors, (build_matrix(k, n), "numeric")),
+    "gauss_transformation": lambda k, n: (logic.gauss_transformation, (build_matrix(k, n),)),
+    "solve": lambda k, n: (logic.solve, (build_matrix(k, n), logic.parse_matrix(matrix_text(k, n, 4, seed=1)))),
+    "rref": lambda k, n: (logic.rref, (build_matrix(k, n),)),
+    "rank": lambda k, n: (logic.rank, (build_matrix(k, n),)),
+    "nullspace": lambda k, n: (logic.nullspace, (build_matrix(k, n),)),
+    "lu_decomposition": lambda k, n: (logic.lu_decomposition, (build_matrix(k, n),)),
+    "qr_decomposition": lambda k, n: (logic.qr_decomposition, (build_matrix(k, n),)),
+    "cholesky_decomposition": lambda k, n: (logic.cholesky_decomposition, (spd_matrix(k, n),)),
+    # The size is the chain length here; only the shapes are read
+    "multiplication_plan": lambda k, n: (logic.multiplication_plan, (chain(n),)),
+    "save_matrix": lambda k, n: file_case(k, n, load=False),
+    "load_matrix": lambda k, n: file_case(k, n, load=True),
+}
+
+def measure(operation, kind, size, repeat):
+    """Runs one case (in a worker process): best-of-repeat wall time and peak memory."""
+    func, args, *cleanup = CASES[operation](kind, size)
+    times = []
+    try:
+        for _ in range(repeat):
+            # Also empties the parse/format memos, so repeats of parse_matrix and format_matrix redo the work
+            logic.clear_cache()
+            start = time.perf_counter()
+            func(*args)
+            times.append(time.perf_counter() - start)
+        logic.clear_cache()
+        tracemalloc.start()
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        logic.clear_cache()
+    finally:
+        for remove in cleanup:
+            remove()
+    return {"seconds": min(times), "peak_bytes": peak}
+
+def run_case(runner, timeout, func, *args):
+    """Runs a measurement through the job runner, cancelling it after timeout seconds."""
+    job = runner.submit(func.__name__, func, *args)
+    while runner.busy():
+        runner.poll()
+        if job.status == "running" and job.elapsed() > timeout:
+            runner.cancel(job)
+            return {"error": f"timed out after {timeout:g} s"}
+        time.sleep(0.01)
+    if job.status == "failed":
+        return {"error": str(job.error)}
+    return job.result
+
+def run_benchmarks(operations, kinds, max_size, budget, timeout, repeat, log=None):
+    """Measures every operation/kind pair at doubling sizes until a run exceeds budget."""
+    runner = JobRunner()
+    results = []
+    try:
+        for operation in operations:
+            for kind in kinds:
+                previous = None
+                for size in (s for s in SIZES if s <= max_size):
+                    record = {"operation": operation, "kind": kind, "size": size}
+                    record.update(run_case(runner, timeout, measure, operation, kind, size, repeat))
+                    if "seconds" in record:
+                        record["elements_per_second"] = size * size / record["seconds"] if record["seconds"] else None
+                        if previous and previous["seconds"] > NOISE_FLOOR:
+                            # Local scaling exponent: t ~ n^k between consecutive sizes
+                            record["scaling_exponent"] = math.log(record["seconds"] / previous["seconds"]) / math.log(size / previous["size"])
+                    results.append(record)
+                    if log:
+                        log(format_record(record))
+                    if "error" in record or record["seconds"] > budget:
+                        break
+                    previous = record
+    finally:
+        runner.shutdown()
+    return results
+
+# --- Multi-core scaling of blocked multiplication ---
+
+# Matrix size of the scaling run per kind: about a second of work on one worker
+SCALING_SIZES = {"int": 2048, "float": 2048, "rational": 1024, "bigint": 2048, "symbolic": 32}
+
+def measure_scaling(kind, size, workers, repeat):
+    """Times multiply_matrices with the given number of block workers (in a worker process)."""
+    parallel.configure(workers)
+    # The first product starts the pool; each run gets new matrices so SymPy's cache cannot answer it
+    pairs = [(build_matrix(kind, size, 2 * r), build_matrix(kind, size, 2 * r + 1)) for r in range(repeat + 1)]
+    logic.multiply_matrices(list(pairs[0]))
+    times = []
+    for A, B in pairs[1:]:
+        start = time.perf_counter()
+        logic.multiply_matrices([A, B])
+        times.append(time.perf_counter() - start)
+    parallel.shutdown()
+    return {"seconds": min(times)}
+
+def worker_counts(max_workers):
+    """1, 2, 4, ... up to max_workers, always ending with max_workers."""
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    return counts + [max_workers] if max_workers > 1 else counts
+
+def run_scaling(kinds, max_workers, timeout, repeat, sizes=None, log=None):
+    """Measures the speedup of one large product per kind as the worker count doubles."""
+    runner = JobRunner()
+    results = []
+    try:
+        for kind in kinds:
+            size = (sizes or SCALING_SIZES)[kind]
+            base = None
+            for workers in worker_counts(max_workers):
+                record = {"operation": "multiply_matrices", "kind": kind, "size": size, "workers": workers}
+                record.update(run_case(runner, timeout, measure_scaling, kind, size, workers, repeat))
+                if "seconds" in record:
+                    base = base or record["seconds"]
+                    record["speedup"] = base / record["seconds"]
+                    record["efficiency"] = record["speedup"] / workers
+                results.append(record)
+                if log:
+                    log(format_record(record))
+                if "error" in record:
+                    break
+    finally:
+        runner.shutdown()
+    return results
+
+def format_record(record):
+    head = f"{record['operation']:<26} {record['kind']:<9} {record['size']:>5}"
+    if "workers" in record:
+        head += f"  {record['workers']:>3} workers"
+    if "error" in record:
+        return f"{head}  error: {record['error']}"
+    if "speedup" in record:
+        return f"{head}  {record['seconds']:>10.6f} s  speedup {record['speedup']:>5.2f}x  efficiency {record['efficiency']:>4.0%}"
+    exponent = record.get("scaling_exponent")
+    scaling = f"  n^{exponent:.2f}" if exponent is not None else ""
+    return f"{head}  {record['seconds']:>10.6f} s  {record['peak_bytes'] / 2**20:>9.2f} MiB{scaling}"
+
+def compare(results, baseline, tolerance):
+    """Returns the cases that are more than tolerance slower than in the baseline."""
+    def case(r):
+        return r["operation"], r["kind"], r["size"], r.get("workers")
+
+    reference = {case(r): r for r in baseline["results"] if "seconds" in r}
+    regressions = []
+    for record in results:
+        old = reference.get(case(record))
+        if old is None or "seconds" not in record or old["seconds"] < NOISE_FLOOR:
+            continue
+        ratio = record["seconds"] / old["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append({"operation": record["operation"], "kind": record["kind"],
+                                "size": record["size"], "baseline_seconds": old["seconds"],
+                                "seconds": record["seconds"], "ratio": ratio})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark", description="Benchmark the matrix engine.")
+    parser.add_argument("--ops", nargs="+", choices=list(CASES), default=list(CASES), help="operations to run")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, help="element kinds to run (default: all, or symbolic with --scaling)")
+    parser.add_argument("--max-size", type=int, default=SIZES[-1], help="largest matrix size to try")
+    parser.add_argument("--budget", type=float, default=1.0, help="stop growing a case once a run takes this many seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="cancel a single run after this many seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (the best is kept)")
+    parser.add_argument("-o", "--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a case is flagged (0.25 = 25%%)")
+    parser.add_argument("--scaling", action="store_true", help="measure multiplication speedup with 1, 2, 4, ... workers instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="most workers tried by --scaling (default: CPU count)")
+    parser.add_argument("--size", type=int, help="matrix size for --scaling (default: per kind, about a second on one worker)")
+    args = parser.parse_args(argv)
+
+    log = lambda line: print(line, flush=True)
+    if args.scaling:
+        sizes = {kind: args.size for kind in KINDS} if args.size else None
+        results = run_scaling(args.kinds or ["symbolic"], max(1, args.workers), args.timeout, args.repeat, sizes, log=log)
+    else:
+        results = run_benchmarks(args.ops, args.kinds or list(KINDS), args.max_size, args.budget, args.timeout, args.repeat, log=log)
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), args.tolerance)
+        for r in report["regressions"]:
+            print(f"REGRESSION {r['operation']} {r['kind']} {r['size']}: "
+                  f"{r['baseline_seconds']:.6f} s -> {r['seconds']:.6f} s ({r['ratio']:.2f}x)")
+        status = 1 if report["regressions"] else 0
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""Headless command-line entry point for the matrix engine.
+
+Reads batch scripts (files or stdin) that define matrices in the same text
+format as the GUI input boxes, followed by one operation per line:
+
+    # comments start with '#'
+    A:
+    1, 2
+    3, 4
+
+    B:
+    x  1
+    0  x
+
+    determinant A
+    multiply A B
+    power A 10
+    scalar B 1/2
+    solve A B
+    eval inv(A)*B + T(A)*B
+
+A matrix block starts with a 'NAME:' line and ends at the first blank line.
+'eval' takes the rest of the line as an expression over the matrices
+defined so far (see src/expression.py).
+Jobs are fanned out over a process pool and results are written as text or
+JSON, in input order.
+
+Usage: python -m src.cli [FILE ...] [--format text|json] [--workers N] [--matmul-workers N]
+                        [--eigen-mode auto|exact|numeric] [--digits N] [--simplify]
+                        [--timings] [-o OUT]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import sympy as sp
+import src.logic as logic
+from src import expression, parallel, profiling
+from src.sparse import SparseMatrix
+
+# Operation name -> (logic function, argument kind)
+#   "many":   a list of two or more matrices
+#   "one":    a single matrix
+#   "power":  a matrix and an integer or symbolic exponent
+#   "scalar": a matrix and a scalar
+#   "pair":   exactly two matrices
+#   "expression": an expression over any of the defined matrices
+OPERATIONS = {
+    "matrix_add": (logic.add_matrices, "many"),
+    "matrix_subtract": (logic.subtract_matrices, "many"),
+    "matrix_multiply": (logic.multiply_matrices, "many"),
+    "elementwise_multiply": (logic.elementwise_multiply, "many"),
+    "determinant": (logic.determinant, "one"),
+    "inverse": (logic.inverse, "one"),
+    "transpose": (logic.transpose, "one"),
+    "trace": (logic.trace, "one"),
+    "eigenvalues": (logic.eigenvalues, "one"),
+    "eigenvectors": (logic.eigenvectors, "one"),
+    "characteristics": (logic.characteristics, "one"),
+    "gauss_transformation": (logic.gauss_transformation, "one"),
+    "matrix_power": (logic.matrix_power, "power"),
+    "scalar_multiply": (logic.scalar_multiply, "scalar"),
+    "solve": (logic.solve, "pair"),
+    "rref": (logic.rref, "one"),
+    "rank": (logic.rank, "one"),
+    "nullspace": (logic.nullspace, "one"),
+    "lu_decomposition": (logic.lu_decomposition, "one"),
+    "qr_decomposition": (logic.qr_decomposition, "one"),
+    "cholesky_decomposition": (logic.cholesky_decomposition, "one"),
+    "expression": (expression.evaluate, "expression"),
+}
+
+ALIASES = {
+    "add": "matrix_add", "subtract": "matrix_subtract", "multiply": "matrix_multiply",
+    "elementwise": "elementwise_multiply", "det": "determinant", "inv": "inverse",
+    "power": "matrix_power", "scalar": "scalar_multiply", "gauss": "gauss_transformation",
+    "lu": "lu_decomposition", "qr": "qr_decomposition", "cholesky": "cholesky_decomposition",
+    "eval": "expression",
+}
+
+HEADER = re.compile(r'^([A-Za-z_]\w*)\s*:\s*$')
+
+def parse_script(text, source="<stdin>"):
+    """Parses a batch script into a list of job dicts."""
+    matrices, jobs = {}, []
+    name, rows = None, []
+
+    def close_block():
+        if name is not None:
+            matrices[name] = logic.parse_matrix("\n".join(rows))
+
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.split('#', 1)[0].strip()
+        where = f"{source}:{lineno}"
+        if name is not None:
+            if line:
+                rows.append(line)
+                continue
+            close_block()
+            name, rows = None, []
+            continue
+        if not line:
+            continue
+        header = HEADER.match(line)
+        if header:
+            name, rows = header.group(1), []
+            continue
+        words = line.split()
+        operation = ALIASES.get(words[0], words[0])
+        if operation not in OPERATIONS:
+            raise ValueError(f"{where}: unknown operation '{words[0]}'")
+        _, kind = OPERATIONS[operation]
+        if kind == "expression":
+            text = line.split(None, 1)[1] if len(words) > 1 else ""
+            try:
+                expr = expression.parse(text, {n: (len(m), len(m[0])) for n, m in matrices.items()})
+            except ValueError as e:
+                raise ValueError(f"{where}: {e}")
+            jobs.append({"source": where, "operation": operation, "names": expr.names,
+                         "matrices": [matrices[n] for n in expr.names], "argument": expr.text, "expression": expr})
+            continue
+        names = words[1:] if kind == "many" else words[1:3] if kind == "pair" else words[1:2]
+        missing = [n for n in names if n not in matrices]
+        if missing or not names:
+            raise ValueError(f"{where}: undefined matrix {', '.join(missing) or '(none given)'}")
+        if kind == "pair" and len(names) != 2:
+            raise ValueError(f"{where}: {operation} needs two matrices")
+        extra = " ".join(words[2:]) if kind in ("power", "scalar") else None
+        if kind in ("power", "scalar") and not extra:
+            raise ValueError(f"{where}: {operation} needs a {kind} argument")
+        jobs.append({"source": where, "operation": operation, "names": names,
+                     "matrices": [matrices[n] for n in names], "argument": extra})
+    close_block()
+    return jobs
+
+def run_job(job):
+    """Runs one job and returns a JSON-serializable record of its result or error."""
+    record = {"source": job["source"], "operation": job["operation"], "inputs": job["names"]}
+    if job["argument"] is not None:
+        record["argument"] = job["argument"]
+    func, kind = OPERATIONS[job["operation"]]
+    if job.get("matmul_workers"):
+        parallel.configure(job["matmul_workers"])
+    try:
+        if kind == "many":
+            args = (job["matrices"],)
+        elif kind == "expression":
+            args = (job["expression"], dict(zip(job["names"], job["matrices"])))
+        elif kind == "pair":
+            args = tuple(job["matrices"])
+        elif job["operation"] in ("eigenvalues", "eigenvectors"):
+            args = (job["matrices"][0], job.get("eigen_mode", "auto"), job.get("digits", 10), job.get("full_simplify", False))
+        elif kind == "one":
+            args = (job["matrices"][0],)
+        else:
+            argument = sp.sympify(job["argument"])
+            if argument == sp.zoo or argument == sp.nan:
+                raise ValueError(f"Division by zero in {kind} argument")
+            if kind == "power" and argument.is_number and not argument.is_Integer:
+                raise ValueError("Power must be an integer or a symbol such as n")
+            args = (job["matrices"][0], argument)
+        result, timing = profiling.run(job["operation"], func, args)
+        with profiling.stage("format", timing):
+            record["result"] = format_result(result, job.get("full_simplify", False))
+        if job.get("timings"):
+            record["timing"] = timing
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+def format_result(result, full_simplify=False):
+    """Converts a logic result into strings, lists and dicts only."""
+    if isinstance(result, str):
+        return result.rstrip("\n")
+    if isinstance(result, dict):
+        return {key: format_result(value, full_simplify) if isinstance(value, (list, SparseMatrix)) else
+                bool(value) if isinstance(value, np.bool_) else value for key, value in result.items()}
+    if isinstance(result, SparseMatrix):
+        return result.to_text(lambda x: logic.format_symbolic(x, full_simplify))
+    if isinstance(result, list):
+        return [[logic.format_symbolic(x, full_simplify) for x in row] for row in result]
+    return logic.format_symbolic(result, full_simplify)
+
+def render_text(record):
+    """Renders one job record in the same layout as the GUI Results tab."""
+    title = " ".join([record['operation'].replace('_', ' ').title()] + record['inputs'] + [record.get('argument', '')]).strip()
+    lines = [f"{'=' * 50}", f"[{record['source']}] {title}"]
+    if "error" in record:
+        lines.append(f"Error: {record['error']}")
+    else:
+        result = record["result"]
+        if isinstance(result, dict) and not any(isinstance(val, list) for val in result.values()):
+            lines += [f"  {prop.replace('_', ' ').title()}: {logic.format_property(val)}" for prop, val in result.items()]
+        elif isinstance(result, dict):
+            for name, factor in result.items():
+                lines += [f"{name} ="] + render_matrix(factor)
+        elif isinstance(result, list):
+            lines += render_matrix(result)
+        elif record["operation"] in ("eigenvalues", "eigenvectors") or "\n" in result:
+            lines.append(result)
+        else:
+            lines.append(f"Result: {result}")
+    if "timing" in record:
+        lines += profiling.format_record(record["timing"])
+    return "\n".join(lines)
+
+def render_matrix(rows):
+    """Lines of a formatted matrix with aligned columns."""
+    widths = [max(len(row[j]) for row in rows) for j in range(len(rows[0]))] if rows else []
+    return [f"[  {'  '.join(val.ljust(widths[j]) for j, val in enumerate(row))}  ]" for row in rows]
+
+def run_jobs(jobs, workers=None):
+    """Runs jobs, in parallel when more than one worker is requested, keeping input order."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return [run_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Run matrix operations without a display.")
+    parser.add_argument("files", nargs="*", help="batch scripts to run ('-' or none reads stdin)")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="output format")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--matmul-workers", type=int, default=None,
+                        help="processes per job for large products (default: the CPUs left over per parallel job)")
+    parser.add_argument("--eigen-mode", choices=logic.EIGEN_MODES, default="auto", help="eigen-solver mode (default: auto)")
+    parser.add_argument("--digits", type=int, default=10, help="significant digits for numeric eigen results")
+    parser.add_argument("--simplify", action="store_true", help="fully simplify symbolic results (slow)")
+    parser.add_argument("--timings", action="store_true", help="report per-stage and per-call timings of each job")
+    parser.add_argument("-o", "--output", help="write results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    jobs = []
+    try:
+        for path in args.files or ["-"]:
+            if path == "-":
+                jobs += parse_script(sys.stdin.read(), "<stdin>")
+            else:
+                with open(path, encoding="utf-8") as f:
+                    jobs += parse_script(f.read(), path)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.matmul_workers is not None and args.matmul_workers < 1:
+        print("error: --matmul-workers must be at least 1", file=sys.stderr)
+        return 2
+    cpus = os.cpu_count() or 1
+    matmul_workers = args.matmul_workers or max(1, cpus // max(1, min(args.workers or cpus, len(jobs))))
+    for job in jobs:
+        job["eigen_mode"], job["digits"], job["full_simplify"] = args.eigen_mode, args.digits, args.simplify
+        job["timings"], job["matmul_workers"] = args.timings, matmul_workers
+    records = run_jobs(jobs, args.workers)
+    if args.format == "json":
+        output = json.dumps(records, ensure_ascii=False, indent=2)
+    else:
+        output = "\n".join(render_text(record) for record in records)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 1 if any("error" in record for record in records) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
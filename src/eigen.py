@@ -0,0 +1,88 @@
+import sympy as sp
+import numpy as np
+import mpmath
+from src.backend import SYMBOLIC, matrix_kind, to_float_array
+
+# Digits that double precision (and therefore LAPACK) can deliver
+DOUBLE_DIGITS = 15
+
+def is_numeric_matrix(matrix):
+    """True when every element evaluates to a number (no free symbols)."""
+    if matrix_kind(matrix) != SYMBOLIC:
+        return True
+    return all(sp.sympify(x).is_number for row in matrix for x in row)
+
+def _to_mpmath_matrix(matrix, dps):
+    """Converts a numeric matrix to an mpmath matrix at dps decimal digits."""
+    def convert(x):
+        re_, im_ = sp.N(x, dps).as_real_imag()
+        return mpmath.mpc(mpmath.mpf(str(re_)), mpmath.mpf(str(im_))) if im_ else mpmath.mpf(str(re_))
+    return mpmath.matrix([[convert(x) for x in row] for row in matrix])
+
+def numeric_eigensystem(matrix, hermitian, digits, vectors=True, array=None):
+    """Eigenvalues (and eigenvectors as columns) of a numeric matrix.
+
+    Up to DOUBLE_DIGITS digits this uses LAPACK through NumPy (eigh for
+    symmetric/Hermitian input, eig otherwise); beyond that mpmath at the
+    requested precision. Returns (values, vectors) as Python lists, with
+    vectors None when not requested. array may pass an already converted
+    float array.
+    """
+    if digits <= DOUBLE_DIGITS:
+        A = array if array is not None else to_float_array(matrix)
+        if hermitian:
+            if not vectors:
+                return np.linalg.eigvalsh(A).tolist(), None
+            w, v = np.linalg.eigh(A)
+        else:
+            if not vectors:
+                return _sorted(np.linalg.eigvals(A).tolist()), None
+            w, v = np.linalg.eig(A)
+        order = sorted(range(len(w)), key=lambda i: (w[i].real, w[i].imag))
+        return [w[i].item() for i in order], [v[:, i].tolist() for i in order]
+
+    with mpmath.workdps(digits + 5):
+        M = _to_mpmath_matrix(matrix, digits + 5)
+        if hermitian:
+            is_real = all(not isinstance(x, mpmath.mpc) for x in M)
+            E, ER = mpmath.eigsy(M) if is_real else mpmath.eighe(M)
+        else:
+            E, ER = mpmath.eig(M, right=True)
+        n = M.rows
+        order = sorted(range(n), key=lambda i: (mpmath.re(E[i]), mpmath.im(E[i])))
+        values = [E[i] for i in order]
+        columns = [[ER[r, i] for r in range(n)] for i in order] if vectors else None
+        return values, columns
+
+def _sorted(values):
+    return sorted(values, key=lambda z: (z.real, z.imag))
+
+def _format_real(x, digits):
+    if isinstance(x, (float, int, np.floating)):
+        return f"{x:.{digits}g}"
+    return mpmath.nstr(x, digits)
+
+def format_number(z, digits):
+    """Formats a float, complex or mpmath number to the given significant digits.
+
+    Real or imaginary parts below the displayed precision are dropped.
+    """
+    # mpmath parts would otherwise be rounded to the global (double) precision by abs() and the tolerance
+    with mpmath.workdps(digits + 5):
+        re_, im_ = z.real, z.imag
+        tol = max(abs(re_), abs(im_)) * 10.0 ** -(digits - 1)
+        if abs(im_) <= tol:
+            return _format_real(re_, digits)
+        imag = _format_real(abs(im_), digits)
+        imag = "I" if imag == "1" else f"{imag}*I"
+        if abs(re_) <= tol:
+            return imag if im_ > 0 else f"-{imag}"
+        sign = "-" if im_ < 0 else "+"
+        return f"{_format_real(re_, digits)} {sign} {imag}"
+
+def group_eigenvalues(values, digits):
+    """Groups eigenvalues that print identically; returns [(text, [indices])]."""
+    groups = {}
+    for i, val in enumerate(values):
+        groups.setdefault(format_number(val, digits), []).append(i)
+    return list(groups.items())
@@ -0,0 +1,286 @@
+import sympy as sp
+import numpy as np
+from fractions import Fraction
+from sympy.polys.matrices import DomainMatrix
+from sympy.polys.matrices.exceptions import DMError, DMNonInvertibleMatrixError as NonInvertibleMatrixError
+from math import lcm
+from src.backend import EXACT, FLOAT, big_int, matrix_kind, ratio, to_float_array, to_fraction
+
+# Column block width for the blocked float LU and triangular solves
+BLOCK_SIZE = 64
+
+# --- Float path: LU with partial pivoting ---
+
+def lu_factor(A, block=BLOCK_SIZE):
+    """Factors PA = LU with partial pivoting; returns (packed LU, row permutation, sign)."""
+    a = np.array(A, dtype=np.result_type(A, float), copy=True)
+    n = a.shape[0]
+    perm = np.arange(n)
+    sign = 1
+    for k0 in range(0, n, block):
+        k1 = min(k0 + block, n)
+        # Factor the current column panel with rank-1 updates
+        for k in range(k0, k1):
+            p = k + int(np.argmax(np.abs(a[k:, k])))
+            if p != k:
+                a[[k, p]] = a[[p, k]]
+                perm[[k, p]] = perm[[p, k]]
+                sign = -sign
+            if a[k, k] != 0:
+                a[k + 1:, k] /= a[k, k]
+                a[k + 1:, k + 1:k1] -= np.outer(a[k + 1:, k], a[k, k + 1:k1])
+        # Update the trailing matrix with a single matrix product
+        if k1 < n:
+            L11 = np.tril(a[k0:k1, k0:k1], -1) + np.eye(k1 - k0)
+            a[k0:k1, k1:] = np.linalg.solve(L11, a[k0:k1, k1:])
+            a[k1:, k1:] -= a[k1:, k0:k1] @ a[k0:k1, k1:]
+    return a, perm, sign
+
+def is_singular_lu(lu):
+    """Checks the U diagonal for pivots that are zero relative to the matrix scale."""
+    diag = np.abs(np.diag(lu))
+    scale = np.max(np.abs(lu)) if lu.size else 0.0
+    return bool(np.any(diag <= np.finfo(float).eps * len(diag) * scale))
+
+def lu_solve(lu, perm, B, block=BLOCK_SIZE):
+    """Solves AX = B from the factors returned by lu_factor."""
+    n = lu.shape[0]
+    X = np.array(B, dtype=np.result_type(lu, B), copy=True)[perm]
+    # Forward substitution with the unit lower triangle
+    for k0 in range(0, n, block):
+        k1 = min(k0 + block, n)
+        L11 = np.tril(lu[k0:k1, k0:k1], -1) + np.eye(k1 - k0)
+        X[k0:k1] = np.linalg.solve(L11, X[k0:k1])
+        X[k1:] -= lu[k1:, k0:k1] @ X[k0:k1]
+    # Back substitution with the upper triangle
+    for k1 in range(n, 0, -block):
+        k0 = max(k1 - block, 0)
+        X[k0:k1] = np.linalg.solve(np.triu(lu[k0:k1, k0:k1]), X[k0:k1])
+        X[:k0] -= lu[:k0, k0:k1] @ X[k0:k1]
+    return X
+
+def lu_determinant(lu, sign):
+    """Determinant from LU factors as the signed product of the U pivots."""
+    with np.errstate(over='ignore'):
+        return (sign * np.prod(np.diag(lu))).item()
+
+def lu_inverse(lu, perm):
+    """Inverse from LU factors by triangular solves against the identity."""
+    if is_singular_lu(lu):
+        raise ValueError("Matrix is singular and cannot be inverted.")
+    return lu_solve(lu, perm, np.eye(lu.shape[0], dtype=lu.dtype))
+
+def float_determinant(A):
+    """Determinant of a float array by LU factorization."""
+    lu, _, sign = lu_factor(A)
+    return lu_determinant(lu, sign)
+
+def float_inverse(A):
+    """Inverse of a float array by LU factorization and triangular solves."""
+    lu, perm, _ = lu_factor(A)
+    return lu_inverse(lu, perm)
+
+# --- Exact path: fraction-free Bareiss over the integers ---
+
+def integer_rows(matrix):
+    """Scales each rational row to integers; returns (rows, row scale factors)."""
+    rows, scales = [], []
+    for row in matrix:
+        parts = [ratio(x) for x in row]
+        d = lcm(*(q for _, q in parts))
+        rows.append([big_int(p * (d // q)) for p, q in parts])
+        scales.append(d)
+    return rows, scales
+
+def bareiss_determinant(rows):
+    """Determinant of an integer matrix by fraction-free Bareiss elimination."""
+    a = [row[:] for row in rows]
+    n = len(a)
+    sign, prev = 1, 1
+    for k in range(n - 1):
+        if a[k][k] == 0:
+            p = next((i for i in range(k + 1, n) if a[i][k] != 0), None)
+            if p is None:
+                return 0
+            a[k], a[p] = a[p], a[k]
+            sign = -sign
+        akk, rowk = a[k][k], a[k][k + 1:]
+        for i in range(k + 1, n):
+            aik = a[i][k]
+            a[i][k + 1:] = [(akk * x - aik * y) // prev for x, y in zip(a[i][k + 1:], rowk)]
+        prev = akk
+    return sign * a[n - 1][n - 1]
+
+def bareiss_inverse(rows):
+    """Fraction-free Gauss-Jordan on [A | I]; returns (d, R, sign) with A^-1 = R / d and det(A) = sign * d."""
+    n = len(rows)
+    a = [row[:] + [1 if i == j else 0 for j in range(n)] for i, row in enumerate(rows)]
+    sign, prev = 1, 1
+    for k in range(n):
+        p = next((i for i in range(k, n) if a[i][k] != 0), None)
+        if p is None:
+            raise ValueError("Matrix is singular and cannot be inverted.")
+        if p != k:
+            a[k], a[p] = a[p], a[k]
+            sign = -sign
+        akk, rowk = a[k][k], a[k][k + 1:]
+        for i in range(n):
+            if i == k:
+                continue
+            aik = a[i][k]
+            a[i][k + 1:] = [(akk * x - aik * y) // prev for x, y in zip(a[i][k + 1:], rowk)]
+            a[i][k] = 0
+        prev = akk
+    return prev, [row[n:] for row in a], sign
+
+def exact_determinant(matrix):
+    """Exact determinant of an integer/rational matrix."""
+    rows, scales = integer_rows(matrix)
+    det = sp.Integer(int(bareiss_determinant(rows)))
+    for s in scales:
+        det /= s
+    return det
+
+def exact_inverse_and_determinant(matrix):
+    """Exact inverse and determinant of an integer/rational matrix in one elimination."""
+    rows, scales = integer_rows(matrix)
+    d, R, sign = bareiss_inverse(rows)
+    d = int(d)
+    det = sp.Integer(sign * d)
+    for s in scales:
+        det /= s
+    # A = S^-1 * A_int, so A^-1 = A_int^-1 * S
+    return [[sp.Rational(int(x) * scales[j], d) for j, x in enumerate(row)] for row in R], det
+
+def exact_inverse(matrix):
+    """Exact inverse of an integer/rational matrix."""
+    return exact_inverse_and_determinant(matrix)[0]
+
+# --- Exact path: rational LU, reusable across solves ---
+
+def exact_lu_factor(matrix):
+    """Factors PA = LU over the rationals; returns (packed LU, row permutation, sign) like lu_factor."""
+    a = [[Fraction(to_fraction(x)) for x in row] for row in matrix]
+    n = len(a)
+    perm = list(range(n))
+    sign = 1
+    for k in range(n):
+        p = next((i for i in range(k, n) if a[i][k] != 0), None)
+        if p is None:
+            continue
+        if p != k:
+            a[k], a[p] = a[p], a[k]
+            perm[k], perm[p] = perm[p], perm[k]
+            sign = -sign
+        akk, rowk = a[k][k], a[k][k + 1:]
+        for i in range(k + 1, n):
+            if a[i][k] == 0:
+                continue
+            factor = a[i][k] = a[i][k] / akk
+            a[i][k + 1:] = [x - factor * y for x, y in zip(a[i][k + 1:], rowk)]
+    return a, perm, sign
+
+def is_singular_exact_lu(lu):
+    return any(lu[k][k] == 0 for k in range(len(lu)))
+
+def exact_lu_solve(lu, perm, B):
+    """Solves AX = B exactly from the factors returned by exact_lu_factor."""
+    n = len(lu)
+    X = [[Fraction(to_fraction(x)) for x in B[p]] for p in perm]
+    for i in range(n):
+        for k in range(i):
+            if lu[i][k] != 0:
+                X[i] = [x - lu[i][k] * y for x, y in zip(X[i], X[k])]
+    for i in range(n - 1, -1, -1):
+        for k in range(i + 1, n):
+            if lu[i][k] != 0:
+                X[i] = [x - lu[i][k] * y for x, y in zip(X[i], X[k])]
+        X[i] = [x / lu[i][i] for x in X[i]]
+    return X
+
+# --- Reduced row-echelon form ---
+
+def float_rref(A):
+    """Reduced row-echelon form of a float array with partial pivoting; returns (array, pivot columns)."""
+    a = np.array(A, dtype=np.result_type(A, float), copy=True)
+    n, m = a.shape
+    tol = np.finfo(float).eps * max(n, m) * (np.max(np.abs(a)) if a.size else 0.0)
+    pivots = []
+    r = 0
+    for j in range(m):
+        if r == n:
+            break
+        p = r + int(np.argmax(np.abs(a[r:, j])))
+        if abs(a[p, j]) <= tol:
+            a[r:, j] = 0
+            continue
+        a[[r, p]] = a[[p, r]]
+        a[r] /= a[r, j]
+        others = np.arange(n) != r
+        a[others] -= np.outer(a[others, j], a[r])
+        a[others, j] = 0
+        pivots.append(j)
+        r += 1
+    return a, pivots
+
+def field_rref(matrix):
+    """Reduced row-echelon form over QQ or a field of rational functions; returns (rows, pivot columns)."""
+    R, pivots = DomainMatrix.from_Matrix(sp.Matrix(matrix)).to_field().rref()
+    return R.to_Matrix().tolist(), list(pivots)
+
+def nullspace_from_rref(R, pivots, m, one=1):
+    """Basis of the nullspace read off a reduced row-echelon form, one vector per free column."""
+    basis = []
+    for f in (j for j in range(m) if j not in pivots):
+        v = [0 * one] * m
+        v[f] = one
+        for i, j in enumerate(pivots):
+            v[j] = -R[i][f]
+        basis.append(v)
+    return basis
+
+# --- Symbolic path: LU over the field of rational functions ---
+
+def symbolic_solve(matrix, rhs):
+    """Solves AX = B for symbolic A by LU over the fraction field of the entries' domain."""
+    A = DomainMatrix.from_Matrix(sp.Matrix(matrix))
+    B = DomainMatrix.from_Matrix(sp.Matrix(rhs))
+    # An exact A with a symbolic B unifies to a ring such as QQ[x]; LU needs its fraction field
+    domain = A.domain.unify(B.domain).get_field()
+    try:
+        X = A.convert_to(domain).lu_solve(B.convert_to(domain))
+    except NonInvertibleMatrixError:
+        raise ValueError("Matrix is singular; the system has no unique solution.")
+    except DMError as e:
+        raise ValueError(f"Cannot solve over {domain}: {e}")
+    return X.to_Matrix().tolist()
+
+# --- Dispatch on element types ---
+
+def determinant(matrix):
+    """Determinant with the elimination backend selected from the element types."""
+    kind = matrix_kind(matrix)
+    if kind == EXACT:
+        return exact_determinant(matrix)
+    if kind == FLOAT:
+        return float_determinant(to_float_array(matrix))
+    return sp.Matrix(matrix).det(method="bareiss")
+
+def inverse(matrix):
+    """Inverse with the elimination backend selected from the element types."""
+    kind = matrix_kind(matrix)
+    if kind == EXACT:
+        return exact_inverse(matrix)
+    if kind == FLOAT:
+        return float_inverse(to_float_array(matrix)).tolist()
+    sym_matrix = sp.Matrix(matrix)
+    if sym_matrix.det(method="bareiss") == 0:
+        raise ValueError("Matrix is singular and cannot be inverted.")
+    return sym_matrix.inv().tolist()
+
+def rref(matrix):
+    """Reduced row-echelon form and pivot columns, with the backend selected from the element types."""
+    if matrix_kind(matrix) == FLOAT:
+        R, pivots = float_rref(to_float_array(matrix))
+        return R.tolist(), pivots
+    return field_rref(matrix)
@@ -0,0 +1,401 @@
+"""Expressions over named matrices, such as inv(A)*B + T(A)*B or det(A*B).
+
+parse() turns the text into a DAG: nodes are interned on their operation
+and operands, so a subexpression written twice is one node and evaluate()
+computes it once. Only the nodes the result needs are evaluated, and each
+intermediate matrix is released as soon as its last user has run.
+
+Before evaluation the DAG is rewritten where that is cheaper:
+
+- inv(X)*Y becomes solve(X, Y) and Y*inv(X) becomes T(solve(T(X), T(Y)));
+  solves reuse the cached LU factors of X
+- det(X*Y*...) becomes det(X)*det(Y)*... when every factor is square and
+  the product is not needed elsewhere
+- det(T(X)), trace(T(X)) and rank(T(X)) drop the transpose, T(T(X)) is X
+  and det(inv(X)) is 1/det(X)
+- products whose partial results are not needed elsewhere become one
+  chain, which logic.multiply_matrices multiplies in the cheapest order
+
+Syntax: matrix names, numbers, lowercase symbols (x, pi), + - * / and
+** or ^ (A^-1 is inv(A)), with * also written as @ or ·, and the
+functions in FUNCTIONS.
+"""
+import ast
+import sympy as sp
+from src import backend, logic, profiling
+
+# Constants are folded while parsing only up to this many bits; larger ones, such
+# as 2**10**10, are left as operations for evaluate() to compute in the worker
+FOLD_MAX_BITS = 2**16
+# Function name -> (operation, number of matrix arguments)
+FUNCTIONS = {
+    "inv": ("inverse", 1), "inverse": ("inverse", 1),
+    "T": ("transpose", 1), "transpose": ("transpose", 1),
+    "det": ("determinant", 1), "determinant": ("determinant", 1),
+    "trace": ("trace", 1), "tr": ("trace", 1),
+    "rank": ("rank", 1),
+    "solve": ("solve", 2),
+    "elementwise": ("elementwise", 2),
+}
+# Operations computed by a logic function of one matrix
+UNARY = {"inverse": logic.inverse, "transpose": logic.transpose, "determinant": logic.determinant,
+         "trace": logic.trace, "rank": logic.rank}
+# How each operation is written in steps and rewrite notes
+NAMES = {"inverse": "inv", "transpose": "T", "determinant": "det", "trace": "trace", "rank": "rank",
+         "solve": "solve", "elementwise": "elementwise"}
+
+class Node:
+    """One operation of an expression; shape is (rows, cols) for matrices and None for scalars.
+
+    Leaves are "matrix" nodes (value: the name) and "scalar" nodes (value:
+    a SymPy number or symbol); "power" keeps its exponent in value.
+    """
+    def __init__(self, op, args, value, shape):
+        self.op = op
+        self.args = args
+        self.value = value
+        self.shape = shape
+
+    def __repr__(self):
+        return f"<{self.op} node {_text(self)}>"
+
+class Expression:
+    """A parsed and rewritten expression, picklable so it can be evaluated in a worker."""
+    def __init__(self, text, root, rewrites):
+        self.text = text
+        self.root = root
+        self.rewrites = rewrites
+        self.names = list(dict.fromkeys(n.value for n in _postorder(root) if n.op == "matrix"))
+
+    def is_matrix(self):
+        return self.root.shape is not None
+
+    def steps(self):
+        """The operations in evaluation order, one line each; intermediate results are named t1, t2, ..."""
+        labels, lines = {}, []
+        for node in _postorder(self.root):
+            if node.op in ("matrix", "scalar") and node is not self.root:
+                continue
+            text = _text(node, labels)
+            if node is self.root:
+                lines.append(f"result = {text}")
+            else:
+                labels[node] = f"t{len(lines) + 1}"
+                lines.append(f"{labels[node]} = {text}")
+        return lines
+
+def parse(text, shapes):
+    """Parses an expression over the matrices in shapes (name -> (rows, cols)) into an Expression."""
+    # ^ is a power, as in SymPy, rather than Python's xor
+    source = text.replace("·", "*").replace("^", "**").strip()
+    if not source:
+        raise ValueError("The expression is empty")
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}")
+    builder = _Builder(shapes)
+    root = builder.build(tree.body)
+    rewrites = []
+    root = builder.rewrite(root, _use_counts(root), {}, rewrites)
+    return Expression(text.strip(), root, rewrites)
+
+@profiling.timed
+def evaluate(expression, matrices):
+    """Computes an expression from its matrices (name -> matrix), each distinct subexpression once."""
+    order = _postorder(expression.root)
+    remaining = _use_counts(expression.root)
+    values = {}
+    for node in order:
+        values[node] = _apply(node, [values[a] for a in node.args], matrices)
+        for arg in node.args:
+            remaining[arg] -= 1
+            if remaining[arg] == 0:
+                del values[arg]
+    result = values[expression.root]
+    return backend.to_rows(result) if backend.is_numeric_array(result) else result
+
+# --- Building the DAG ---
+
+class _Builder:
+    """Turns a Python syntax tree into interned nodes, checking shapes as it goes."""
+    def __init__(self, shapes):
+        self.shapes = shapes
+        self.nodes = {}
+
+    def node(self, op, args=(), value=None, shape=None):
+        key = (op, tuple(args), type(value), value)
+        if key not in self.nodes:
+            self.nodes[key] = Node(op, tuple(args), value, shape)
+        return self.nodes[key]
+
+    def scalar(self, value):
+        if value.has(sp.zoo, sp.nan):
+            raise ValueError("Division by zero in expression")
+        return self.node("scalar", value=value)
+
+    def build(self, tree):
+        if isinstance(tree, ast.Constant) and isinstance(tree.value, (int, float, complex)) and not isinstance(tree.value, bool):
+            return self.scalar(sp.sympify(tree.value))
+        if isinstance(tree, ast.Name):
+            if tree.id in self.shapes:
+                return self.node("matrix", value=tree.id, shape=tuple(self.shapes[tree.id]))
+            if tree.id[0].isupper() or tree.id in FUNCTIONS:
+                raise ValueError(f"No matrix named '{tree.id}'")
+            return self.scalar(sp.Symbol(tree.id) if tree.id not in ("pi", "oo") else sp.sympify(tree.id))
+        if isinstance(tree, ast.UnaryOp) and isinstance(tree.op, (ast.USub, ast.UAdd)):
+            operand = self.build(tree.operand)
+            return operand if isinstance(tree.op, ast.UAdd) else self.negate(operand)
+        if isinstance(tree, ast.BinOp):
+            left, right = self.build(tree.left), self.build(tree.right)
+            if isinstance(tree.op, (ast.Add, ast.Sub)):
+                return self.add(left, right, "add" if isinstance(tree.op, ast.Add) else "sub")
+            if isinstance(tree.op, (ast.Mult, ast.MatMult)):
+                return self.multiply(left, right)
+            if isinstance(tree.op, ast.Div):
+                return self.divide(left, right)
+            if isinstance(tree.op, ast.Pow):
+                return self.power(left, right)
+        if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Name) and not tree.keywords:
+            if tree.func.id not in FUNCTIONS:
+                raise ValueError(f"Unknown function '{tree.func.id}' (use {', '.join(FUNCTIONS)})")
+            op, count = FUNCTIONS[tree.func.id]
+            if len(tree.args) != count:
+                raise ValueError(f"{tree.func.id}() takes {count} matrix argument{'s' if count > 1 else ''}")
+            return self.function(op, [self.build(a) for a in tree.args], tree.func.id)
+        raise ValueError(f"Unsupported syntax in expression: {ast.unparse(tree)}")
+
+    def negate(self, x):
+        if x.op == "scalar":
+            return self.scalar(-x.value)
+        if x.shape is None:
+            return self.node("mul", (self.scalar(sp.Integer(-1)), x))
+        return self.node("scale", (self.scalar(sp.Integer(-1)), x), shape=x.shape)
+
+    def add(self, x, y, op):
+        if (x.shape is None) != (y.shape is None):
+            raise ValueError(f"Cannot {'add' if op == 'add' else 'subtract'} a scalar and a matrix in {_text(x)} {'+' if op == 'add' else '-'} {_text(y)}")
+        if x.shape is not None and x.shape != y.shape:
+            raise ValueError(f"Cannot {'add' if op == 'add' else 'subtract'} {_size(x)} and {_size(y)} matrices")
+        if x.op == y.op == "scalar" and _foldable(x.value, y.value):
+            return self.scalar(x.value + y.value if op == "add" else x.value - y.value)
+        return self.node(op, (x, y), shape=x.shape)
+
+    def multiply(self, x, y):
+        if x.shape is None and y.shape is None:
+            if x.op == y.op == "scalar" and _foldable(x.value, y.value):
+                return self.scalar(x.value * y.value)
+            return self.node("mul", (x, y))
+        if x.shape is None or y.shape is None:
+            s, m = (x, y) if x.shape is None else (y, x)
+            return self.node("scale", (s, m), shape=m.shape)
+        if x.shape[1] != y.shape[0]:
+            raise ValueError(f"Cannot multiply {_size(x)} by {_size(y)} in {_text(x)}·{_text(y)}")
+        return self.node("matmul", (x, y), shape=(x.shape[0], y.shape[1]))
+
+    def divide(self, x, y):
+        if y.shape is not None:
+            raise ValueError(f"Cannot divide by the matrix {_text(y)}; use inv()")
+        if y.op == "scalar":
+            if y.value == 0:
+                raise ValueError("Division by zero in expression")
+            return self.multiply(x, self.scalar(1 / y.value))
+        if x.shape is None:
+            return self.node("div", (x, y))
+        return self.node("scale", (self.node("div", (self.scalar(sp.Integer(1)), y)), x), shape=x.shape)
+
+    def power(self, x, y):
+        if x.shape is None:
+            if x.op == y.op == "scalar" and _foldable(x.value, y.value) and _power_bits(x.value, y.value) <= FOLD_MAX_BITS:
+                return self.scalar(x.value ** y.value)
+            return self.node("pow", (x, y))
+        if y.op != "scalar" or (y.value.is_number and not y.value.is_Integer):
+            raise ValueError("Matrix powers need an integer or a symbol such as n as the exponent")
+        self.square(x, "raise to a power")
+        if y.value == -1:
+            return self.node("inverse", (x,), shape=x.shape)
+        return self.node("power", (x,), value=y.value, shape=x.shape)
+
+    def function(self, op, args, name):
+        if any(a.shape is None for a in args):
+            raise ValueError(f"{name}() needs matrix arguments")
+        x = args[0]
+        if op in ("inverse", "determinant", "trace"):
+            self.square(x, f"take {name}() of")
+        if op == "solve":
+            self.square(x, "solve with")
+            if args[1].shape[0] != x.shape[0]:
+                raise ValueError(f"Right-hand side {_text(args[1])} has {args[1].shape[0]} rows, {_text(x)} has {x.shape[0]}")
+            return self.node(op, tuple(args), shape=(x.shape[1], args[1].shape[1]))
+        if op == "elementwise":
+            if x.shape != args[1].shape:
+                raise ValueError(f"elementwise() needs matrices of the same size, got {_size(x)} and {_size(args[1])}")
+            return self.node(op, tuple(args), shape=x.shape)
+        shape = {"inverse": x.shape, "transpose": x.shape[::-1]}.get(op)
+        return self.node(op, (x,), shape=shape)
+
+    def square(self, x, action):
+        if x.shape[0] != x.shape[1]:
+            raise ValueError(f"Cannot {action} the {_size(x)} matrix {_text(x)}; it must be square")
+
+    # --- Rewrites ---
+
+    def rewrite(self, node, uses, done, notes):
+        """The cheaper equivalent of node (see the module docstring); notes gets a line per rewrite made."""
+        if node in done:
+            return done[node]
+        args = [self.rewrite(a, uses, done, notes) for a in node.args]
+        new = self._rewritten(node, args, uses)
+        if new is None:
+            new = self.node(node.op, args, node.value, node.shape)
+        elif _text(new) != _text(node):
+            notes.append(f"{_text(node)} → {_text(new)}")
+        done[node] = new
+        return new
+
+    def _rewritten(self, node, args, uses):
+        op, x = node.op, args[0] if args else None
+        if op == "matmul":
+            y = args[1]
+            if x.op == "inverse":
+                return self.node("solve", (x.args[0], y), shape=node.shape)
+            if y.op == "inverse":
+                z = y.args[0]
+                solved = self.node("solve", (self.transpose(z), self.transpose(x)), shape=node.shape[::-1])
+                return self.transpose(solved)
+            # Partial products used only here join the chain
+            factors = []
+            for original, arg in zip(node.args, args):
+                factors += arg.args if arg.op == "matmul" and uses[original] == 1 else [arg]
+            return self.node("matmul", factors, shape=node.shape) if len(factors) > 2 else None
+        if op == "transpose" and x.op == "transpose":
+            return x.args[0]
+        if op in ("determinant", "trace", "rank") and x.op == "transpose":
+            return self.node(op, x.args)
+        if op == "determinant" and x.op == "inverse":
+            return self.node("div", (self.scalar(sp.Integer(1)), self.node("determinant", x.args)))
+        if op == "determinant" and x.op == "matmul" and uses[node.args[0]] == 1 and all(f.shape[0] == f.shape[1] for f in x.args):
+            result = self.node("determinant", (x.args[0],))
+            for factor in x.args[1:]:
+                result = self.node("mul", (result, self.node("determinant", (factor,))))
+            return result
+        return None
+
+    def transpose(self, x):
+        return x.args[0] if x.op == "transpose" else self.node("transpose", (x,), shape=x.shape[::-1])
+
+def _use_counts(root):
+    """How many operations of the DAG under root use each node."""
+    counts = {}
+    for node in _postorder(root):
+        counts.setdefault(node, 0)
+        for arg in node.args:
+            counts[arg] = counts.get(arg, 0) + 1
+    return counts
+
+def _postorder(root):
+    """Every node under root once, operands before the operations using them."""
+    order, seen, stack = [], set(), [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node in seen:
+            continue
+        seen.add(node)
+        stack.append((node, True))
+        stack += [(a, False) for a in reversed(node.args) if a not in seen]
+    return order
+
+def _bits(value):
+    """The size of the largest exact number in a scalar, in bits."""
+    return max((max(r.p.bit_length(), r.q.bit_length()) for r in value.atoms(sp.Rational)), default=0)
+
+def _foldable(*values):
+    return all(_bits(v) <= FOLD_MAX_BITS for v in values)
+
+def _power_bits(base, exponent):
+    """A bound on the bits base**exponent takes when SymPy computes it exactly; 0 where it stays symbolic."""
+    if not base.is_number or not exponent.is_Rational or abs(exponent) <= 1:
+        return 0
+    return max(_bits(base), 1) * int(abs(exponent) + 1)
+
+# Binding strength of the infix operations, for parentheses when writing nodes out
+_PRECEDENCE = {"add": 1, "sub": 1, "matmul": 2, "scale": 2, "mul": 2, "div": 2, "power": 3, "pow": 3}
+
+def _size(node):
+    return f"{node.shape[0]}×{node.shape[1]}"
+
+def _text(node, labels=None):
+    """The node written out, using labels for nodes that already have a name."""
+    if labels and node in labels:
+        return labels[node]
+    if node.op in ("matrix", "scalar"):
+        return str(node.value)
+    level = _PRECEDENCE.get(node.op)
+
+    def operand(arg, strict=False):
+        text = _text(arg, labels)
+        inner = None if labels and arg in labels else _PRECEDENCE.get(arg.op, _scalar_precedence(arg))
+        return f"({text})" if inner is not None and (inner < level or strict and inner == level) else text
+    if node.op in ("matmul", "scale", "mul"):
+        return "·".join(operand(a) for a in node.args)
+    if node.op in ("add", "sub"):
+        return f"{operand(node.args[0])} {'+' if node.op == 'add' else '-'} {operand(node.args[1], True)}"
+    if node.op == "div":
+        return f"{operand(node.args[0])}/{operand(node.args[1], True)}"
+    if node.op == "power":
+        return f"{operand(node.args[0], True)}^{node.value}"
+    if node.op == "pow":
+        return f"{operand(node.args[0], True)}^{operand(node.args[1])}"
+    return f"{NAMES[node.op]}({', '.join(_text(a, labels) for a in node.args)})"
+
+def _scalar_precedence(node):
+    """How tightly a scalar leaf such as 1/3, -2 or x + 1 binds when written out; None for atoms."""
+    value = node.value if node.op == "scalar" else None
+    if value is None or value.is_Atom and not (value.is_Rational and (value.q != 1 or value < 0)):
+        return None
+    if value.is_Add:
+        return 1
+    return 3 if value.is_Pow else 2
+
+# --- Evaluation ---
+
+def _apply(node, args, matrices):
+    op = node.op
+    if op == "matrix":
+        return matrices[node.value]
+    if op == "scalar":
+        return node.value
+    if op in UNARY:
+        return UNARY[op](args[0])
+    if op == "matmul":
+        return logic.multiply_matrices(list(args))
+    if op == "scale":
+        return logic.scalar_multiply(args[1], args[0])
+    if op == "power":
+        return logic.matrix_power(args[0], node.value)
+    if op == "solve":
+        try:
+            return logic.solve(*args)
+        except ValueError:
+            # A rewrite must not turn a valid product into an error: redo it as inv(X)*Y,
+            # which raises in turn when X really is singular
+            return logic.multiply_matrices([logic.inverse(args[0]), args[1]])
+    if op == "elementwise":
+        return logic.elementwise_multiply(list(args))
+    x, y = args
+    if op in ("add", "sub") and node.shape is not None:
+        return logic.add_matrices([x, y]) if op == "add" else logic.subtract_matrices([x, y])
+    if op == "add":
+        return x + y
+    if op == "sub":
+        return x - y
+    if op == "mul":
+        return x * y
+    if op == "div":
+        if y == 0:
+            raise ValueError(f"Division by zero: {_text(node.args[1])} is 0")
+        return x / y
+    return x ** y
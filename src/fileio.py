@@ -0,0 +1,322 @@
+"""Matrix files: NumPy .npy/.npz, CSV and a lossless symbolic format.
+
+- .npy holds one numeric matrix. .npz holds named numeric matrices, or a
+  sparse one as its shape/rows/cols/values arrays. Both are written
+  uncompressed, so files of MMAP_MIN_BYTES or more can be memory-mapped on
+  load instead of read.
+- .csv is read and written row by row, with plain numbers going through
+  NumPy and anything else through the input parser.
+- .sym is JSON lines: a header with the shape, then one row (or one
+  [row, col, value] entry for sparse matrices) per line, with every element
+  as its SymPy srepr. It round-trips symbols, radicals and Floats of any
+  precision exactly. Elements are rebuilt from a restricted syntax tree
+  rather than eval, so opening a file cannot run code.
+"""
+import ast
+import csv
+import json
+import os
+import re
+import zipfile
+import numpy as np
+import sympy as sp
+from sympy.functions.elementary.piecewise import ExprCondPair
+from src import backend, sparse
+from src.sparse import SparseMatrix
+
+EXTENSIONS = (".npy", ".npz", ".csv", ".sym")
+# .npy/.npz members at least this large are memory-mapped instead of read into memory
+MMAP_MIN_BYTES = 16 * 2**20
+# Read size of the CSV pre-scan
+SCAN_CHUNK_BYTES = 2**20
+# Members of an .npz file holding a sparse matrix
+SPARSE_MEMBERS = ("shape", "rows", "cols", "values")
+SYM_FORMAT = "sympy-srepr-matrix"
+# What .sym elements may be built from: the classes srepr writes for matrix
+# entries (numbers, arithmetic and elementary functions), ...
+SREPR_CLASSES = {cls.__name__: cls for cls in (
+    sp.Integer, sp.Rational, sp.Add, sp.Mul, sp.Pow, sp.Abs, sp.sign, sp.conjugate, sp.re, sp.im, sp.arg,
+    sp.exp, sp.log, sp.LambertW, sp.sin, sp.cos, sp.tan, sp.cot, sp.sec, sp.csc, sp.asin, sp.acos, sp.atan,
+    sp.acot, sp.atan2, sp.sinh, sp.cosh, sp.tanh, sp.coth, sp.asinh, sp.acosh, sp.atanh, sp.floor, sp.ceiling,
+    sp.Mod, sp.Max, sp.Min, sp.factorial, sp.gamma, sp.Piecewise, ExprCondPair, sp.Equality, sp.Unequality,
+    sp.GreaterThan, sp.LessThan, sp.StrictGreaterThan, sp.StrictLessThan, sp.And, sp.Or, sp.Not, sp.Tuple)}
+# ... the constructors whose argument is a name or digits ...
+SREPR_NAMED = {cls.__name__: cls for cls in (sp.Symbol, sp.Dummy, sp.Function, sp.Float)}
+# ... and the singletons srepr writes by name
+SREPR_CONSTANTS = frozenset(("I", "pi", "E", "oo", "zoo", "nan", "EulerGamma", "GoldenRatio", "Catalan", "true", "false"))
+FLOAT_DIGITS = re.compile(r"[-+]?(\d+\.?\d*|\.\d+)(e[-+]?\d+)?|[-+]?(inf|nan)", re.IGNORECASE)
+
+def load(path, parse_value, name=None):
+    """Reads the matrix in path; name picks an .npz member (default: the first one)."""
+    ext = _extension(path)
+    if ext == ".npy":
+        return _checked(_load_npy(path))
+    if ext == ".npz":
+        return _load_npz(path, name)
+    if ext == ".csv":
+        return _load_csv(path, parse_value)
+    return _load_sym(path)
+
+def save(matrix, path):
+    """Writes a matrix to path in the format given by its extension."""
+    ext = _extension(path)
+    if len(matrix) == 0:
+        raise ValueError("There is no matrix to save")
+    if ext == ".npy":
+        np.save(path, _numeric(backend.dense(matrix), ext))
+    elif ext == ".npz":
+        if isinstance(matrix, SparseMatrix):
+            np.savez(path, shape=np.array(matrix.shape, dtype=np.int64), rows=matrix.rows, cols=matrix.cols,
+                     values=_numeric(matrix.values.reshape(1, -1), ext)[0])
+        else:
+            np.savez(path, matrix=_numeric(matrix, ext))
+    elif ext == ".csv":
+        _save_csv(matrix, path)
+    else:
+        _save_sym(matrix, path)
+
+def _extension(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXTENSIONS:
+        raise ValueError(f"Unsupported file type '{ext}' (use {', '.join(EXTENSIONS)})")
+    return ext
+
+def _checked(array, matrix=True):
+    if matrix and (array.ndim != 2 or 0 in array.shape):
+        raise ValueError(f"Expected a non-empty 2-D array, got shape {array.shape}")
+    if array.dtype.kind not in "biufc":
+        raise ValueError(f"Unsupported array type {array.dtype}")
+    return array
+
+def _numeric(matrix, ext):
+    arrays = backend.numeric_arrays([matrix])
+    if arrays is None or arrays[0].dtype == object:
+        raise ValueError(f"Only int64, float and complex matrices can be saved as {ext}; use .sym for exact or symbolic ones")
+    return arrays[0]
+
+# --- .npy / .npz, memory-mapped when large ---
+
+class MappedArray(np.memmap):
+    """Read-only memory-mapped matrix that pickles as a reference to its file.
+
+    Jobs run in worker processes, so this keeps a large loaded matrix from
+    being copied through the pipe: the worker maps the same file instead.
+    Views and results derived from it pickle their data as usual.
+    """
+    def __array_finalize__(self, obj):
+        super().__array_finalize__(obj)
+        self._source = None
+
+    def __reduce_ex__(self, protocol):
+        if self._source is None:
+            return np.array(self).__reduce_ex__(protocol)
+        return _map, self._source
+
+def _map(path, offset):
+    """Memory-maps the .npy data starting at offset in path (a plain file or a stored .npz member)."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            return None
+        data_offset = f.tell()
+    if dtype.hasobject:
+        raise ValueError("Arrays of Python objects cannot be loaded")
+    array = MappedArray(path, dtype=dtype, mode="r", shape=shape, order="F" if fortran else "C", offset=data_offset)
+    array._source = (path, offset)
+    return array
+
+def _load_npy(path):
+    if os.path.getsize(path) >= MMAP_MIN_BYTES:
+        array = _map(path, 0)
+        if array is not None:
+            return array
+    return np.load(path, allow_pickle=False)
+
+def _load_npz(path, name):
+    with zipfile.ZipFile(path) as zf:
+        infos = {info.filename[:-4]: info for info in zf.infolist() if info.filename.endswith(".npy")}
+        if not infos:
+            raise ValueError("The .npz file contains no arrays")
+        if name is None and all(m in infos for m in SPARSE_MEMBERS):
+            shape, rows, cols, values = (np.load(zf.open(infos[m].filename), allow_pickle=False) for m in SPARSE_MEMBERS)
+            if shape.shape != (2,):
+                raise ValueError("Sparse .npz files need a shape member of two integers")
+            return SparseMatrix.from_entries(tuple(shape.tolist()), rows, cols, _checked(values, matrix=False))
+        name = name if name is not None else next(iter(infos))
+        if name not in infos:
+            raise ValueError(f"No array named '{name}' (found {', '.join(infos)})")
+        info = infos[name]
+        if info.compress_type == zipfile.ZIP_STORED and info.file_size >= MMAP_MIN_BYTES:
+            array = _map(path, _member_offset(path, info))
+            if array is not None:
+                return _checked(array)
+        return _checked(np.load(zf.open(info.filename), allow_pickle=False))
+
+def _member_offset(path, info):
+    """Offset of a stored zip member's data: its local header is 30 bytes plus the name and extra fields."""
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+    return info.header_offset + 30 + int.from_bytes(header[26:28], "little") + int.from_bytes(header[28:30], "little")
+
+# --- CSV, streamed ---
+
+def _load_csv(path, parse_value):
+    kind, delimiter = _scan_csv(path)
+    if kind is not None:
+        try:
+            return sparse.maybe_sparse(_checked(np.loadtxt(path, delimiter=delimiter, dtype=kind, ndmin=2)))
+        except (ValueError, OverflowError):
+            # Malformed numbers and integers beyond int64 take the general path
+            pass
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f) if delimiter == "," else (line.split() for line in f)
+        for line_number, cells in enumerate(reader, 1):
+            row = [parse_value(cell.strip()) for cell in cells if cell.strip()]
+            if not row:
+                continue
+            if rows and len(row) != len(rows[0]):
+                raise ValueError(f"Line {line_number} has {len(row)} elements, expected {len(rows[0])}")
+            rows.append(row)
+    if not rows:
+        raise ValueError("The file contains no matrix")
+    return sparse.maybe_sparse(rows)
+
+def _scan_csv(path):
+    """One pass over the raw bytes, choosing as parse_matrix does for text.
+
+    Returns the NumPy dtype that reads the file (None when it is not all
+    plain numbers) and the delimiter: "," or None for whitespace, taken from
+    the first line.
+    """
+    kind, delimiter, first = np.int64, ",", True
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            if first and chunk.strip():
+                first = False
+                delimiter = "," if b"," in chunk.lstrip().split(b"\n", 1)[0] else None
+            if chunk.translate(None, b"0123456789 \t\r\n,.eE+-"):
+                return None, delimiter
+            if kind is np.int64 and (b"." in chunk or b"e" in chunk or b"E" in chunk):
+                kind = float
+    return kind, delimiter
+
+def _save_csv(matrix, path):
+    if isinstance(matrix, SparseMatrix) and matrix.shape[0] * matrix.shape[1] > sparse.MAX_DENSE_CELLS:
+        raise ValueError("This sparse matrix is too large to write out densely; save it as .npz or .sym")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if backend.is_numeric_array(matrix) and matrix.dtype.kind in "biuf":
+            # %.17g round-trips every double exactly
+            np.savetxt(f, matrix, delimiter=",", fmt="%d" if matrix.dtype.kind in "biu" else "%.17g")
+            return
+        writer = csv.writer(f)
+        for row in matrix:
+            writer.writerow([_csv_text(x) for x in row])
+
+def _csv_text(x):
+    if isinstance(x, (complex, np.complexfloating)):
+        return f"{float(x.real)!r}{float(x.imag):+.17g}*I"
+    if isinstance(x, (float, np.floating)):
+        return repr(float(x))
+    return str(x)
+
+# --- Lossless symbolic format ---
+
+def _save_sym(matrix, path):
+    is_sparse = isinstance(matrix, SparseMatrix)
+    shape = matrix.shape if is_sparse else (len(matrix), len(matrix[0]))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"format": SYM_FORMAT, "version": 1, "shape": list(shape), "sparse": is_sparse}) + "\n")
+        if is_sparse:
+            for i, j, x in zip(matrix.rows.tolist(), matrix.cols.tolist(), matrix.values.tolist()):
+                f.write(json.dumps([i, j, _srepr(x)]) + "\n")
+        else:
+            for row in matrix:
+                f.write(json.dumps([_srepr(x) for x in row]) + "\n")
+
+def _srepr(x):
+    if isinstance(x, (int, np.integer)):
+        return sp.srepr(sp.Integer(int(x)))
+    return sp.srepr(sp.sympify(x))
+
+def _load_sym(path):
+    with open(path, encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != SYM_FORMAT:
+            raise ValueError("Not a .sym matrix file")
+        n, m = header["shape"]
+        lines = (json.loads(line) for line in f if line.strip())
+        if header.get("sparse"):
+            entries = [(i, j, from_srepr(text)) for i, j, text in lines]
+            values = np.empty(len(entries), dtype=object)
+            values[:] = [x for _, _, x in entries]
+            return SparseMatrix.from_entries((n, m), [i for i, _, _ in entries], [j for _, j, _ in entries], values)
+        rows = [[from_srepr(text) for text in row] for row in lines]
+    if len(rows) != n or any(len(row) != m for row in rows):
+        raise ValueError(f"The file does not hold the {n}x{m} matrix its header announces")
+    return rows
+
+def from_srepr(text):
+    """Rebuilds a SymPy object from its srepr, allowing only the constructors in SREPR_CLASSES.
+
+    Strings are accepted only as the name of a Symbol, Dummy or Function
+    and as the digits of a Float, as other constructors may sympify (and so
+    evaluate) a string argument.
+    """
+    try:
+        return _build(ast.parse(text, mode="eval").body)
+    except (SyntaxError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid element {text[:60]!r}: {e}")
+
+def _build(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, int) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_build(node.operand)
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        raise ValueError("strings are only allowed as Symbol, Dummy and Function names and Float digits")
+    if isinstance(node, ast.Tuple):
+        return tuple(_build(e) for e in node.elts)
+    if isinstance(node, ast.Name) and node.id in SREPR_CONSTANTS:
+        return getattr(sp, node.id)
+    if isinstance(node, ast.Call):
+        if isinstance(node.func, ast.Name) and node.func.id in SREPR_NAMED:
+            return _build_named(node)
+        if isinstance(node.func, ast.Call):
+            # Applied undefined functions: Function('f')(Symbol('x'))
+            func = _build(node.func)
+            if not isinstance(func, sp.core.function.UndefinedFunction) or node.keywords:
+                raise ValueError("only undefined functions can be applied")
+            return func(*(_build(a) for a in node.args))
+        if not isinstance(node.func, ast.Name) or node.func.id not in SREPR_CLASSES:
+            raise ValueError(f"'{ast.unparse(node.func)}' is not an allowed SymPy constructor")
+        if node.keywords:
+            raise ValueError(f"{node.func.id}() takes no keyword arguments here")
+        return SREPR_CLASSES[node.func.id](*(_build(a) for a in node.args))
+    raise ValueError(f"unsupported syntax {type(node).__name__}")
+
+def _build_named(node):
+    """Symbol/Dummy/Function('name', flag=...) and Float('digits', precision=n): the only calls taking a string."""
+    if len(node.args) != 1 or not isinstance(node.args[0], ast.Constant) or not isinstance(node.args[0].value, str):
+        raise ValueError(f"{node.func.id}() takes one string argument")
+    text = node.args[0].value
+    if node.func.id == "Float" and not FLOAT_DIGITS.fullmatch(text):
+        raise ValueError(f"'{text[:30]}' is not a number")
+    options = {}
+    for k in node.keywords:
+        if k.arg is None or not isinstance(k.value, ast.Constant) or not isinstance(k.value.value, (bool, int, type(None))):
+            raise ValueError(f"{node.func.id}() options must be literal flags or integers")
+        options[k.arg] = k.value.value
+    return SREPR_NAMED[node.func.id](text, **options)
@@ -0,0 +1,457 @@
+import os
+import tkinter as tk
+from tkinter import ttk, filedialog
+from src import profiling
+from src.lazy import LazyModule
+
+# Imported on first use so an empty grid can be shown before the math engine is loaded
+np = LazyModule("numpy")
+logic = LazyModule("src.logic")
+backend = LazyModule("src.backend")
+sparse = LazyModule("src.sparse")
+fileio = LazyModule("src.fileio")
+
+CELL_HEIGHT = 24
+HEADER_WIDTH = 48
+HEADER_HEIGHT = 22
+# Formatted cells kept per grid before the cache is dropped
+MAX_CACHED_CELLS = 50000
+# Matrices up to this many cells are prefilled in the text editor
+MAX_TEXT_CELLS = 10000
+FILE_TYPES = [("Matrix files", "*.npy *.npz *.csv *.sym"), ("NumPy array", "*.npy"), ("NumPy archive", "*.npz"),
+              ("CSV", "*.csv"), ("Symbolic matrix", "*.sym"), ("All files", "*.*")]
+
+def visible_range(offset, extent, size, count):
+    """Indices of the cells of the given size that intersect [offset, offset + extent)."""
+    first = max(0, int(offset // size))
+    last = min(count, int((offset + extent) // size) + 1)
+    return range(first, last)
+
+def shorten(text, limit):
+    """Cuts text to limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def matrix_to_text(matrix):
+    """Plain text of a matrix in the input format (coordinate lines for sparse matrices)."""
+    if isinstance(matrix, sparse.SparseMatrix):
+        return matrix.to_text()
+    return "\n".join(", ".join(str(x) for x in row) for row in backend.to_rows(matrix))
+
+class MatrixGrid(tk.Frame):
+    """Spreadsheet-style matrix view that only formats and draws the visible cells.
+
+    Works on lists, NumPy arrays and sparse matrices alike. Cell text is formatted on first
+    display and cached, so scrolling over a large matrix stays smooth. With
+    editable=True cells can be edited in place (double-click or Enter), the
+    size can be set and text can be pasted with Ctrl+V.
+    """
+    def __init__(self, parent, editable=False, formatter=None, cell_width=96, height=6, width=5):
+        super().__init__(parent, bg='#16213e')
+        self.editable = editable
+        self.formatter = formatter or (lambda x: logic.format_symbolic(x))
+        self.cell_width = cell_width
+        self.matrix = []
+        self.cells = {}
+        self.selected = None
+        self.editor = None
+        self.editing = None
+        self.x0 = self.y0 = 0
+
+        if editable:
+            self.create_toolbar()
+        self.canvas = tk.Canvas(self, bg='#2c3e50', highlightthickness=0, takefocus=1,
+                                width=HEADER_WIDTH + width * cell_width, height=HEADER_HEIGHT + height * CELL_HEIGHT)
+        self.ybar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.xbar = ttk.Scrollbar(self, orient='horizontal', command=self.xview)
+        self.canvas.grid(row=1, column=0, sticky='nsew')
+        self.ybar.grid(row=1, column=1, sticky='ns')
+        self.xbar.grid(row=2, column=0, sticky='ew')
+        self.status_label = tk.Label(self, text="", anchor='w', bg='#16213e', fg='#95a5a6', font=('Arial', 9))
+        self.status_label.grid(row=3, column=0, columnspan=2, sticky='ew')
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<MouseWheel>', lambda e: self.yview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Shift-MouseWheel>', lambda e: self.xview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.yview('scroll', -1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.yview('scroll', 1, 'units'))
+        self.canvas.bind('<Shift-Button-4>', lambda e: self.xview('scroll', -1, 'units'))
+        self.canvas.bind('<Shift-Button-5>', lambda e: self.xview('scroll', 1, 'units'))
+        for key, (di, dj) in {'<Up>': (-1, 0), '<Down>': (1, 0), '<Left>': (0, -1), '<Right>': (0, 1)}.items():
+            self.canvas.bind(key, lambda e, di=di, dj=dj: self.move_selection(di, dj))
+        self.canvas.bind('<Prior>', lambda e: self.yview('scroll', -1, 'pages'))
+        self.canvas.bind('<Next>', lambda e: self.yview('scroll', 1, 'pages'))
+        self.canvas.bind('<Control-c>', lambda e: self.copy())
+        if editable:
+            self.canvas.bind('<Double-Button-1>', lambda e: self.edit_cell(*self.selected) if self.selected else None)
+            self.canvas.bind('<Return>', lambda e: self.edit_cell(*self.selected) if self.selected else None)
+            self.canvas.bind('<Control-v>', lambda e: self.paste())
+
+    def create_toolbar(self):
+        """Size entry and text/paste/clear/file buttons shown above editable grids."""
+        bar = tk.Frame(self, bg='#16213e')
+        bar.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(0, 2))
+        tk.Label(bar, text="Size:", bg='#16213e', fg='#ffffff', font=('Arial', 9)).pack(side='left')
+        self.size_entry = tk.Entry(bar, width=9, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Arial', 10))
+        self.size_entry.pack(side='left', padx=(2, 2))
+        self.size_entry.bind('<Return>', lambda e: self.apply_size())
+        ttk.Button(bar, text="Set", style='Custom.TButton', command=self.apply_size).pack(side='left', padx=2)
+        ttk.Button(bar, text="Text…", style='Custom.TButton', command=self.open_text_editor).pack(side='left', padx=2)
+        ttk.Button(bar, text="Paste", style='Custom.TButton', command=self.paste).pack(side='left', padx=2)
+        ttk.Button(bar, text="Clear", style='Custom.TButton', command=lambda: self.set_matrix([])).pack(side='left', padx=2)
+        ttk.Button(bar, text="Open…", style='Custom.TButton', command=self.open_file).pack(side='left', padx=2)
+        ttk.Button(bar, text="Save…", style='Custom.TButton', command=self.save_file).pack(side='left', padx=2)
+
+    # --- Data ---
+
+    def shape(self):
+        if len(self.matrix) == 0:
+            return 0, 0
+        return len(self.matrix), len(self.matrix[0])
+
+    def set_matrix(self, matrix):
+        """Shows a new matrix (list of rows or NumPy array), dropping cached cell text."""
+        self.cancel_edit()
+        self.matrix = matrix if len(matrix) else []
+        self.cells.clear()
+        self.selected = None
+        self.x0 = self.y0 = 0
+        rows, cols = self.shape()
+        if self.editable:
+            self.size_entry.delete(0, tk.END)
+            if rows: self.size_entry.insert(0, f"{rows}x{cols}")
+        self.show_status()
+        self.redraw()
+
+    def get_matrix(self):
+        """The current matrix, or [] when empty."""
+        return self.matrix
+
+    def set_cell(self, i, j, value):
+        """Replaces one element, keeping the compact array form when the value fits it."""
+        m = self.matrix
+        if isinstance(m, sparse.SparseMatrix):
+            self.matrix = m.with_entry(i, j, value)
+            self.cells.pop((i, j), None)
+            return
+        if backend.is_numeric_array(m):
+            # Integer arrays only take integers; float arrays take any number
+            if m.dtype.kind in "biu":
+                fits = backend.is_integer_matrix([[value]])
+            else:
+                fits = backend.element_kind(value) != backend.SYMBOLIC
+            if fits:
+                try:
+                    m = m.copy()
+                    m[i, j] = value
+                    self.matrix = m
+                    self.cells.pop((i, j), None)
+                    return
+                except (TypeError, ValueError, OverflowError):
+                    pass
+        rows = [list(row) for row in backend.to_rows(self.matrix)]
+        rows[i][j] = value
+        self.matrix = rows
+        self.cells.pop((i, j), None)
+
+    def resize(self, rows, cols):
+        """Changes the size, keeping overlapping elements and filling new ones with 0."""
+        old_rows, old_cols = self.shape()
+        if isinstance(self.matrix, sparse.SparseMatrix):
+            m = self.matrix.resized(rows, cols)
+        elif backend.is_numeric_array(self.matrix):
+            m = np.zeros((rows, cols), dtype=self.matrix.dtype)
+            m[:min(rows, old_rows), :min(cols, old_cols)] = self.matrix[:rows, :cols]
+        elif old_rows:
+            m = [[self.matrix[i][j] if i < old_rows and j < old_cols else 0 for j in range(cols)] for i in range(rows)]
+        else:
+            m = np.zeros((rows, cols), dtype=np.int64)
+        self.set_matrix(m)
+
+    def apply_size(self):
+        text = self.size_entry.get().lower().replace('×', 'x').replace(' ', '')
+        try:
+            rows, cols = (int(n) for n in (text.split('x') if 'x' in text else (text, text)))
+            if rows < 1 or cols < 1: raise ValueError
+        except ValueError:
+            self.show_status("Size must look like 3x3 (rows x columns)", error=True)
+            return
+        self.resize(rows, cols)
+
+    def cell_text(self, i, j):
+        """Formatted text of one cell, computed on first use."""
+        text = self.cells.get((i, j))
+        if text is None:
+            if len(self.cells) >= MAX_CACHED_CELLS:
+                self.cells.clear()
+            try:
+                text = self.formatter(self.matrix[i][j])
+            except Exception:
+                text = str(self.matrix[i][j])
+            self.cells[(i, j)] = text
+        return text
+
+    # --- Drawing ---
+
+    def redraw(self):
+        """Draws the cells that intersect the visible area, plus row and column headers."""
+        c = self.canvas
+        c.delete('grid')
+        width, height = c.winfo_width(), c.winfo_height()
+        rows, cols = self.shape()
+        view_w, view_h = max(1, width - HEADER_WIDTH), max(1, height - HEADER_HEIGHT)
+        self.x0 = max(0, min(self.x0, cols * self.cell_width - view_w))
+        self.y0 = max(0, min(self.y0, rows * CELL_HEIGHT - view_h))
+        self.update_scrollbars(rows, cols, view_w, view_h)
+        if not rows:
+            hint = "Empty: set a size, paste (Ctrl+V) or enter text" if self.editable else "No matrix"
+            c.create_text(width // 2, height // 2, text=hint, fill='#95a5a6', font=('Arial', 10), tags='grid')
+            return
+
+        limit = max(1, self.cell_width // 8)
+        row_range = visible_range(self.y0, view_h, CELL_HEIGHT, rows)
+        col_range = visible_range(self.x0, view_w, self.cell_width, cols)
+        for i in row_range:
+            y = HEADER_HEIGHT + i * CELL_HEIGHT - self.y0
+            for j in col_range:
+                x = HEADER_WIDTH + j * self.cell_width - self.x0
+                fill = '#0f3460' if self.selected == (i, j) else '#2c3e50'
+                c.create_rectangle(x, y, x + self.cell_width, y + CELL_HEIGHT, fill=fill, outline='#34495e', tags='grid')
+                c.create_text(x + 4, y + CELL_HEIGHT // 2, anchor='w', text=shorten(self.cell_text(i, j), limit),
+                              fill='#ecf0f1', font=('Consolas', 10), tags='grid')
+
+        # Headers are drawn last so they cover partly scrolled cells
+        c.create_rectangle(0, 0, width, HEADER_HEIGHT, fill='#16213e', outline='', tags='grid')
+        c.create_rectangle(0, 0, HEADER_WIDTH, height, fill='#16213e', outline='', tags='grid')
+        for j in col_range:
+            x = HEADER_WIDTH + j * self.cell_width - self.x0
+            if x + self.cell_width > HEADER_WIDTH:
+                c.create_text(max(x + self.cell_width // 2, HEADER_WIDTH + 8), HEADER_HEIGHT // 2, text=str(j + 1),
+                              fill='#95a5a6', font=('Arial', 9), tags='grid')
+        for i in row_range:
+            y = HEADER_HEIGHT + i * CELL_HEIGHT - self.y0
+            if y + CELL_HEIGHT > HEADER_HEIGHT:
+                c.create_text(HEADER_WIDTH // 2, max(y + CELL_HEIGHT // 2, HEADER_HEIGHT + 8), text=str(i + 1),
+                              fill='#95a5a6', font=('Arial', 9), tags='grid')
+        c.create_rectangle(0, 0, HEADER_WIDTH, HEADER_HEIGHT, fill='#16213e', outline='', tags='grid')
+        if self.editing:
+            i, j = self.editing
+            c.coords('editor', HEADER_WIDTH + j * self.cell_width - self.x0, HEADER_HEIGHT + i * CELL_HEIGHT - self.y0)
+            c.tag_raise('editor')
+
+    def update_scrollbars(self, rows, cols, view_w, view_h):
+        total_w, total_h = cols * self.cell_width, rows * CELL_HEIGHT
+        self.xbar.set(*((self.x0 / total_w, min(1.0, (self.x0 + view_w) / total_w)) if total_w else (0, 1)))
+        self.ybar.set(*((self.y0 / total_h, min(1.0, (self.y0 + view_h) / total_h)) if total_h else (0, 1)))
+
+    def xview(self, *args):
+        self.x0 = self._scrolled(args, self.x0, self.cell_width, self.shape()[1], self.canvas.winfo_width() - HEADER_WIDTH)
+        self.redraw()
+
+    def yview(self, *args):
+        self.y0 = self._scrolled(args, self.y0, CELL_HEIGHT, self.shape()[0], self.canvas.winfo_height() - HEADER_HEIGHT)
+        self.redraw()
+
+    def _scrolled(self, args, offset, size, count, view):
+        """New pixel offset for a scrollbar command ('moveto' or 'scroll' by units/pages)."""
+        self.finish_edit()
+        if args[0] == 'moveto':
+            offset = float(args[1]) * count * size
+        elif args[0] == 'scroll':
+            step = max(size, view - size) if args[2] == 'pages' else size
+            offset += int(args[1]) * step
+        return max(0, min(offset, count * size - view))
+
+    def see(self, i, j):
+        """Scrolls so that cell (i, j) is visible."""
+        view_w = self.canvas.winfo_width() - HEADER_WIDTH
+        view_h = self.canvas.winfo_height() - HEADER_HEIGHT
+        x, y = j * self.cell_width, i * CELL_HEIGHT
+        if x < self.x0: self.x0 = x
+        elif x + self.cell_width > self.x0 + view_w: self.x0 = x + self.cell_width - view_w
+        if y < self.y0: self.y0 = y
+        elif y + CELL_HEIGHT > self.y0 + view_h: self.y0 = y + CELL_HEIGHT - view_h
+
+    # --- Selection and editing ---
+
+    def cell_at(self, x, y):
+        if x < HEADER_WIDTH or y < HEADER_HEIGHT:
+            return None
+        i, j = int((y - HEADER_HEIGHT + self.y0) // CELL_HEIGHT), int((x - HEADER_WIDTH + self.x0) // self.cell_width)
+        rows, cols = self.shape()
+        return (i, j) if i < rows and j < cols else None
+
+    def on_click(self, event):
+        self.canvas.focus_set()
+        if self.finish_edit():
+            self.select(self.cell_at(event.x, event.y))
+
+    def select(self, cell):
+        self.selected = cell
+        if cell:
+            self.see(*cell)
+        self.show_status()
+        self.redraw()
+
+    def move_selection(self, di, dj):
+        rows, cols = self.shape()
+        if not rows:
+            return
+        i, j = self.selected or (0, 0)
+        self.select((min(max(i + di, 0), rows - 1), min(max(j + dj, 0), cols - 1)))
+
+    def show_status(self, message=None, error=False):
+        """Shows the size and the full text of the selected cell, or a message."""
+        if message is None:
+            rows, cols = self.shape()
+            message = f"{rows} × {cols}" if rows else ""
+            if self.selected:
+                i, j = self.selected
+                message += f"   [{i + 1}, {j + 1}] = {self.cell_text(i, j)}"
+        self.status_label.config(text=message, fg='#e74c3c' if error else '#95a5a6')
+
+    def edit_cell(self, i, j):
+        """Opens an entry over cell (i, j); Enter or Tab commits, Escape cancels."""
+        if not self.finish_edit():
+            return
+        self.see(i, j)
+        self.redraw()
+        x = HEADER_WIDTH + j * self.cell_width - self.x0
+        y = HEADER_HEIGHT + i * CELL_HEIGHT - self.y0
+        self.editor = tk.Entry(self.canvas, bg='#ecf0f1', fg='#1a1a2e', font=('Consolas', 10), relief='flat')
+        self.editor.insert(0, str(self.matrix[i][j]))
+        self.editor.select_range(0, tk.END)
+        self.editing = (i, j)
+        self.canvas.create_window(x, y, window=self.editor, anchor='nw', width=self.cell_width, height=CELL_HEIGHT, tags='editor')
+        self.editor.bind('<Return>', lambda e: self.finish_edit(move=(1, 0)))
+        self.editor.bind('<Tab>', self.on_tab)
+        self.editor.bind('<Escape>', lambda e: self.cancel_edit())
+        self.editor.focus_set()
+
+    def finish_edit(self, move=None):
+        """Commits the open cell editor, if any; returns False when the input is invalid."""
+        if self.editor is None:
+            return True
+        i, j = self.editing
+        try:
+            parsed = backend.to_rows(self.parse(self.editor.get()))
+            if len(parsed) != 1 or len(parsed[0]) != 1:
+                raise ValueError("Enter a single element")
+        except Exception as e:
+            self.show_status(f"Invalid element: {e}", error=True)
+            return False
+        self.set_cell(i, j, parsed[0][0])
+        self.cancel_edit()
+        if move:
+            # Keep typing in the next cell, as in a spreadsheet
+            self.select((i, j))
+            self.move_selection(*move)
+            if self.selected != (i, j):
+                self.edit_cell(*self.selected)
+        return True
+
+    def on_tab(self, event):
+        self.finish_edit(move=(0, 1))
+        return 'break'
+
+    def cancel_edit(self):
+        if self.editor is not None:
+            self.canvas.delete('editor')
+            self.editor.destroy()
+            self.editor = None
+            self.editing = None
+            self.canvas.focus_set()
+            self.show_status()
+            self.redraw()
+
+    # --- Clipboard and text ---
+
+    def parse(self, text):
+        """Parses input text, timed as a parse stage of the next operation."""
+        with profiling.stage("parse", profiling.session.pending):
+            return logic.parse_matrix(text)
+
+    def copy(self):
+        """Copies the selected cell, or the whole matrix when nothing is selected."""
+        if self.selected:
+            text = str(self.matrix[self.selected[0]][self.selected[1]])
+        else:
+            text = matrix_to_text(self.matrix)
+        self.clipboard_clear()
+        self.clipboard_append(text)
+
+    def paste(self):
+        """Pastes clipboard text: a single element into the selected cell, else a whole matrix."""
+        try:
+            matrix = self.parse(self.clipboard_get())
+        except tk.TclError:
+            return
+        except Exception as e:
+            self.show_status(f"Could not paste: {e}", error=True)
+            return
+        if self.selected and len(matrix) == 1 and len(matrix[0]) == 1:
+            self.set_cell(*self.selected, backend.to_rows(matrix)[0][0])
+            self.show_status()
+            self.redraw()
+        elif len(matrix):
+            self.set_matrix(matrix)
+
+    def open_text_editor(self):
+        """Edits the matrix as text in a small window, in the usual input format."""
+        window = tk.Toplevel(self, bg='#16213e')
+        window.title("Edit matrix as text")
+        tk.Label(window, text="One row per line, elements separated by commas or spaces:", bg='#16213e', fg='#ffffff').pack(anchor='w', padx=5, pady=5)
+        text = tk.Text(window, width=60, height=15, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Consolas', 11))
+        text.pack(fill='both', expand=True, padx=5)
+        rows, cols = self.shape()
+        if rows * cols <= MAX_TEXT_CELLS:
+            text.insert('1.0', matrix_to_text(self.matrix))
+        error = tk.Label(window, text="", bg='#16213e', fg='#e74c3c')
+        error.pack(anchor='w', padx=5)
+
+        def apply():
+            try:
+                self.set_matrix(self.parse(text.get('1.0', tk.END)))
+            except Exception as e:
+                error.config(text=f"⚠️ {e}")
+                return
+            window.destroy()
+
+        buttons = tk.Frame(window, bg='#16213e')
+        buttons.pack(fill='x', padx=5, pady=5)
+        ttk.Button(buttons, text="Apply", style='Custom.TButton', command=apply).pack(side='right', padx=5)
+        ttk.Button(buttons, text="Cancel", style='Custom.TButton', command=window.destroy).pack(side='right')
+        text.focus_set()
+
+    # --- Files ---
+
+    def open_file(self):
+        """Loads a matrix file; large .npy/.npz files are memory-mapped rather than read."""
+        path = filedialog.askopenfilename(parent=self, filetypes=FILE_TYPES)
+        if not path: return
+        try:
+            with profiling.stage("parse", profiling.session.pending):
+                matrix = logic.load_matrix(path)
+        except Exception as e:
+            self.show_status(f"Could not open {os.path.basename(path)}: {e}", error=True)
+            return
+        self.set_matrix(matrix)
+        rows, cols = self.shape()
+        mapped = " (memory-mapped)" if isinstance(matrix, fileio.MappedArray) else ""
+        self.show_status(f"{rows} × {cols}   loaded from {os.path.basename(path)}{mapped}")
+
+    def save_file(self):
+        """Writes the matrix to a file in the format chosen by its extension."""
+        if not len(self.matrix):
+            self.show_status("There is no matrix to save", error=True)
+            return
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".npy", filetypes=FILE_TYPES)
+        if not path: return
+        try:
+            logic.save_matrix(self.matrix, path)
+        except (ValueError, OSError) as e:
+            self.show_status(f"Could not save: {e}", error=True)
+            return
+        self.show_status(f"Saved to {os.path.basename(path)}")
@@ -1,18 +1,58 @@
+import os
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-import numpy as np
-import sympy as sp
-import src.logic as logic
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+from src import lazy, profiling
+from src.grid import MatrixGrid
+from src.jobs import JobRunner
+from src.lazy import LazyModule
+
+# NumPy and SymPy take most of the start-up time, so they load in the background once the window is up
+sp = LazyModule("sympy")
+logic = LazyModule("src.logic")
+parallel = LazyModule("src.parallel")
+expression = LazyModule("src.expression")
+workspace = LazyModule("src.workspace")
+
+# Matrix results with more cells than this are shown only in the result grid
+MAX_LOG_CELLS = 400
+# Input grids are real widgets built on the Tk thread; more matrices go in the workspace
+MAX_INPUT_GRIDS = 26
+# Where cProfile/tracemalloc snapshots go when saving them is switched on
+PROFILE_DIR = "profiles"
+# Seconds from launch until the window should be interactive (see python main.py --startup-time)
+STARTUP_TARGET = 0.5
+
+def matrix_name(i):
+    """Name of the i-th input grid: A to Z, then AA, AB, ... as for spreadsheet columns."""
+    name = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        name = chr(ord('A') + r) + name
+    return name
 
 class AdvancedMathCalculator:
     """Main application class for the Matrix Calculator GUI."""
-    def __init__(self, root):
+    def __init__(self, root, started=None, started_cpu=None, on_ready=None):
         self.root = root
         self.matrix_count = 2
-        self.matrix_texts = []
+        self.matrix_grids = []
+        self.workspace = None
+        self.jobs = JobRunner()
+        self.poll_after_id = None
+        self.profile_record = None
+        self.output_built = False
+        self.started = started if started is not None else time.perf_counter()
+        self.started_cpu = started_cpu if started_cpu is not None else time.process_time()
+        self.startup_record = profiling.new_record("startup")
+        self.on_ready = on_ready
         self.setup_window()
         self.setup_styles()
         self.create_widgets()
+        # Idle callbacks run after the pending geometry and mapping work, once the event loop is free
+        self.root.after_idle(self.warm_up)
         
     def setup_window(self):
         """Configures the main application window settings."""
@@ -36,6 +76,9 @@ class AdvancedMathCalculator:
         self.style.configure('TNotebook', background='#1a1a2e', borderwidth=0)
         self.style.configure('TNotebook.Tab', background='#16213e', foreground='#ffffff', padding=[20, 10], font=('Arial', 12, 'bold'))
         self.style.map('TNotebook.Tab', background=[('selected', '#0f3460'), ('active', '#1e5f8b')])
+        self.style.configure('Treeview', background='#2c3e50', foreground='#ecf0f1', fieldbackground='#2c3e50', font=('Arial', 10))
+        self.style.configure('Treeview.Heading', background='#0f3460', foreground='#ffffff', font=('Arial', 10, 'bold'))
+        self.style.map('Treeview', background=[('selected', '#1e5f8b')])
         
     def create_widgets(self):
         """Creates the main layout components including the title and notebook tabs."""
@@ -50,8 +93,16 @@ class AdvancedMathCalculator:
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.grid(row=1, column=0, sticky='nsew', padx=5, pady=5)
         
+        # Settings read by operations exist before the Results tab that shows them is built
+        self.full_simplify_var = tk.BooleanVar(value=False)
+        self.show_timings_var = tk.BooleanVar(value=True)
+        self.track_memory_var = tk.BooleanVar(value=False)
+        self.save_profiles_var = tk.BooleanVar(value=False)
         self.create_matrix_tab()
-        self.create_output_tab()
+        # The Results tab is only a placeholder until it is first shown
+        self.output_frame = tk.Frame(self.notebook, bg='#16213e')
+        self.notebook.add(self.output_frame, text='📋 Results')
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.create_output_tab() if self.notebook.index('current') == 1 else None)
         
         # Inline Error Label at the bottom
         self.error_label = tk.Label(main_frame, text="", bg='#1a1a2e', fg='#e74c3c', font=('Arial', 12, 'bold'))
@@ -88,9 +139,10 @@ class AdvancedMathCalculator:
         tk.Label(count_input_frame, text="Count:", bg='#16213e', fg='#ffffff', font=('Arial', 10)).pack(side='left', padx=(0, 5))
 
         self.matrix_count_var = tk.StringVar(value="2")
-        self.matrix_count_spinbox = tk.Spinbox(count_input_frame, from_=2, to=4, textvariable=self.matrix_count_var, width=5, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Arial', 12), command=self.update_matrix_inputs)
+        self.matrix_count_spinbox = tk.Spinbox(count_input_frame, from_=1, to=MAX_INPUT_GRIDS, textvariable=self.matrix_count_var, width=5, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Arial', 12), command=self.update_matrix_inputs)
         self.matrix_count_spinbox.pack(side='left', padx=(0, 10))
-        tk.Label(count_input_frame, text="(Max: 4)", bg='#16213e', fg='#95a5a6', font=('Arial', 9)).pack(side='left')
+        self.matrix_count_spinbox.bind('<Return>', lambda e: self.update_matrix_inputs())
+        tk.Label(count_input_frame, text=f"(Max: {MAX_INPUT_GRIDS}, named A to {matrix_name(MAX_INPUT_GRIDS - 1)}; open more in the Workspace)", bg='#16213e', fg='#95a5a6', font=('Arial', 9)).pack(side='left')
     
         # Scalar & Power Inputs
         scalar_frame = tk.LabelFrame(left_frame, text="Scalar Input", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
@@ -105,6 +157,7 @@ class AdvancedMathCalculator:
         self.matrix_input_frame = tk.LabelFrame(left_frame, text="Matrix Input", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
         self.matrix_input_frame.pack(fill='x', pady=5)
         self.create_matrix_inputs()
+        self.create_workspace_panel(left_frame)
 
         power_frame = tk.LabelFrame(left_frame, text="Power Input", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
         power_frame.pack(fill='x', pady=5)
@@ -115,6 +168,31 @@ class AdvancedMathCalculator:
         self.power_entry.pack(side='left')
         tk.Label(power_input_frame, text="(for Matrix Power)", bg='#16213e', fg='#95a5a6', font=('Arial', 9)).pack(side='left', padx=(10, 0))
 
+        eigen_frame = tk.LabelFrame(left_frame, text="Eigen Solver", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
+        eigen_frame.pack(fill='x', pady=5)
+        eigen_input_frame = tk.Frame(eigen_frame, bg='#16213e')
+        eigen_input_frame.pack(fill='x', padx=5, pady=5)
+        tk.Label(eigen_input_frame, text="Mode:", bg='#16213e', fg='#ffffff', font=('Arial', 10)).pack(side='left', padx=(0, 5))
+        self.eigen_mode_var = tk.StringVar(value="auto")
+        eigen_mode_box = ttk.Combobox(eigen_input_frame, textvariable=self.eigen_mode_var, values=[self.eigen_mode_var.get()], state='readonly', width=8)
+        eigen_mode_box.configure(postcommand=lambda: eigen_mode_box.configure(values=logic.EIGEN_MODES))
+        eigen_mode_box.pack(side='left')
+        tk.Label(eigen_input_frame, text="Digits:", bg='#16213e', fg='#ffffff', font=('Arial', 10)).pack(side='left', padx=(10, 5))
+        self.eigen_digits_entry = tk.Entry(eigen_input_frame, width=5, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Arial', 12))
+        self.eigen_digits_entry.insert(0, "10")
+        self.eigen_digits_entry.pack(side='left')
+        tk.Label(eigen_input_frame, text="(auto: exact up to 4x4)", bg='#16213e', fg='#95a5a6', font=('Arial', 9)).pack(side='left', padx=(10, 0))
+
+        workers_frame = tk.LabelFrame(left_frame, text="Parallel Multiplication", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
+        workers_frame.pack(fill='x', pady=5)
+        workers_input_frame = tk.Frame(workers_frame, bg='#16213e')
+        workers_input_frame.pack(fill='x', padx=5, pady=5)
+        tk.Label(workers_input_frame, text="Workers:", bg='#16213e', fg='#ffffff', font=('Arial', 10)).pack(side='left', padx=(0, 5))
+        cpus = os.cpu_count() or 1
+        self.workers_var = tk.StringVar(value=str(cpus))
+        tk.Spinbox(workers_input_frame, from_=1, to=max(cpus, 64), textvariable=self.workers_var, width=5, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Arial', 12)).pack(side='left')
+        tk.Label(workers_input_frame, text=f"(processes for large products; {cpus} CPUs)", bg='#16213e', fg='#95a5a6', font=('Arial', 9)).pack(side='left', padx=(10, 0))
+
         # Operation Buttons
         right_frame = tk.Frame(main_container, bg='#16213e')
         right_frame.pack(side='right', fill='both', expand=True)
@@ -130,194 +208,477 @@ class AdvancedMathCalculator:
 
         advanced_frame = tk.LabelFrame(right_frame, text="Advanced Operations", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
         advanced_frame.pack(fill='x', pady=5)
-        matrix_advanced_ops = [("Determinant", "determinant"), ("Inverse", "inverse"), ("Transpose", "transpose"), ("Eigenvalues", "eigenvalues"), ("Eigenvectors", "eigenvectors"), ("Trace", "trace"), ("Characteristics", "characteristics"), ("Gauss transformation", "gauss_transformation")]
+        matrix_advanced_ops = [("Determinant", "determinant"), ("Inverse", "inverse"), ("Transpose", "transpose"), ("Eigenvalues", "eigenvalues"), ("Eigenvectors", "eigenvectors"), ("Trace", "trace"), ("Characteristics", "characteristics"), ("Gauss transformation", "gauss_transformation"),
+                               ("Solve AX = B", "solve"), ("Reduced Echelon", "rref"), ("Rank", "rank"), ("Nullspace", "nullspace"),
+                               ("LU Decomposition", "lu_decomposition"), ("QR Decomposition", "qr_decomposition"), ("Cholesky", "cholesky_decomposition")]
         for i, (text, command) in enumerate(matrix_advanced_ops):
             row, col = i // 4, i % 4
             btn = ttk.Button(advanced_frame, text=text, style='Matrix.TButton', command=lambda cmd=command: self.matrix_operation(cmd))
             btn.grid(row=row, column=col, padx=3, pady=3, sticky='ew')
         for i in range(4): advanced_frame.grid_columnconfigure(i, weight=1)
 
+        expression_frame = tk.LabelFrame(right_frame, text="Expression", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
+        expression_frame.pack(fill='x', pady=5)
+        expression_input_frame = tk.Frame(expression_frame, bg='#16213e')
+        expression_input_frame.pack(fill='x', padx=5, pady=5)
+        self.expression_entry = tk.Entry(expression_input_frame, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Consolas', 12))
+        self.expression_entry.pack(side='left', fill='x', expand=True)
+        self.expression_entry.bind('<Return>', lambda e: self.matrix_operation("expression"))
+        ttk.Button(expression_input_frame, text="Evaluate", style='Matrix.TButton', command=lambda: self.matrix_operation("expression")).pack(side='left', padx=(5, 0))
+        tk.Label(expression_frame, text="e.g. inv(A)*B + T(A)*B, det(A*B), 2*A^3 - trace(B)*C  (functions: inv, T, det, trace, rank, solve, elementwise)",
+                 bg='#16213e', fg='#95a5a6', font=('Arial', 9)).pack(anchor='w', padx=5, pady=(0, 5))
+
+    def create_workspace_panel(self, parent):
+        """Builds the 'Workspace' list of named matrices with its operand and memory settings."""
+        frame = tk.LabelFrame(parent, text="Workspace", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
+        frame.pack(fill='x', pady=5)
+        columns = [("size", "Size", 90), ("type", "Type", 70), ("memory", "Memory", 80), ("where", "Held in", 70), ("source", "Source", 160)]
+        self.workspace_tree = ttk.Treeview(frame, columns=[c for c, _, _ in columns], height=5, selectmode='browse')
+        self.workspace_tree.heading('#0', text="Name")
+        self.workspace_tree.column('#0', width=80, stretch=False)
+        for column, text, width in columns:
+            self.workspace_tree.heading(column, text=text)
+            self.workspace_tree.column(column, width=width, stretch=column == "source")
+        self.workspace_tree.pack(fill='x', padx=5, pady=5)
+        self.workspace_tree.bind('<Double-Button-1>', lambda e: self.show_workspace_entry())
+        button_frame = tk.Frame(frame, bg='#16213e')
+        button_frame.pack(fill='x', padx=5)
+        ttk.Button(button_frame, text="Open File…", style='Custom.TButton', command=self.open_workspace_file).pack(side='left', padx=2)
+        ttk.Button(button_frame, text="Show", style='Custom.TButton', command=self.show_workspace_entry).pack(side='left', padx=2)
+        ttk.Button(button_frame, text="Remove", style='Custom.TButton', command=self.remove_workspace_entry).pack(side='left', padx=2)
+        self.workspace_status = tk.Label(button_frame, text="Input grids are added when an operation runs", bg='#16213e', fg='#95a5a6', font=('Arial', 9))
+        self.workspace_status.pack(side='left', padx=(10, 0))
+        operands_frame = tk.Frame(frame, bg='#16213e')
+        operands_frame.pack(fill='x', padx=5, pady=(5, 0))
+        tk.Label(operands_frame, text="Operands:", bg='#16213e', fg='#ffffff', font=('Arial', 10)).pack(side='left', padx=(0, 5))
+        self.operands_entry = tk.Entry(operands_frame, width=20, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Arial', 12))
+        self.operands_entry.pack(side='left')
+        tk.Label(operands_frame, text="(names such as R1, A; blank: the input grids in order)", bg='#16213e', fg='#95a5a6', font=('Arial', 9)).pack(side='left', padx=(10, 0))
+        budget_frame = tk.Frame(frame, bg='#16213e')
+        budget_frame.pack(fill='x', padx=5, pady=5)
+        tk.Label(budget_frame, text="Memory budget (MiB):", bg='#16213e', fg='#ffffff', font=('Arial', 10)).pack(side='left', padx=(0, 5))
+        self.budget_entry = tk.Entry(budget_frame, width=8, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Arial', 12))
+        self.budget_entry.pack(side='left')
+        self.budget_entry.bind('<Return>', lambda e: self.run_workspace_action(self.sync_inputs))
+        tk.Label(budget_frame, text="(blank: a quarter of the RAM; larger entries beyond it are moved to disk)", bg='#16213e', fg='#95a5a6', font=('Arial', 9)).pack(side='left', padx=(10, 0))
+
     def create_output_tab(self):
-        """Constructs the 'Results' tab with a scrollable text area for outputs."""
-        output_frame = tk.Frame(self.notebook, bg='#16213e')
-        self.notebook.add(output_frame, text='📋 Results')
-        output_label_frame = tk.LabelFrame(output_frame, text="Calculation Results", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
+        """Fills the 'Results' tab with a scrollable text area for outputs, on first use."""
+        if self.output_built: return
+        self.output_built = True
+        output_label_frame = tk.LabelFrame(self.output_frame, text="Calculation Results", bg='#16213e', fg='#ffffff', font=('Arial', 12, 'bold'))
         output_label_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        self.output_text = scrolledtext.ScrolledText(output_label_frame, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Consolas', 11), state='disabled')
-        self.output_text.pack(fill='both', expand=True, padx=5, pady=5)
+        status_frame = tk.Frame(output_label_frame, bg='#16213e')
+        status_frame.pack(fill='x', padx=5, pady=(5, 0))
+        self.job_progress = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
+        self.job_progress.pack(side='left', padx=5)
+        self.job_status_label = tk.Label(status_frame, text="Idle", bg='#16213e', fg='#95a5a6', font=('Arial', 10))
+        self.job_status_label.pack(side='left', padx=5)
+        self.cancel_button = ttk.Button(status_frame, text="Cancel", style='Custom.TButton', command=self.cancel_job)
+        self.cancel_button.pack(side='right', padx=5)
+        tk.Checkbutton(status_frame, text="Full simplification (slow)", variable=self.full_simplify_var, command=self.refresh_result_grid,
+                       bg='#16213e', fg='#ffffff', selectcolor='#2c3e50', activebackground='#16213e', activeforeground='#ffffff').pack(side='right', padx=5)
+        self.cancel_button.state(['disabled'])
+        profile_frame = tk.Frame(output_label_frame, bg='#16213e')
+        profile_frame.pack(fill='x', padx=5, pady=(5, 0))
+        for text, var in [("Show timings", self.show_timings_var), ("Track peak memory (slower)", self.track_memory_var),
+                          (f"Save cProfile/tracemalloc snapshots to {PROFILE_DIR}/", self.save_profiles_var)]:
+            tk.Checkbutton(profile_frame, text=text, variable=var, bg='#16213e', fg='#ffffff', selectcolor='#2c3e50',
+                           activebackground='#16213e', activeforeground='#ffffff').pack(side='left', padx=5)
+        ttk.Button(profile_frame, text="Export Log…", style='Custom.TButton', command=self.export_session_log).pack(side='right', padx=5)
+        panes = tk.PanedWindow(output_label_frame, orient='vertical', bg='#16213e', sashwidth=6, borderwidth=0)
+        panes.pack(fill='both', expand=True, padx=5, pady=5)
+        self.output_text = scrolledtext.ScrolledText(panes, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff', font=('Consolas', 11), state='disabled')
+        panes.add(self.output_text, stretch='always')
+        result_frame = tk.LabelFrame(panes, text="Result Matrix", bg='#16213e', fg='#ffffff', font=('Arial', 11, 'bold'))
+        self.result_grid = MatrixGrid(result_frame, formatter=lambda x: logic.format_symbolic(x, self.full_simplify_var.get()), cell_width=140, height=8)
+        self.result_grid.pack(fill='both', expand=True, padx=5, pady=5)
+        panes.add(result_frame, stretch='always')
         button_frame = tk.Frame(output_label_frame, bg='#16213e')
         button_frame.pack(fill='x', padx=5, pady=5)
         ttk.Button(button_frame, text="Clear Output", style='Custom.TButton', command=self.clear_output).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Copy to Clipboard", style='Custom.TButton', command=self.copy_results).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Save Result…", style='Custom.TButton', command=self.result_grid.save_file).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Keep Result", style='Custom.TButton', command=lambda: self.run_workspace_action(self.keep_result)).pack(side='left', padx=5)
     
     def matrix_operation(self, operation):
         """Dispatches GUI requests to the mathematical logic module and handles validation."""
         self.error_label.config(text="") # Clear previous errors
         try:
-            matrices = []
-            for matrix_text in self.matrix_texts:
-                data = self.parse_matrix(matrix_text.get("1.0", tk.END))
-                if data:
-                    self.validate_matrix_size(data, 6)
-                    matrices.append(data)
-
-            if not matrices: raise ValueError("At least one matrix is required")
-            matrix_a = matrices[0]
-
-            # Input validation logic
-            if operation in ["matrix_multiply", "matrix_subtract", "matrix_add", "elementwise_multiply"]:
-                if len(matrices) < 2: raise ValueError(f"{operation.replace('_', ' ').title()} requires at least 2 matrices")
-                if operation == "matrix_multiply":
-                    for i in range(len(matrices) - 1): self.validate_matrix_multiplication(matrices[i], matrices[i+1])
-                else:
-                    for i in range(1, len(matrices)): self.validate_matrix_sum_sub(matrices[0], matrices[i])
-
-            # Operation mapping
-            if operation == "matrix_add": result = logic.add_matrices(matrices)
-            elif operation == "matrix_subtract": result = logic.subtract_matrices(matrices)
-            elif operation == "matrix_multiply": result = logic.multiply_matrices(matrices)
-            elif operation == "elementwise_multiply": result = logic.elementwise_multiply(matrices)
-            elif operation == "determinant": result = logic.determinant(matrix_a)
-            elif operation == "inverse": result = logic.inverse(matrix_a)
-            elif operation == "transpose": result = logic.transpose(matrix_a)
-            elif operation == "trace": result = logic.trace(matrix_a)
-            elif operation == "eigenvalues": result = logic.eigenvalues(matrix_a)
-            elif operation == "eigenvectors": result = logic.eigenvectors(matrix_a)
-            elif operation == "characteristics": result = logic.characteristics(matrix_a)
-            elif operation == "gauss_transformation": result = logic.gauss_transformation(matrix_a)
-            elif operation == "matrix_power":
-                power_str = self.power_entry.get().strip()
-                if not power_str: raise ValueError("Enter power in Power Input field")
-                power = int(power_str)
-                result = logic.matrix_power(matrix_a, power)
-            elif operation == "scalar_multiply":
-                scalar_str = self.scalar_entry.get().strip()
-                if not scalar_str: raise ValueError("Enter scalar in Scalar Input field")
-                scalar = sp.sympify(scalar_str)
-                if scalar == sp.zoo or scalar == sp.nan:
-                    raise ValueError("Division by zero in scalar input")
-                result = logic.scalar_multiply(matrix_a, scalar)
-            else: raise ValueError(f"Operation {operation} not found")
-
-            # Result formatting selection
-            if operation in ["determinant", "trace"]: self.display_result(operation, result, 0)
-            elif operation in ["eigenvalues", "eigenvectors"]: self.display_result(operation, result, 3)
-            elif operation == "characteristics": self.display_result(operation, result, 2)
-            else: self.display_result(operation, result, 1)
-
+            record = profiling.session.begin(operation)
+            with profiling.stage("validate", record):
+                task, details = self.build_task(operation)
+                self.refresh_workspace()
+                workers = self.workers_var.get().strip()
+                if not workers.isdigit() or int(workers) < 1: raise ValueError("Workers must be a positive integer")
+            dump_dir = PROFILE_DIR if self.save_profiles_var.get() else None
+            self.jobs.submit(operation, parallel.with_workers, int(workers), profiling.run, operation, task[0], task[1:],
+                             self.track_memory_var.get(), dump_dir, context={"details": details, "profile": record})
+            self.create_output_tab()
             self.notebook.select(1) # Auto-switch to results tab
+            self.poll_jobs()
 
         except ValueError as e:
             self.error_label.config(text=f"⚠️ {str(e)}")
         except Exception as e:
             self.error_label.config(text=f"❌ Error: {str(e)}")
 
+    def build_task(self, operation):
+        """Validates the input for an operation; returns the (function, *args) task and detail lines."""
+        ws = self.sync_inputs()
+        if operation == "expression": return self.build_expression_task(ws)
+        operands = self.operands_entry.get().replace(",", " ").split()
+        names = operands or [name for name in map(matrix_name, range(len(self.matrix_grids))) if name in ws.entries]
+        matrices = [ws.get(name) for name in names]
+
+        if not matrices: raise ValueError("At least one matrix is required")
+        matrix_a = matrices[0]
+        details = [f"Operands: {', '.join(names)}"] if operands else []
+
+        # Input validation logic
+        if operation in ["matrix_multiply", "matrix_subtract", "matrix_add", "elementwise_multiply"]:
+            if len(matrices) < 2: raise ValueError(f"{operation.replace('_', ' ').title()} requires at least 2 matrices")
+            if operation == "matrix_multiply":
+                for i in range(len(matrices) - 1): self.validate_matrix_multiplication(matrices[i], matrices[i+1])
+            else:
+                for i in range(1, len(matrices)): self.validate_matrix_sum_sub(matrices[0], matrices[i])
+
+        # Operation mapping (the functions run in a worker process)
+        if operation == "matrix_add": task = (logic.add_matrices, matrices)
+        elif operation == "matrix_subtract": task = (logic.subtract_matrices, matrices)
+        elif operation == "matrix_multiply":
+            task = (logic.multiply_matrices, matrices)
+            plan = logic.multiplication_plan(matrices, names)
+            details += [f"Evaluation order: {plan['order']}",
+                       f"Multiply-adds: {plan['cost']:,} (left to right: {plan['left_to_right_cost']:,})"]
+        elif operation == "elementwise_multiply": task = (logic.elementwise_multiply, matrices)
+        elif operation == "determinant": task = (logic.determinant, matrix_a)
+        elif operation == "inverse": task = (logic.inverse, matrix_a)
+        elif operation == "transpose": task = (logic.transpose, matrix_a)
+        elif operation == "trace": task = (logic.trace, matrix_a)
+        elif operation in ["eigenvalues", "eigenvectors"]:
+            digits_str = self.eigen_digits_entry.get().strip() or "10"
+            if not digits_str.isdigit() or int(digits_str) < 1: raise ValueError("Digits must be a positive integer")
+            func = logic.eigenvalues if operation == "eigenvalues" else logic.eigenvectors
+            task = (func, matrix_a, self.eigen_mode_var.get(), int(digits_str), self.full_simplify_var.get())
+        elif operation == "characteristics": task = (logic.characteristics, matrix_a)
+        elif operation == "gauss_transformation": task = (logic.gauss_transformation, matrix_a)
+        elif operation == "solve":
+            if len(matrices) < 2: raise ValueError("Solve needs the coefficients in A and the right-hand sides in B")
+            details += [f"Columns of the result solve {names[0]} x = (matching column of {names[1]})"]
+            task = (logic.solve, matrix_a, matrices[1])
+        elif operation == "rref": task = (logic.rref, matrix_a)
+        elif operation == "rank": task = (logic.rank, matrix_a)
+        elif operation == "nullspace":
+            details += ["Columns of the result form a nullspace basis"]
+            task = (logic.nullspace, matrix_a)
+        elif operation in ["lu_decomposition", "qr_decomposition", "cholesky_decomposition"]: task = (getattr(logic, operation), matrix_a)
+        elif operation == "matrix_power":
+            power_str = self.power_entry.get().strip()
+            if not power_str: raise ValueError("Enter power in Power Input field")
+            power = sp.sympify(power_str)
+            if power.is_number and not power.is_Integer:
+                raise ValueError("Power must be an integer or a symbol such as n")
+            task = (logic.matrix_power, matrix_a, power)
+        elif operation == "scalar_multiply":
+            scalar_str = self.scalar_entry.get().strip()
+            if not scalar_str: raise ValueError("Enter scalar in Scalar Input field")
+            scalar = sp.sympify(scalar_str)
+            if scalar == sp.zoo or scalar == sp.nan:
+                raise ValueError("Division by zero in scalar input")
+            task = (logic.scalar_multiply, matrix_a, scalar)
+        else: raise ValueError(f"Operation {operation} not found")
+        return task, details
+
+    def build_expression_task(self, ws):
+        """Parses the Expression box over every workspace matrix; the task evaluates it in the worker."""
+        text = self.expression_entry.get().strip()
+        if not text: raise ValueError("Enter an expression such as inv(A)*B + T(A)*B")
+        expr = expression.parse(text, ws.shapes())
+        details = [f"Expression: {expr.text}"] + [f"Rewrote {line}" for line in expr.rewrites] + ["Steps (each computed once):"] + [f"  {line}" for line in expr.steps()]
+        return (expression.evaluate, expr, {name: ws.get(name) for name in expr.names}), details
+
+    def show_job_result(self, job):
+        """Displays a finished job's result and timings, or its error in the inline error label."""
+        operation, record = job.name, job.context["profile"]
+        if job.status == "failed":
+            profiling.session.finish(record, job.error)
+            if isinstance(job.error, ValueError): self.error_label.config(text=f"⚠️ {str(job.error)}")
+            else: self.error_label.config(text=f"❌ Error: {str(job.error)}")
+            return
+        result, worker_record = job.result
+        profiling.merge(record, worker_record, job.elapsed())
+        self.profile_record = record
+        try:
+            with profiling.stage("render", record):
+                # Result formatting selection
+                if operation in ["determinant", "trace", "rank"]: self.display_result(operation, result, 0)
+                elif operation in ["eigenvalues", "eigenvectors"]: self.display_result(operation, result, 3)
+                elif operation == "characteristics": self.display_result(operation, result, 2)
+                elif operation.endswith("_decomposition"): self.display_result(operation, result, 4)
+                elif operation == "expression": self.display_result(operation, result, 1 if isinstance(result, (list, logic.SparseMatrix)) else 0, job.context["details"])
+                else: self.display_result(operation, result, 1, job.context["details"])
+            profiling.session.finish(record)
+            self.close_result(record)
+        except Exception as e:
+            self.error_label.config(text=f"❌ Error: {str(e)}")
+
+    def poll_jobs(self):
+        """Collects finished background jobs and refreshes the running indicator."""
+        for job in self.jobs.poll():
+            self.show_job_result(job)
+        self.update_job_status()
+        if self.jobs.busy() and self.poll_after_id is None:
+            self.poll_after_id = self.root.after(100, self._poll_jobs_tick)
+
+    def _poll_jobs_tick(self):
+        self.poll_after_id = None
+        self.poll_jobs()
+
+    def update_job_status(self):
+        """Shows the running job, its elapsed time and the queue length."""
+        if not self.jobs.busy():
+            self.job_progress.stop()
+            self.job_status_label.config(text="Idle")
+            self.cancel_button.state(['disabled'])
+            return
+        self.job_progress.start(10)
+        self.cancel_button.state(['!disabled'])
+        text = "  |  ".join(f"Running: {job.name.replace('_', ' ').title()} ({job.elapsed():.1f} s)" for job in self.jobs.running)
+        if self.jobs.queue: text += f"  |  {len(self.jobs.queue)} queued"
+        self.job_status_label.config(text=text)
+
+    def cancel_job(self):
+        """Cancels the running job; queued jobs continue afterwards."""
+        job = self.jobs.cancel()
+        if job: self.error_label.config(text=f"⚠️ {job.name.replace('_', ' ').title()} cancelled")
+        self.poll_jobs()
+
     def parse_matrix(self, text):
-        """Parses a string input into a 2D list of floats."""
-        lines = text.strip().split('\n')
-        matrix = []
-        for line in lines:
-            line = line.strip()
-            if line:
-                # Replace symbol √ with sqrt() for library compatibility
-                import re
-                line = re.sub(r'√(\d+|[a-zA-Z])', r'sqrt(\1)', line)
-                # Also handle √(...) cases
-                line = line.replace('√(', 'sqrt(')
-                
-                elements = line.split(',') if ',' in line else line.split()
-                row = []
-                for e in elements:
-                    if e.strip():
-                        val = sp.sympify(e.strip())
-                        if val == sp.zoo or val == sp.nan:
-                            raise ValueError("Division by zero detected in input")
-                        row.append(val)
-                if row: matrix.append(row)
-        return matrix
+        """Parses a string input into a NumPy array or a 2D list of SymPy numbers."""
+        return logic.parse_matrix(text)
 
     def validate_matrix_sum_sub(self, A, B):
         """Ensures matrices have matching dimensions for addition/subtraction."""
-        if not A or not B: raise ValueError("Matrices empty")
+        if not len(A) or not len(B): raise ValueError("Matrices empty")
         if len(A) != len(B) or len(A[0]) != len(B[0]): raise ValueError("Matrices must have same size")
 
     def validate_matrix_multiplication(self, A, B):
         """Validates that matrix A rows match matrix B columns for multiplication."""
-        if not A or not B: raise ValueError("Matrices empty")
+        if not len(A) or not len(B): raise ValueError("Matrices empty")
         if len(A[0]) != len(B): raise ValueError(f"A(cols={len(A[0])}) != B(rows={len(B)})")
 
-    def validate_matrix_size(self, matrix, max_size=6):
-        """Prevents processing of excessively large matrices."""
-        if len(matrix) > max_size or (matrix and len(matrix[0]) > max_size):
-            raise ValueError(f"Matrix exceeds {max_size}x{max_size}")
-
-    def display_result(self, operation, result, k=0):
+    def display_result(self, operation, result, k=0, details=()):
         """Renders the calculation output in the text widget with formatting."""
         self.output_text.config(state='normal')
         self.output_text.insert(tk.END, f"\n{'='*50}\nOperation: {operation.title()}\n")
         
-        if k == 1: self.output_text.insert(tk.END, f"Result:\n{self.show_matrix_with_inf_check(result)}\n")
+        if k == 1:
+            # Every matrix result goes to the grid; only small ones are also written out in full
+            self.result_grid.set_matrix(result)
+            rows, cols = len(result), len(result[0]) if len(result) else 0
+            if rows * cols <= MAX_LOG_CELLS: self.output_text.insert(tk.END, f"Result:\n{self.show_matrix_with_inf_check(result)}\n")
+            else: self.output_text.insert(tk.END, f"Result: {rows} × {cols} matrix (see the Result Matrix grid)\n")
         elif k == 2:
             self.output_text.insert(tk.END, "Result:\n")
             for prop, val in result.items():
-                status = "✓ Yes" if val else "✗ No"
-                self.output_text.insert(tk.END, f"  {prop.replace('_',' ').title()}: {status}\n")
+                self.output_text.insert(tk.END, f"  {prop.replace('_',' ').title()}: {logic.format_property(val)}\n")
         elif k == 3: self.output_text.insert(tk.END, f"{result}\n")
-        else: self.output_text.insert(tk.END, f"Result: {logic.format_symbolic(result)}\n")
+        elif k == 4:
+            # Factorizations: every factor is written out, the last one also goes to the grid
+            for name, factor in result.items():
+                rows, cols = len(factor), len(factor[0]) if len(factor) else 0
+                if rows * cols <= MAX_LOG_CELLS: self.output_text.insert(tk.END, f"{name} =\n{self.show_matrix_with_inf_check(factor)}\n")
+                else: self.output_text.insert(tk.END, f"{name}: {rows} × {cols} matrix\n")
+            self.result_grid.set_matrix(factor)
+            self.output_text.insert(tk.END, f"Result Matrix grid shows {name}\n")
+        else:
+            with profiling.stage("format", self.profile_record): text = logic.format_symbolic(result, self.full_simplify_var.get())
+            self.output_text.insert(tk.END, f"Result: {text}\n")
         
+        for line in details: self.output_text.insert(tk.END, f"{line}\n")
+        self.output_text.config(state='disabled')
+
+    def close_result(self, record):
+        """Ends a result entry with its timing lines (when shown) and the separator."""
+        self.output_text.config(state='normal')
+        if self.show_timings_var.get():
+            for line in profiling.format_record(record): self.output_text.insert(tk.END, f"{line}\n")
         self.output_text.insert(tk.END, f"{'='*50}\n")
         self.output_text.see(tk.END)
         self.output_text.config(state='disabled')
 
     def show_matrix_with_inf_check(self, matrix):
         """Returns a string representation of a matrix with aligned symbols and fractions."""
-        if not matrix: return "Empty matrix"
-        
-        # 1. Format all elements to strings first
-        str_matrix = []
-        for row in matrix:
-            str_matrix.append([logic.format_symbolic(n) for n in row])
-            
-        # 2. Calculate max width for each column
-        num_cols = len(str_matrix[0])
-        col_widths = []
-        for j in range(num_cols):
-            max_w = max(len(row[j]) for row in str_matrix)
-            col_widths.append(max_w)
-            
-        # 3. Build the formatted string
-        res = ""
-        for row in str_matrix:
-            # Join with padding and extra space between columns
-            formatted_row = "  ".join(val.ljust(col_widths[i]) for i, val in enumerate(row))
-            res += f"[  {formatted_row}  ]\n"
-        return res
+        with profiling.stage("format", self.profile_record):
+            return logic.format_matrix(matrix, self.full_simplify_var.get())
+
+    def refresh_result_grid(self):
+        """Reformats the result grid after the simplification setting changed."""
+        self.result_grid.set_matrix(self.result_grid.get_matrix())
     
     def create_matrix_inputs(self):
-        """Dynamically generates matrix input text areas based on count."""
+        """Dynamically generates matrix input grids based on count, keeping entered matrices."""
+        previous = [g.get_matrix() for g in self.matrix_grids]
         for w in self.matrix_input_frame.winfo_children(): w.destroy()
-        self.matrix_texts = []
+        self.matrix_grids = []
         count = int(self.matrix_count_var.get())
-        labels = ['A', 'B', 'C', 'D']
         cols = min(2, count)
         for i in range(count):
             r, c = (i // cols), (i % cols)
-            tk.Label(self.matrix_input_frame, text=f"Matrix {labels[i]}:", bg='#16213e', fg='#ffffff').grid(row=r*2, column=c, sticky='w', padx=5, pady=2)
-            txt = scrolledtext.ScrolledText(self.matrix_input_frame, height=4, width=30, bg='#2c3e50', fg='#ecf0f1', insertbackground='#ffffff')
-            txt.grid(row=r*2+1, column=c, padx=5, pady=2)
-            self.matrix_texts.append(txt)
+            tk.Label(self.matrix_input_frame, text=f"Matrix {matrix_name(i)}:", bg='#16213e', fg='#ffffff').grid(row=r*2, column=c, sticky='w', padx=5, pady=2)
+            matrix_grid = MatrixGrid(self.matrix_input_frame, editable=True, cell_width=64, height=4, width=4)
+            matrix_grid.grid(row=r*2+1, column=c, padx=5, pady=2, sticky='nsew')
+            if i < len(previous): matrix_grid.set_matrix(previous[i])
+            self.matrix_grids.append(matrix_grid)
         for i in range(cols): self.matrix_input_frame.grid_columnconfigure(i, weight=1)
 
     def update_matrix_inputs(self):
         """Triggers widget recreation when matrix count changes."""
-        self.matrix_count = int(self.matrix_count_var.get())
+        count = self.matrix_count_var.get().strip()
+        if not count.isdigit() or not 1 <= int(count) <= MAX_INPUT_GRIDS:
+            self.error_label.config(text=f"⚠️ The number of input matrices must be 1 to {MAX_INPUT_GRIDS}; open more in the Workspace")
+            return
+        self.matrix_count = int(count)
         self.create_matrix_inputs()
 
+    # --- Workspace ---
+
+    def get_workspace(self):
+        """The named-matrix workspace, created on first use since it needs the math engine."""
+        if self.workspace is None: self.workspace = workspace.Workspace()
+        return self.workspace
+
+    def run_workspace_action(self, action):
+        """Runs a workspace button's action, showing its errors in the inline error label."""
+        self.error_label.config(text="")
+        try:
+            action()
+        except (ValueError, OSError) as e:
+            self.error_label.config(text=f"⚠️ {str(e)}")
+
+    def sync_inputs(self):
+        """Stores the input grids in the workspace under their names and applies the memory budget."""
+        ws = self.get_workspace()
+        budget = self.budget_entry.get().strip()
+        try: max_bytes = int(float(budget) * 2**20) if budget else workspace.default_budget()
+        except ValueError: max_bytes = -1
+        if max_bytes < 0: raise ValueError("The memory budget must be a number of MiB")
+        if max_bytes != ws.max_bytes: ws.configure(max_bytes)
+        grids = {matrix_name(i): grid.get_matrix() for i, grid in enumerate(self.matrix_grids)}
+        for name, entry in list(ws.entries.items()):
+            # Grids that were emptied or removed drop their entries
+            if entry.source == "input" and not len(grids.get(name, [])): ws.remove(name)
+        for name, data in grids.items():
+            entry = ws.entries.get(name)
+            # Input grids keep their matrix, so the entry only needs replacing when the grid holds a new one
+            if len(data) and (entry is None or entry.matrix is not data): ws.put(name, data, "input", pinned=True)
+        self.refresh_workspace()
+        return ws
+
+    def refresh_workspace(self):
+        """Redraws the workspace list and its memory line."""
+        ws = self.get_workspace()
+        self.workspace_tree.delete(*self.workspace_tree.get_children())
+        for entry in ws.entries.values():
+            memory = f"{entry.nbytes / 2**20:.1f} MiB" if entry.matrix is not None and entry.nbytes else "-"
+            self.workspace_tree.insert('', tk.END, iid=entry.name, text=entry.name,
+                                       values=(f"{entry.shape[0]} × {entry.shape[1]}", entry.kind, memory, entry.location(), entry.source))
+        stats = ws.stats()
+        self.workspace_status.config(text=f"{stats['entries']} matrices · {stats['memory_bytes'] / 2**20:.1f} MiB in memory · "
+                                          f"{stats['disk_bytes'] / 2**20:.1f} MiB on disk · budget {stats['max_bytes'] / 2**20:.0f} MiB")
+
+    def selected_workspace_entry(self):
+        selection = self.workspace_tree.selection()
+        if not selection: raise ValueError("Select a matrix in the workspace first")
+        return selection[0]
+
+    def open_workspace_file(self):
+        """Adds a matrix file to the workspace, named after the file."""
+        path = filedialog.askopenfilename(filetypes=[("Matrix files", "*.npy *.npz *.csv *.sym"), ("All files", "*.*")])
+        if not path: return
+        def action():
+            ws = self.get_workspace()
+            with profiling.stage("parse", profiling.session.pending):
+                matrix = logic.load_matrix(path)
+            name = workspace.name_from(os.path.splitext(os.path.basename(path))[0])
+            if name in ws.entries or name in map(matrix_name, range(len(self.matrix_grids))): name = ws.free_name(name + "_")
+            ws.put(name, matrix, f"file {os.path.basename(path)}")
+            self.refresh_workspace()
+            self.error_label.config(text=f"Opened {os.path.basename(path)} as {name}")
+        self.run_workspace_action(action)
+
+    def show_workspace_entry(self):
+        """Shows the selected workspace matrix in the Result Matrix grid."""
+        def action():
+            name = self.selected_workspace_entry()
+            matrix = self.get_workspace().get(name)
+            self.create_output_tab()
+            self.result_grid.set_matrix(matrix)
+            self.refresh_workspace()
+            self.notebook.select(1)
+        self.run_workspace_action(action)
+
+    def remove_workspace_entry(self):
+        """Drops the selected workspace matrix (input grids are cleared in their grid instead)."""
+        def action():
+            name = self.selected_workspace_entry()
+            ws = self.get_workspace()
+            if ws.entries[name].source == "input": raise ValueError(f"{name} is an input grid; clear the grid to remove it")
+            ws.remove(name)
+            self.refresh_workspace()
+        self.run_workspace_action(action)
+
+    def keep_result(self):
+        """Stores the matrix in the Result Matrix grid in the workspace as R1, R2, ..."""
+        matrix = self.result_grid.get_matrix()
+        if not len(matrix): raise ValueError("There is no result matrix to keep")
+        ws = self.get_workspace()
+        name = ws.free_name("R")
+        source = f"result of {self.profile_record['operation'].replace('_', ' ')}" if self.profile_record else "result"
+        ws.put(name, matrix, source)
+        self.refresh_workspace()
+        self.error_label.config(text=f"Kept the result as {name}")
+
+    def warm_up(self):
+        """Records the time to an interactive window, then loads the math engine in a background thread."""
+        self.startup_record["stages"].append({"stage": "window", "wall": time.perf_counter() - self.started,
+                                              "cpu": time.process_time() - self.started_cpu})
+        thread = threading.Thread(target=self.load_engine, daemon=True)
+        thread.start()
+        self.root.after(50, self.finish_warm_up, thread)
+
+    def load_engine(self):
+        with profiling.stage("engine", self.startup_record):
+            lazy.load(logic)
+
+    def finish_warm_up(self, thread):
+        """Once the engine is loaded, starts a worker process so it inherits the imports."""
+        if thread.is_alive():
+            self.root.after(50, self.finish_warm_up, thread)
+            return
+        with profiling.stage("worker", self.startup_record):
+            self.jobs.prestart()
+        profiling.session.finish(self.startup_record)
+        if self.on_ready: self.on_ready(self.startup_record)
+
     def clear_output(self):
-        """Wipes the results terminal."""
+        """Wipes the results terminal and the result grid."""
         self.output_text.config(state='normal')
         self.output_text.delete('1.0', tk.END)
         self.output_text.config(state='disabled')
+        self.result_grid.set_matrix([])
+
+    def export_session_log(self):
+        """Saves the session's operation timings to a JSON lines file (see python -m src.profiling)."""
+        path = filedialog.asksaveasfilename(defaultextension=".jsonl", initialfile="session.jsonl",
+                                            filetypes=[("JSON lines", "*.jsonl"), ("All files", "*.*")])
+        if not path: return
+        try:
+            count = profiling.session.export(path)
+            self.error_label.config(text=f"Exported {count} operation records to {path}")
+        except OSError as e:
+            self.error_label.config(text=f"❌ Error: {str(e)}")
 
     def copy_results(self):
         """Copies the entire output log to system clipboard."""
@@ -0,0 +1,226 @@
+import multiprocessing as mp
+import multiprocessing.util
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from itertools import count
+
+class Job:
+    """A single queued, running or finished computation."""
+    def __init__(self, job_id, name, func, args, context):
+        self.id = job_id
+        self.name = name
+        self.func = func
+        self.args = args
+        self.context = context
+        self.status = "queued"  # queued, running, done, failed, cancelled
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._worker = None
+
+    def elapsed(self):
+        """Seconds spent running so far (or in total once finished)."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+# How often a worker checks that the process that started it is still alive
+PARENT_CHECK_SECONDS = 1.0
+
+def _exit_when_orphaned(parent):
+    # Forked workers hold copies of the pipe ends, so a dead parent does not always show up as end of file
+    while os.getppid() == parent:
+        time.sleep(PARENT_CHECK_SECONDS)
+    os._exit(1)
+
+def _worker_loop(conn):
+    """Entry point of a worker process: runs tasks until the pipe is closed or its parent is gone."""
+    threading.Thread(target=_exit_when_orphaned, args=(os.getppid(),), daemon=True).start()
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        func, args = task
+        try:
+            conn.send(("done", func(*args)))
+        except Exception as e:
+            # Exceptions are sent as plain messages since not all of them pickle
+            conn.send(("failed", (isinstance(e, ValueError), str(e))))
+
+class _Worker:
+    """A long-lived worker process, kept between jobs so logic's cache stays warm.
+
+    Job workers are not daemonic, so they can start the block workers of
+    src.parallel (daemonic processes may not have children); they are
+    stopped at exit by _stop_job_workers instead.
+    """
+    def __init__(self, daemon=False):
+        self.conn, child_conn = mp.Pipe()
+        self.process = mp.Process(target=_worker_loop, args=(child_conn,), daemon=daemon)
+        self.process.start()
+        child_conn.close()
+        if not daemon:
+            _job_workers.add(self)
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join()
+        self.conn.close()
+
+_job_workers = weakref.WeakSet()
+
+def _stop_job_workers():
+    for worker in list(_job_workers):
+        if worker.alive():
+            worker.stop(kill=True)
+
+# Runs in multiprocessing's exit handler before it joins the remaining children
+multiprocessing.util.Finalize(None, _stop_job_workers, exitpriority=10)
+
+class WorkerPool:
+    """A fixed set of worker processes that run one task each per map() call."""
+    def __init__(self, size):
+        self.workers = [_Worker(daemon=True) for _ in range(size)]
+
+    def __len__(self):
+        return len(self.workers)
+
+    def map(self, func, tasks):
+        """Runs func(*args) for each args in tasks (at most one per worker) and returns the results in order."""
+        if len(tasks) > len(self.workers):
+            raise ValueError(f"{len(tasks)} tasks for {len(self.workers)} workers")
+        for worker, args in zip(self.workers, tasks):
+            worker.conn.send((func, args))
+        replies = []
+        for worker in self.workers[:len(tasks)]:
+            try:
+                replies.append(worker.conn.recv())
+            except EOFError:
+                replies.append(("failed", (False, "Worker process exited unexpectedly")))
+        for status, payload in replies:
+            if status == "failed":
+                is_value_error, message = payload
+                raise ValueError(message) if is_value_error else RuntimeError(message)
+        return [payload for _, payload in replies]
+
+    def alive(self):
+        return all(worker.alive() for worker in self.workers)
+
+    def close(self):
+        while self.workers:
+            self.workers.pop().stop()
+
+class JobRunner:
+    """Runs jobs in worker processes so the Tk loop stays free and jobs can be cancelled.
+
+    Processes rather than threads are used because SymPy work holds the GIL
+    and a running thread cannot be stopped. Call poll() periodically (e.g.
+    from root.after) to start queued jobs and collect finished ones.
+    """
+    def __init__(self, max_workers=1):
+        self.max_workers = max_workers
+        self.queue = deque()
+        self.running = []
+        self.idle_workers = []
+        self._ids = count(1)
+
+    def submit(self, name, func, *args, context=None):
+        """Queues func(*args); func and args must be picklable."""
+        job = Job(next(self._ids), name, func, args, context or {})
+        self.queue.append(job)
+        self._start_queued()
+        return job
+
+    def prestart(self):
+        """Starts worker processes ahead of the first job, which then skips the process start-up."""
+        while len(self.idle_workers) + len(self.running) < self.max_workers:
+            self.idle_workers.append(_Worker())
+
+    def busy(self):
+        """True while any job is queued or running."""
+        return bool(self.queue or self.running)
+
+    def cancel(self, job=None):
+        """Cancels the given job, or the oldest running one if none is given."""
+        if job is None:
+            job = self.running[0] if self.running else (self.queue[0] if self.queue else None)
+        if job is None:
+            return None
+        if job in self.queue:
+            self.queue.remove(job)
+        elif job in self.running:
+            # A running task cannot be interrupted, so its worker is killed and replaced later
+            job._worker.stop(kill=True)
+            self.running.remove(job)
+        job.status = "cancelled"
+        job.finished = time.perf_counter()
+        self._start_queued()
+        return job
+
+    def cancel_all(self):
+        """Cancels every queued and running job."""
+        self.queue.clear()
+        while self.running:
+            self.cancel(self.running[0])
+
+    def shutdown(self):
+        """Cancels outstanding work and stops all worker processes."""
+        self.cancel_all()
+        while self.idle_workers:
+            self.idle_workers.pop().stop()
+
+    def poll(self):
+        """Collects finished jobs, starts queued ones and returns the finished list."""
+        finished = []
+        for job in list(self.running):
+            worker = job._worker
+            if worker.conn.poll():
+                try:
+                    job.status, payload = worker.conn.recv()
+                except EOFError:
+                    job.status, payload = "failed", (False, "Worker process exited unexpectedly")
+            elif not worker.alive():
+                job.status, payload = "failed", (False, "Worker process exited unexpectedly")
+            else:
+                continue
+            if job.status == "done":
+                job.result = payload
+            else:
+                is_value_error, message = payload
+                job.error = ValueError(message) if is_value_error else RuntimeError(message)
+            job.finished = time.perf_counter()
+            self.running.remove(job)
+            if worker.alive():
+                self.idle_workers.append(worker)
+            else:
+                worker.stop(kill=True)
+            finished.append(job)
+        self._start_queued()
+        return finished
+
+    def _start_queued(self):
+        """Starts queued jobs while worker slots are free."""
+        while self.queue and len(self.running) < self.max_workers:
+            job = self.queue.popleft()
+            worker = self.idle_workers.pop() if self.idle_workers else _Worker()
+            worker.conn.send((job.func, job.args))
+            job._worker = worker
+            job.status = "running"
+            job.started = time.perf_counter()
+            self.running.append(job)
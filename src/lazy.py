@@ -0,0 +1,27 @@
+"""Deferred module imports, so the window can appear before NumPy and SymPy are loaded."""
+import importlib
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    load() imports it ahead of time, e.g. from a warm-up thread; the import
+    system's module locks make a concurrent first access wait for it.
+    """
+    def __init__(self, name):
+        self._lazy_name = name
+        self._lazy_module = None
+
+    def __getattr__(self, attr):
+        return getattr(load(self), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module '{self._lazy_name}' ({state})>"
+
+def load(module):
+    """Imports a LazyModule now and returns the real module (regular modules pass through)."""
+    if not isinstance(module, LazyModule):
+        return module
+    if module._lazy_module is None:
+        module._lazy_module = importlib.import_module(module._lazy_name)
+    return module._lazy_module
@@ -1,26 +1,342 @@
 import sympy as sp
 import numpy as np
 import re
+import sys
+import time
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from fractions import Fraction
+from src import backend, eigen, elimination, fileio, parallel, profiling, properties, sparse
+from src.sparse import SparseMatrix
 
-def format_symbolic(expr):
-    """Formats and simplifies a SymPy expression string to use the √ symbol."""
+# Seconds of cheap rewrites format_symbolic may spend on one expression
+FORMAT_TIME_BUDGET = 0.05
+
+def format_symbolic(expr, full_simplify=False):
+    """Formats and simplifies a SymPy expression string to use the √ symbol.
+
+    Numbers and symbols are printed as they are; other expressions get cheap
+    rewrites (doit, radsimp, cancel) within FORMAT_TIME_BUDGET and the
+    shortest form is kept. The full sp.simplify runs only with
+    full_simplify=True. Results are memoized per expression.
+    """
+    try:
+        return _format_cached(expr, full_simplify)
+    except TypeError:
+        # Unhashable values are formatted without the memo
+        return _format(expr, full_simplify)
+
+@lru_cache(maxsize=16384, typed=True)
+def _format_cached(expr, full_simplify):
+    return _format(expr, full_simplify)
+
+def _format(expr, full_simplify):
+    expr = _full_simplify(expr) if full_simplify else _quick_simplify(expr)
+    try:
+        s = str(expr)
+    except ValueError:
+        # Integers too long to print (e.g. from large powers) are shown in scientific form
+        s = str(sp.N(expr, 15))
+    # Replace sqrt(x) with √x if x is a simple number or symbol
+    s = re.sub(r'sqrt\((\d+|[a-zA-Z])\)', r'√\1', s)
+    # Replace remaining sqrt with √
+    s = s.replace("sqrt", "√")
+    return s
+
+def _full_simplify(expr):
     try:
         # Simplify and evaluate the expression
         expr = sp.simplify(expr)
         if hasattr(expr, 'doit'):
             expr = expr.doit()
-    except:
+    except Exception:
         pass
+    return expr
+
+def _quick_simplify(expr):
+    """Tiered simplification: nothing for atoms, then cheap rewrites until the time budget runs out."""
+    try:
+        expr = sp.sympify(expr)
+    except (sp.SympifyError, TypeError):
+        return expr
+    if not isinstance(expr, sp.Basic) or expr.is_Atom:
+        # Integers, rationals, floats and symbols are already canonical
+        return expr
+    rewrites = []
+    if expr.has(sp.Derivative, sp.Integral, sp.Sum, sp.Product):
+        rewrites.append(lambda e: e.doit())
+    if any(p.exp.is_negative for p in expr.atoms(sp.Pow)):
+        # Only quotients can be cancelled or have their denominators rationalized
+        rewrites.append(sp.cancel if expr.free_symbols else sp.radsimp)
+    deadline = time.perf_counter() + FORMAT_TIME_BUDGET
+    best, best_len = expr, _printed_length(expr)
+    for rewrite in rewrites:
+        if time.perf_counter() > deadline:
+            break
+        try:
+            candidate = rewrite(best)
+        except Exception:
+            continue
+        length = _printed_length(candidate)
+        if length < best_len:
+            best, best_len = candidate, length
+    return best
+
+def _printed_length(expr):
+    try:
+        return len(str(expr))
+    except ValueError:
+        return float('inf')
+
+# Sparse matrices with more cells than this are formatted as a list of their non-zeros
+MAX_DENSE_FORMAT_CELLS = 10000
+
+@profiling.timed
+def format_matrix(matrix, full_simplify=False):
+    """Returns a string representation of a matrix with aligned symbols and fractions."""
+    if len(matrix) == 0: return "Empty matrix"
+    if isinstance(matrix, SparseMatrix) and matrix.shape[0] * matrix.shape[1] > MAX_DENSE_FORMAT_CELLS:
+        return matrix.to_text(lambda x: format_symbolic(x, full_simplify)) + "\n"
     
-    s = str(expr)
-    # Replace sqrt(x) with √x if x is a simple number or symbol
-    s = re.sub(r'sqrt\((\d+|[a-zA-Z])\)', r'√\1', s)
-    # Replace remaining sqrt with √
-    s = s.replace("sqrt", "√")
-    return s
+    # 1. Format all elements to strings first
+    str_matrix = []
+    for row in matrix:
+        str_matrix.append([format_symbolic(n, full_simplify) for n in row])
+        
+    # 2. Calculate max width for each column
+    num_cols = len(str_matrix[0])
+    col_widths = []
+    for j in range(num_cols):
+        max_w = max(len(row[j]) for row in str_matrix)
+        col_widths.append(max_w)
+        
+    # 3. Build the formatted string
+    res = ""
+    for row in str_matrix:
+        # Join with padding and extra space between columns
+        formatted_row = "  ".join(val.ljust(col_widths[i]) for i, val in enumerate(row))
+        res += f"[  {formatted_row}  ]\n"
+    return res
+
+# Input made only of digits, signs, decimal points, exponents and separators
+_NUMERIC_TEXT = re.compile(r'[\d\s,.eE+-]*')
+# Floats with more significant digits than a double holds stay SymPy Floats
+_LONG_FLOAT = re.compile(r'\d(?:\.?\d){15,}')
+_INTEGER = re.compile(r'[+-]?\d+')
+_FRACTION = re.compile(r'([+-]?\d+)/(\d+)')
+_FLOAT = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_SQRT = re.compile(r'√(\d+|[a-zA-Z])')
+
+@profiling.timed
+def parse_matrix(text):
+    """Parses a string input into a NumPy array (plain numbers) or a 2D list of SymPy numbers.
+
+    Large matrices that are mostly zeros come back as a SparseMatrix. Sparse
+    input can also be written in coordinate form: a size line such as
+    1000x1000, then one "row, column: value" line (1-based) per non-zero.
+    """
+    first = next((line.strip() for line in text.split('\n', 64) if line.strip()), "")
+    if sparse.SIZE_HEADER.fullmatch(first):
+        return sparse.parse_coordinates([line.strip() for line in text.split('\n') if line.strip()], _parse_element)
+
+    rows = []
+    for line in text.split('\n'):
+        elements = line.split(',') if ',' in line else line.split()
+        row = [e.strip() for e in elements if e.strip()]
+        if row: rows.append(row)
+    if not rows:
+        return []
+
+    if _NUMERIC_TEXT.fullmatch(text) and len(set(map(len, rows))) == 1:
+        array = _numeric_array(rows, text)
+        if array is not None:
+            return sparse.maybe_sparse(array)
+    matrix = [[_parse_element(e) for e in row] for row in rows]
+    return sparse.maybe_sparse(matrix) if len(set(map(len, matrix))) == 1 else matrix
+
+def _numeric_array(rows, text):
+    """Converts rows of plain number tokens to an int64 or float array, or returns None."""
+    if any(c in text for c in '.eE'):
+        if any(len(e) > 16 and _LONG_FLOAT.search(e) for row in rows for e in row):
+            return None
+        dtype = float
+    else:
+        dtype = np.int64
+    try:
+        return np.array(rows, dtype=dtype)
+    except (ValueError, OverflowError):
+        # Malformed tokens (e.g. "1-2") and integers beyond int64 take the general path
+        return None
+
+@lru_cache(maxsize=4096)
+def _parse_element(e):
+    """Parses one element, calling SymPy only for tokens that are not plain numbers.
+
+    Results are cached since pasted matrices tend to repeat entries (0, 1, x, ...).
+    """
+    if _INTEGER.fullmatch(e):
+        return sp.Integer(int(e))
+    fraction = _FRACTION.fullmatch(e)
+    if fraction:
+        p, q = int(fraction.group(1)), int(fraction.group(2))
+        if q == 0:
+            raise ValueError("Division by zero detected in input")
+        return sp.Rational(p, q)
+    if _FLOAT.fullmatch(e):
+        return sp.Float(e)
+    # Replace symbol √ with sqrt() for library compatibility, including √(...) cases
+    val = sp.sympify(_SQRT.sub(r'sqrt(\1)', e).replace('√(', 'sqrt('))
+    if val == sp.zoo or val == sp.nan:
+        raise ValueError("Division by zero detected in input")
+    return val
+
+# --- Matrix Files ---
+
+@profiling.timed
+def load_matrix(path, name=None):
+    """Reads a matrix from a .npy, .npz, .csv or .sym file (see src/fileio.py).
+
+    Large .npy/.npz files are memory-mapped rather than read; name picks an
+    array of an .npz file. CSV elements are parsed like typed input.
+    """
+    return fileio.load(path, _parse_element, name)
+
+@profiling.timed
+def save_matrix(matrix, path):
+    """Writes a matrix to a .npy, .npz, .csv or .sym file, chosen by the extension."""
+    fileio.save(matrix, path)
+
+# --- Result Cache ---
+
+class ResultCache:
+    """Bounded LRU cache for results and shared intermediates, keyed by matrix content."""
+    def __init__(self, max_bytes=256 * 2**20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, key):
+        """Returns a cached value (or None) without touching the counters."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        """Stores a value, evicting least recently used entries to stay under max_bytes."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+        self.entries[key] = (value, size)
+        self.bytes += size
+        self._evict()
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached value for key, computing and storing it on a miss."""
+        if key in self.entries:
+            self.hits += 1
+            return self.peek(key)
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def resize(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries),
+                "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self.entries:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+
+def estimate_size(value):
+    """Rough memory footprint of a value (a matrix, result or cached intermediate) in bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes if value.dtype != object else value.nbytes + sum(estimate_size(v) for v in value.flat)
+    if isinstance(value, SparseMatrix):
+        return value.rows.nbytes + value.cols.nbytes + estimate_size(value.values)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, sp.MatrixBase):
+        return sum(estimate_size(v) for v in value)
+    if isinstance(value, sp.Poly):
+        return estimate_size(value.all_coeffs())
+    if isinstance(value, sp.Basic) and value.args:
+        return sys.getsizeof(value) + sum(estimate_size(a) for a in value.args)
+    return sys.getsizeof(value)
+
+def _element_token(x):
+    """Exact, canonical text for one element (distinct values never share a token)."""
+    if isinstance(x, sp.Float):
+        return f"F{x._mpf_}"
+    if isinstance(x, sp.Rational):
+        return f"Q{x.p}/{x.q}"
+    if isinstance(x, sp.Basic):
+        return sp.srepr(x)
+    if isinstance(x, (int, np.integer)):
+        return f"Q{x}/1"
+    if isinstance(x, Fraction):
+        return f"Q{x.numerator}/{x.denominator}"
+    return f"{type(x).__name__}{x!r}"
+
+@profiling.timed
+def matrix_key(matrix):
+    """Canonical hash of a matrix's shape and contents, used as the cache key."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{len(matrix)}x{len(matrix[0]) if len(matrix) else 0}".encode())
+    if isinstance(matrix, SparseMatrix):
+        h.update(b"sparse" + matrix.rows.tobytes() + matrix.cols.tobytes())
+        if matrix.values.dtype != object:
+            h.update(matrix.values.dtype.str.encode() + matrix.values.tobytes())
+        else:
+            h.update(",".join(map(_element_token, matrix.values)).encode())
+        return h.hexdigest()
+    if backend.is_numeric_array(matrix):
+        h.update(matrix.dtype.str.encode())
+        # Hashed through the buffer, so large (e.g. memory-mapped) arrays are not copied into bytes first
+        h.update(np.ascontiguousarray(matrix).data)
+        return h.hexdigest()
+    for row in matrix:
+        h.update((";" + ",".join(map(_element_token, row))).encode())
+    return h.hexdigest()
+
+_cache = ResultCache()
+
+def configure_cache(max_bytes):
+    """Sets the cache memory limit in bytes (0 disables caching)."""
+    _cache.resize(max_bytes)
+
+def cache_stats():
+    """Returns hit/miss counters and memory use of the result cache."""
+    return _cache.stats()
+
+def clear_cache():
+    """Empties the result cache (resetting its counters) and the element parse/format memos."""
+    _cache.clear()
+    _parse_element.cache_clear()
+    _format_cached.cache_clear()
 
 # --- Basic Matrix Operations ---
 
+@profiling.timed
 def add_matrices(matrices):
     """Adds multiple matrices together."""
     def add_two(A, B):
@@ -31,11 +347,28 @@ def add_matrices(matrices):
     if len(matrices) < 2:
         raise ValueError("Addition requires at least 2 matrices")
 
+    if any(isinstance(m, SparseMatrix) for m in matrices):
+        if all(isinstance(m, SparseMatrix) for m in matrices):
+            return _sparse_sum(matrices, 1, "Matrices cannot be added: Incompatible dimensions.")
+        matrices = [backend.dense(m) for m in matrices]
+
+    scaled = backend.scaled_arrays(matrices)
+    if scaled is not None:
+        arrays, d, exact = scaled
+        result = arrays[0]
+        for array in arrays[1:]:
+            if result.shape != array.shape:
+                raise ValueError("Matrices cannot be added: Incompatible dimensions.")
+            result, array = backend.overflow_safe(result, array, "add")
+            result = result + array
+        return backend.from_scaled(result, d, exact)
+
     result = matrices[0]
     for matrix in matrices[1:]:
         result = add_two(result, matrix)
     return result
 
+@profiling.timed
 def subtract_matrices(matrices):
     """Subtracts multiple matrices from the first one."""
     def subtract_two(A, B): 
@@ -45,27 +378,119 @@ def subtract_matrices(matrices):
     
     if len(matrices) < 2:
         raise ValueError("Subtraction requires at least 2 matrices")
+
+    if any(isinstance(m, SparseMatrix) for m in matrices):
+        if all(isinstance(m, SparseMatrix) for m in matrices):
+            return _sparse_sum(matrices, -1, "Matrices cannot be subtracted: Incompatible dimensions.")
+        matrices = [backend.dense(m) for m in matrices]
+
+    scaled = backend.scaled_arrays(matrices)
+    if scaled is not None:
+        arrays, d, exact = scaled
+        result = arrays[0]
+        for array in arrays[1:]:
+            if result.shape != array.shape:
+                raise ValueError("Matrices cannot be subtracted: Incompatible dimensions.")
+            result, array = backend.overflow_safe(result, array, "add")
+            result = result - array
+        return backend.from_scaled(result, d, exact)
             
     result = matrices[0]
     for matrix in matrices[1:]:
         result = subtract_two(result, matrix)
     return result
 
+def _sparse_sum(matrices, sign, message):
+    result = matrices[0]
+    for matrix in matrices[1:]:
+        if result.shape != matrix.shape:
+            raise ValueError(message)
+        result, matrix = _overflow_safe_mixed(result, matrix, "add")
+        result = sparse.add(result, matrix, sign)
+    return result
+
+def _overflow_safe_mixed(A, B, op):
+    """backend.overflow_safe for operands that may be sparse (judged by their stored values)."""
+    a, b = (m.values if isinstance(m, SparseMatrix) else m for m in (A, B))
+    if object in (a.dtype, b.dtype):
+        return A, B
+    a, b = backend.overflow_safe(a, b, op)
+
+    def with_values(m, values):
+        if not isinstance(m, SparseMatrix):
+            return values
+        return m if values is m.values else SparseMatrix(m.shape, m.rows, m.cols, values)
+    return with_values(A, a), with_values(B, b)
+
+def chain_order(shapes):
+    """Finds the cheapest parenthesization of a matrix chain by dynamic programming.
+
+    Returns (split, cost) where split[i][j] is the last split point of the
+    product of matrices i..j and cost is the number of scalar multiply-adds.
+    """
+    k = len(shapes)
+    dims = [shapes[0][0]] + [cols for _, cols in shapes]
+    cost = [[0] * k for _ in range(k)]
+    split = [[0] * k for _ in range(k)]
+    for length in range(2, k + 1):
+        for i in range(k - length + 1):
+            j = i + length - 1
+            cost[i][j] = None
+            for m in range(i, j):
+                c = cost[i][m] + cost[m + 1][j] + dims[i] * dims[m + 1] * dims[j + 1]
+                if cost[i][j] is None or c < cost[i][j]:
+                    cost[i][j], split[i][j] = c, m
+    return split, cost[0][k - 1]
+
+@profiling.timed
+def multiplication_plan(matrices, names=None):
+    """Describes the evaluation order chosen by multiply_matrices and its savings."""
+    shapes = [(len(m), len(m[0])) for m in matrices]
+    names = names or [chr(ord('A') + i) for i in range(len(matrices))]
+    split, cost = chain_order(shapes)
+
+    def label(i, j):
+        if i == j:
+            return names[i]
+        return f"({label(i, split[i][j])}·{label(split[i][j] + 1, j)})"
+
+    naive = sum(shapes[0][0] * shapes[i][0] * shapes[i][1] for i in range(1, len(shapes)))
+    return {"order": label(0, len(shapes) - 1), "cost": cost, "left_to_right_cost": naive}
+
+@profiling.timed
 def multiply_matrices(matrices):
-    """Performs matrix multiplication for a sequence of matrices."""
-    def multiply_two(A, B):
-        if len(A[0]) != len(B):
-            raise ValueError("Matrices cannot be multiplied: Incompatible dimensions.")
-        return [[sum(A[i][k] * B[k][j] for k in range(len(B))) for j in range(len(B[0]))] for i in range(len(A))]
-    
+    """Multiplies a sequence of matrices in the cheapest parenthesization."""
     if len(matrices) < 2:
         raise ValueError("Multiplication requires at least 2 matrices")
+    for A, B in zip(matrices, matrices[1:]):
+        if len(A[0]) != len(B):
+            raise ValueError("Matrices cannot be multiplied: Incompatible dimensions.")
 
-    result = matrices[0]
-    for matrix in matrices[1:]:
-        result = multiply_two(result, matrix)
-    return result
+    split, _ = chain_order([(len(m), len(m[0])) for m in matrices])
+
+    def evaluate(operands, multiply, i, j):
+        if i == j:
+            return operands[i]
+        m = split[i][j]
+        return multiply(evaluate(operands, multiply, i, m), evaluate(operands, multiply, m + 1, j))
 
+    if any(isinstance(m, SparseMatrix) for m in matrices):
+        def multiply_mixed(A, B):
+            if isinstance(A, SparseMatrix) or isinstance(B, SparseMatrix):
+                return sparse.matmul(*_overflow_safe_mixed(A, B, "matmul"))
+            return parallel.matmul(A, B)
+        operands = [m if isinstance(m, SparseMatrix) else backend.to_array(m) for m in matrices]
+        result = evaluate(operands, multiply_mixed, 0, len(operands) - 1)
+        return result if isinstance(result, SparseMatrix) else backend.from_array(result)
+
+    scaled = backend.scaled_arrays(matrices)
+    if scaled is not None:
+        arrays, d, exact = scaled
+        return backend.from_scaled(evaluate(arrays, parallel.matmul, 0, len(arrays) - 1), d ** len(arrays), exact)
+    arrays = [backend.to_array(m) for m in matrices]
+    return backend.from_array(evaluate(arrays, parallel.matmul, 0, len(arrays) - 1))
+
+@profiling.timed
 def elementwise_multiply(matrices):
     """Multiplies matrices element by element."""
     def multiply_two(A, B):
@@ -76,6 +501,28 @@ def elementwise_multiply(matrices):
     if len(matrices) < 2:
         raise ValueError("Element-wise multiplication requires at least 2 matrices")
 
+    if any(isinstance(m, SparseMatrix) for m in matrices):
+        # The product keeps only positions that are non-zero in every operand
+        first = next(i for i, m in enumerate(matrices) if isinstance(m, SparseMatrix))
+        result = matrices[first]
+        for matrix in matrices[:first] + matrices[first + 1:]:
+            if (len(matrix), len(matrix[0])) != result.shape:
+                raise ValueError("Matrices must have the same dimensions for element-wise multiplication")
+            other = matrix if isinstance(matrix, SparseMatrix) else backend.to_array(matrix)
+            result = sparse.elementwise(*_overflow_safe_mixed(result, other, "multiply"))
+        return result
+
+    scaled = backend.scaled_arrays(matrices)
+    if scaled is not None:
+        arrays, d, exact = scaled
+        result = arrays[0]
+        for array in arrays[1:]:
+            if result.shape != array.shape:
+                raise ValueError("Matrices must have the same dimensions for element-wise multiplication")
+            result, array = backend.overflow_safe(result, array, "multiply")
+            result = result * array
+        return backend.from_scaled(result, d ** len(arrays), exact)
+
     result = matrices[0]
     for matrix in matrices[1:]:
         result = multiply_two(result, matrix)
@@ -83,71 +530,184 @@ def elementwise_multiply(matrices):
 
 # --- Advanced Matrix Operations ---
 
+@profiling.timed
 def determinant(matrix):
-    """Calculates the determinant of a square matrix using recursion."""
+    """Calculates the determinant of a square matrix by elimination (LU or Bareiss)."""
     if len(matrix) != len(matrix[0]):
         raise ValueError("Determinant can only be computed for square matrices.")
-    if len(matrix) == 1:
-        return matrix[0][0]
-    if len(matrix) == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-    det = 0
-    for c in range(len(matrix[0])):
-        submatrix = [row[:c] + row[c + 1:] for row in matrix[1:]]
-        det += ((-1) ** c) * matrix[0][c] * determinant(submatrix)
-    return det
+    key = matrix_key(matrix)
+    return _cache.get_or_compute(("determinant", key), lambda: _compute_determinant(matrix, key))
 
+def _compute_determinant(matrix, key):
+    info = matrix_structure(matrix, key)
+    matrix = backend.dense(matrix)
+    if info["lower_bandwidth"] == 0 or info["upper_bandwidth"] == 0:
+        # Triangular: the product of the diagonal
+        return _diagonal_product(matrix)
+    if backend.matrix_kind(matrix) == backend.FLOAT:
+        lu, _, sign = _lu_factors(matrix, key)
+        return elimination.lu_determinant(lu, sign)
+    charpoly = _cache.peek(("charpoly", key))
+    if charpoly is not None:
+        # det(A) = (-1)^n p(0) for p(λ) = det(λI - A)
+        return (-1) ** len(matrix) * charpoly.coeff_monomial(1)
+    return elimination.determinant(matrix)
+
+def _diagonal_product(matrix):
+    if backend.is_numeric_array(matrix):
+        diagonal = matrix.diagonal()
+        if matrix.dtype.kind in "fc":
+            with np.errstate(over='ignore'):
+                return np.prod(diagonal).item()
+        return sp.Integer(np.prod(diagonal.astype(object)))
+    result = sp.Integer(1)
+    for i in range(len(matrix)):
+        result *= matrix[i][i]
+    return result
+
+@profiling.timed
 def inverse(matrix):
-    """Computes the inverse of a square matrix using the cofactor method."""
+    """Computes the inverse of a square matrix by elimination (LU or Bareiss)."""
     if len(matrix) != len(matrix[0]):
         raise ValueError("Inverse is only defined for square matrices.")
+    key = matrix_key(matrix)
+    result = _cache.get_or_compute(("inverse", key), lambda: _compute_inverse(matrix, key))
+    return [row[:] for row in result]
 
-    def get_minor(m, row, col):
-        return [r[:col] + r[col + 1:] for r in (m[:row] + m[row + 1:])]
-
-    def compute_cofactor_matrix(m):
-        return [[((-1) ** (i + j)) * determinant(get_minor(m, i, j)) for j in range(len(m))] for i in range(len(m))]
+def _compute_inverse(matrix, key):
+    info = matrix_structure(matrix, key)
+    matrix = backend.dense(matrix)
+    kind = backend.matrix_kind(matrix)
+    if info["lower_bandwidth"] == 0 and info["upper_bandwidth"] == 0:
+        return _diagonal_inverse(backend.to_rows(matrix), kind)
+    if kind == backend.FLOAT:
+        lu, perm, _ = _lu_factors(matrix, key)
+        return elimination.lu_inverse(lu, perm).tolist()
+    if kind == backend.EXACT:
+        result, det = elimination.exact_inverse_and_determinant(matrix)
+        _cache.put(("determinant", key), det)
+        return result
+    return elimination.inverse(matrix)
 
-    det = determinant(matrix)
-    if det == 0:
+def _diagonal_inverse(rows, kind):
+    n = len(rows)
+    if any(rows[i][i] == 0 for i in range(n)):
         raise ValueError("Matrix is singular and cannot be inverted.")
+    one, zero = (1.0, 0.0) if kind == backend.FLOAT else (sp.Integer(1), sp.Integer(0))
+    return [[one / rows[i][i] if i == j else zero for j in range(n)] for i in range(n)]
 
-    cofactor_matrix = compute_cofactor_matrix(matrix)
-    adjugate_matrix = transpose(cofactor_matrix)
-    return [[adjugate_matrix[i][j] / det for j in range(len(matrix))] for i in range(len(matrix))]
+def _lu_factors(matrix, key):
+    """Cached LU factors of a float matrix, shared by determinant and inverse."""
+    return _cache.get_or_compute(("lu", key), lambda: elimination.lu_factor(backend.to_float_array(matrix)))
 
+@profiling.timed
 def transpose(matrix):
     """Returns the transpose of a matrix."""
+    if isinstance(matrix, SparseMatrix):
+        return sparse.transpose(matrix)
+    if isinstance(matrix, np.ndarray):
+        return matrix.T.tolist()
     return [[matrix[j][i] for j in range(len(matrix))] for i in range(len(matrix[0]))]
 
+@profiling.timed
 def trace(matrix):
     """Returns the sum of the diagonal elements of a square matrix."""
     if len(matrix) != len(matrix[0]):
         raise ValueError("Trace is only defined for square matrices.")
+    if isinstance(matrix, SparseMatrix):
+        return sparse.trace(matrix)
+    if isinstance(matrix, np.ndarray):
+        # Python ints so large integer diagonals cannot overflow
+        return sum(matrix.diagonal().tolist())
     return sum(matrix[i][i] for i in range(len(matrix)))
 
-def eigenvalues(matrix):
-    """Calculates eigenvalues using the SymPy library."""
+# Eigen-solver modes: exact (SymPy), numeric (LAPACK/mpmath), or auto
+EIGEN_MODES = ("auto", "exact", "numeric")
+# In auto mode, exact matrices up to this size are solved symbolically
+AUTO_EXACT_MAX_SIZE = 4
+
+def _use_numeric_eigen(matrix, mode):
+    """Decides between the symbolic and numeric eigen-solvers."""
+    if mode not in EIGEN_MODES:
+        raise ValueError(f"Unknown eigen mode '{mode}'")
+    if len(matrix) != len(matrix[0]):
+        raise ValueError("Eigen-analysis is only defined for square matrices.")
+    if mode == "exact" or not eigen.is_numeric_matrix(matrix):
+        # Matrices with symbols always need the symbolic path
+        return False
+    if mode == "numeric":
+        return True
+    return backend.matrix_kind(matrix) == backend.FLOAT or len(matrix) > AUTO_EXACT_MAX_SIZE
+
+def _numeric_eigensystem(matrix, digits, vectors):
+    """Cached numeric eigen-decomposition; returns (values, vectors, solver name)."""
+    key = matrix_key(matrix)
+    # LAPACK gives the same result for every precision it serves; digits only change the formatting
+    precision = max(digits, eigen.DOUBLE_DIGITS)
+    full = _cache.peek(("eigensystem_numeric", key, precision))
+    if full is not None:
+        return full
+    A = backend.to_float_array(matrix) if digits <= eigen.DOUBLE_DIGITS else None
+    hermitian = _is_hermitian(matrix if A is None else A)
+    solver = "symmetric/Hermitian" if hermitian else "general"
+    kind = "eigensystem_numeric" if vectors else "eigenvalues_numeric"
+    return _cache.get_or_compute((kind, key, precision),
+                                 lambda: (*eigen.numeric_eigensystem(matrix, hermitian, digits, vectors, A), solver))
+
+def _is_hermitian(matrix):
+    """A == A^H, comparing elements exactly: characteristics()' symmetry test extended to complex input."""
+    if isinstance(matrix, np.ndarray) and matrix.dtype != object:
+        return bool(np.array_equal(matrix, matrix.conj().T))
+    n = len(matrix)
+    return all(matrix[i][j] == matrix[j][i].conjugate() for i in range(n) for j in range(i, n))
+
+@profiling.timed
+def eigenvalues(matrix, mode="exact", digits=eigen.DOUBLE_DIGITS, full_simplify=False):
+    """Calculates eigenvalues with SymPy (exact) or LAPACK/mpmath (numeric, to the given digits)."""
+    matrix = backend.dense(matrix)
+    if _use_numeric_eigen(matrix, mode):
+        try:
+            values, _, solver = _numeric_eigensystem(matrix, digits, vectors=False)
+        except Exception as e:
+            raise ValueError(f"Error computing eigenvalues: {str(e)}")
+        result_text = f"Eigenvalues (numeric, {solver} solver, {digits} digits):\n"
+        for formatted_val, indices in eigen.group_eigenvalues(values, digits):
+            result_text += f"  λ = {formatted_val} (multiplicity: {len(indices)})\n"
+        return result_text
     try:
-        sym_matrix = sp.Matrix(matrix)
-        eigenvals = sym_matrix.eigenvals()
+        key = matrix_key(matrix)
+        eigenvals = _cache.get_or_compute(("eigenvals", key), lambda: _compute_eigenvals(matrix, key))
         result_text = "Eigenvalues:\n"
         for eigenval, multiplicity in eigenvals.items():
-            formatted_val = format_symbolic(eigenval)
+            formatted_val = format_symbolic(eigenval, full_simplify)
             result_text += f"  λ = {formatted_val} (multiplicity: {multiplicity})\n"
         return result_text
     except Exception as e:
         raise ValueError(f"Error computing eigenvalues: {str(e)}")
 
-def eigenvectors(matrix):
-    """Calculates eigenvectors using the SymPy library."""
+@profiling.timed
+def eigenvectors(matrix, mode="exact", digits=eigen.DOUBLE_DIGITS, full_simplify=False):
+    """Calculates eigenvectors with SymPy (exact) or LAPACK/mpmath (numeric, to the given digits)."""
+    matrix = backend.dense(matrix)
+    if _use_numeric_eigen(matrix, mode):
+        try:
+            values, vectors, solver = _numeric_eigensystem(matrix, digits, vectors=True)
+        except Exception as e:
+            raise ValueError(f"Error computing eigenvectors: {str(e)}")
+        result_text = f"Eigenvectors (numeric, {solver} solver, {digits} digits):\n"
+        for formatted_val, indices in eigen.group_eigenvalues(values, digits):
+            result_text += f"\nFor eigenvalue λ = {formatted_val}:\n"
+            for j, i in enumerate(indices):
+                components = ", ".join(eigen.format_number(c, digits) for c in vectors[i])
+                result_text += f"  Eigenvector {j+1}: [{components}]\n"
+        return result_text
     try:
-        sym_matrix = sp.Matrix(matrix)
-        eigenvects = sym_matrix.eigenvects()
+        key = matrix_key(matrix)
+        eigenvects = _cache.get_or_compute(("eigenvects", key), lambda: _compute_eigenvects(matrix, key))
         result_text = "Eigenvectors:\n"
         
         for i, (eigenval, multiplicity, vectors) in enumerate(eigenvects):
-            formatted_val = format_symbolic(eigenval)
+            formatted_val = format_symbolic(eigenval, full_simplify)
             
             result_text += f"\nFor eigenvalue λ = {formatted_val}:\n"
             
@@ -155,61 +715,146 @@ def eigenvectors(matrix):
                 result_text += f"  Eigenvector {j+1}: ["
                 vector_components = []
                 for component in vector:
-                    vector_components.append(format_symbolic(component))
+                    vector_components.append(format_symbolic(component, full_simplify))
                 
                 result_text += ", ".join(vector_components) + "]\n"
         return result_text
     except Exception as e:
         raise ValueError(f"Error computing eigenvectors: {str(e)}")
 
+@profiling.timed
+def characteristic_polynomial(matrix):
+    """Returns the (cached) characteristic polynomial det(λI - A) as a SymPy PurePoly."""
+    key = matrix_key(matrix)
+    return _cache.get_or_compute(("charpoly", key), lambda: sp.Matrix(backend.dense(matrix)).charpoly())
+
+def _compute_eigenvals(matrix, key):
+    decomposition = _cache.peek(("eigenvects", key))
+    if decomposition is not None:
+        return {val: multiplicity for val, multiplicity, _ in decomposition}
+    sym_matrix = sp.Matrix(matrix)
+    if sym_matrix.has(sp.Float):
+        # SymPy handles float matrices with its own numeric path
+        return sym_matrix.eigenvals()
+    charpoly = characteristic_polynomial(matrix)
+    eigenvals = sp.roots(charpoly, multiple=False)
+    if sum(eigenvals.values()) != len(matrix):
+        eigenvals = dict(charpoly.all_roots(multiple=False))
+    return eigenvals
+
+def _compute_eigenvects(matrix, key):
+    sym_matrix = sp.Matrix(matrix)
+    eigenvals = _cache.peek(("eigenvals", key))
+    # Radical eigenvalues are left to SymPy, whose algebraic-field path gives tidier vectors
+    if eigenvals is None or sym_matrix.has(sp.Float) or not all(val.is_Rational for val in eigenvals):
+        return sym_matrix.eigenvects()
+    # Reuse the cached eigenvalues: each eigenspace is the nullspace of A - λI
+    eigenvects = []
+    for val, multiplicity in sorted(eigenvals.items(), key=sp.default_sort_key):
+        shifted = sym_matrix - val * sp.eye(sym_matrix.rows)
+        vectors = shifted.nullspace() or shifted.nullspace(simplify=True)
+        if not vectors:
+            return sym_matrix.eigenvects()
+        eigenvects.append((val, multiplicity, vectors))
+    return eigenvects
+
+@profiling.timed
 def characteristics(matrix):
-    """Checks for matrix properties (symmetric, diagonal, etc.)."""
-    tr = transpose(matrix)
-    is_symmetric = all(matrix[i][j] == tr[i][j] 
-                      for i in range(len(matrix)) 
-                      for j in range(len(matrix[0])))
-    
-    skew_tr = [[-matrix[j][i] for j in range(len(matrix))] for i in range(len(matrix[0]))]
-    is_skew_symmetric = all(matrix[i][j] == skew_tr[i][j] 
-                           for i in range(len(matrix)) 
-                           for j in range(len(matrix[0])))
-    
-    is_diagonal = all(matrix[i][j] == 0 for i in range(len(matrix)) for j in range(len(matrix)) if i != j)
-    is_upper_triangular = all(matrix[i][j] == 0 for i in range(len(matrix)) for j in range(i))
-    is_lower_triangular = all(matrix[i][j] == 0 for i in range(len(matrix)) for j in range(i + 1, len(matrix)))
-    
-    return {
-        "symmetric": is_symmetric,
-        "skew_symmetric": is_skew_symmetric,
-        "diagonal": is_diagonal,
-        "upper_triangular": is_upper_triangular,
-        "lower_triangular": is_lower_triangular
-    }
+    """Checks for matrix properties (symmetry, triangularity, band, orthogonality, definiteness, sparsity)."""
+    key = matrix_key(matrix)
+    return dict(_cache.get_or_compute(("characteristics", key), lambda: _compute_characteristics(matrix, key)))
+
+@profiling.timed
+def matrix_structure(matrix, key=None):
+    """Cached one-pass structure scan (symmetry, bandwidths, non-zeros), cheap enough to run before any operation."""
+    key = key or matrix_key(matrix)
+    return _cache.get_or_compute(("structure", key), lambda: properties.scan(matrix))
+
+def _compute_characteristics(matrix, key):
+    info = matrix_structure(matrix, key)
+    shape = (len(matrix), len(matrix[0]))
+    result = properties.structure(info, shape)
+    # The algebraic checks each start from a cheap necessary condition, so most matrices skip them
+    result.update(properties.algebraic(matrix, info))
+    order = ["symmetric", "skew_symmetric", "diagonal", "upper_triangular", "lower_triangular",
+             "orthogonal", "idempotent", "positive_definite", "banded", "lower_bandwidth", "upper_bandwidth", "sparsity"]
+    return {name: result[name] for name in order}
 
+def format_property(value):
+    """Display text of one characteristics() value."""
+    if value is None:
+        return "? Not determined"
+    if isinstance(value, (bool, np.bool_)):
+        return "✓ Yes" if value else "✗ No"
+    if isinstance(value, float):
+        return f"{value:.1%}"
+    return str(value)
+
+@profiling.timed
 def matrix_power(matrix, power):
-    """Raises a square matrix to a given power."""
+    """Raises a square matrix to an integer or symbolic power."""
     if len(matrix) != len(matrix[0]):
         raise ValueError("Matrix exponentiation is only defined for square matrices.")
 
-    def multiply_two(A, B):
-        return [[sum(A[i][k] * B[k][j] for k in range(len(B))) for j in range(len(B[0]))] for i in range(len(A))]
+    def power_by_squaring(base, n, multiply):
+        # O(log n) products instead of n - 1
+        result = None
+        while n:
+            if n & 1:
+                result = base if result is None else multiply(result, base)
+            n >>= 1
+            if n:
+                base = multiply(base, base)
+        return result
 
+    if not isinstance(power, (int, sp.Integer)):
+        # Symbolic exponents get a closed form through the Jordan decomposition
+        try:
+            return sp.Matrix(backend.dense(matrix)).pow(power, method="jordan").tolist()
+        except Exception as e:
+            raise ValueError(f"Error computing closed-form power: {str(e)}")
+
+    power = int(power)
+    if isinstance(matrix, SparseMatrix) and power >= 0:
+        if power == 0:
+            return sparse.identity(len(matrix))
+        return power_by_squaring(matrix, power, lambda A, B: sparse.matmul(*_overflow_safe_mixed(A, B, "matmul")))
+    if power < 0:
+        matrix = inverse(matrix)
+        power = -power
     if power == 0:
         return [[1 if i == j else 0 for j in range(len(matrix))] for i in range(len(matrix))]
     if power == 1:
-        return matrix
-    
-    result = matrix
-    for _ in range(power - 1):
-        result = multiply_two(result, matrix)
-    return result
+        return backend.to_rows(matrix)
 
+    scaled = backend.scaled_arrays([matrix])
+    if scaled is not None:
+        arrays, d, exact = scaled
+        with np.errstate(over='ignore', invalid='ignore'):
+            return backend.from_scaled(power_by_squaring(arrays[0], power, parallel.matmul), d ** power, exact)
+    return backend.from_array(power_by_squaring(backend.to_array(matrix), power, parallel.matmul))
+
+@profiling.timed
 def scalar_multiply(matrix, scalar):
     """Multiplies every element in the matrix by a scalar value."""
+    if isinstance(matrix, SparseMatrix):
+        arrays = backend.numeric_arrays([matrix.values.reshape(1, -1), [[scalar]]])
+        if arrays is None:
+            return sparse.scale(matrix, scalar)
+        values, s = backend.overflow_safe(*arrays, "multiply")
+        return SparseMatrix.from_entries(matrix.shape, matrix.rows, matrix.cols, (values * s[0, 0])[0])
+    scaled = backend.scaled_arrays([matrix, [[scalar]]])
+    if scaled is not None:
+        (A, s), d, exact = scaled
+        A, s = backend.overflow_safe(A, s, "multiply")
+        return backend.from_scaled(A * s[0, 0], d * d, exact)
     return [[element * scalar for element in row] for row in matrix]
 
+@profiling.timed
 def gauss_transformation(M):
     """Performs Gaussian elimination to transform the matrix into row-echelon form."""
+    if isinstance(M, SparseMatrix):
+        return sparse.row_echelon(M)
     A = np.array(M, dtype=float)
     n, m = A.shape
 
@@ -227,3 +872,132 @@ def gauss_transformation(M):
             A[i, j] = 0.0
 
     return A.tolist()
+
+# --- Linear Systems and Decompositions ---
+
+@profiling.timed
+def solve(matrix, rhs):
+    """Solves AX = B for a square A and one or more right-hand sides (the columns of B).
+
+    The LU factors of A are cached, so repeated solves against the same A
+    only pay for the triangular substitutions.
+    """
+    if len(matrix) != len(matrix[0]):
+        raise ValueError("Solve needs a square coefficient matrix.")
+    if len(rhs) != len(matrix):
+        raise ValueError(f"Right-hand side has {len(rhs)} rows, the matrix has {len(matrix)}")
+    key = matrix_key(matrix)
+    # An upper triangular A is its own packed LU factorization
+    triangular = matrix_structure(matrix, key)["lower_bandwidth"] == 0
+    matrix, rhs = backend.dense(matrix), backend.dense(rhs)
+    kinds = {backend.matrix_kind(matrix), backend.matrix_kind(rhs)}
+    if backend.SYMBOLIC in kinds:
+        return elimination.symbolic_solve(matrix, backend.to_rows(rhs))
+    if backend.FLOAT in kinds:
+        if triangular:
+            lu, perm = backend.to_float_array(matrix), np.arange(len(matrix))
+        else:
+            lu, perm, _ = _lu_factors(matrix, key)
+        if elimination.is_singular_lu(lu):
+            raise ValueError("Matrix is singular; the system has no unique solution.")
+        return elimination.lu_solve(lu, perm, backend.to_float_array(rhs)).tolist()
+    if triangular:
+        lu, perm = [[Fraction(backend.to_fraction(x)) for x in row] for row in backend.to_rows(matrix)], list(range(len(matrix)))
+    else:
+        lu, perm, _ = _exact_lu_factors(matrix, key)
+    if elimination.is_singular_exact_lu(lu):
+        raise ValueError("Matrix is singular; the system has no unique solution.")
+    return [[backend.to_sympy(x) for x in row] for row in elimination.exact_lu_solve(lu, perm, backend.to_rows(rhs))]
+
+def _exact_lu_factors(matrix, key):
+    """Cached rational LU factors of an exact matrix, reused by solve and lu_decomposition."""
+    return _cache.get_or_compute(("lu_exact", key), lambda: elimination.exact_lu_factor(backend.to_rows(matrix)))
+
+def _rref(matrix):
+    """Cached (reduced row-echelon form, pivot columns), shared by rref, rank and nullspace."""
+    matrix = backend.dense(matrix)
+    return _cache.get_or_compute(("rref", matrix_key(matrix)), lambda: elimination.rref(matrix))
+
+@profiling.timed
+def rref(matrix):
+    """Returns the reduced row-echelon form of a matrix."""
+    return [row[:] for row in _rref(matrix)[0]]
+
+@profiling.timed
+def rank(matrix):
+    """Returns the rank of a matrix (the number of pivots in its reduced row-echelon form)."""
+    return len(_rref(matrix)[1])
+
+@profiling.timed
+def nullspace(matrix):
+    """Returns a nullspace basis as the columns of a matrix (a zero column when only 0 solves Ax = 0)."""
+    R, pivots = _rref(matrix)
+    m = len(R[0])
+    one = 1.0 if backend.matrix_kind(R) == backend.FLOAT else sp.Integer(1)
+    basis = elimination.nullspace_from_rref(R, pivots, m, one)
+    if not basis:
+        return [[0 * one] for _ in range(m)]
+    return [[v[i] for v in basis] for i in range(m)]
+
+@profiling.timed
+def lu_decomposition(matrix):
+    """Returns the factors of PA = LU as a dict of matrices P, L and U.
+
+    Float matrices use partial pivoting; exact and symbolic ones, which have
+    no rounding to control, swap rows only to skip a zero pivot.
+    """
+    if len(matrix) != len(matrix[0]):
+        raise ValueError("LU decomposition is only defined for square matrices here.")
+    matrix = backend.dense(matrix)
+    n = len(matrix)
+    kind = backend.matrix_kind(matrix)
+    if kind == backend.SYMBOLIC:
+        L, U, swaps = sp.Matrix(matrix).LUdecomposition()
+        P = sp.eye(n)
+        for i, j in swaps:
+            P.row_swap(i, j)
+        return {"P": P.tolist(), "L": L.tolist(), "U": U.tolist()}
+    key = matrix_key(matrix)
+    if kind == backend.FLOAT:
+        lu, perm, _ = _lu_factors(matrix, key)
+        L, U = np.tril(lu, -1) + np.eye(n), np.triu(lu)
+        return {"P": np.eye(n, dtype=np.int64)[perm].tolist(), "L": L.tolist(), "U": U.tolist()}
+    lu, perm, _ = _exact_lu_factors(matrix, key)
+    L = [[backend.to_sympy(lu[i][j]) if j < i else sp.Integer(i == j) for j in range(n)] for i in range(n)]
+    U = [[backend.to_sympy(lu[i][j]) if j >= i else sp.Integer(0) for j in range(n)] for i in range(n)]
+    return {"P": [[int(j == p) for j in range(n)] for p in perm], "L": L, "U": U}
+
+@profiling.timed
+def qr_decomposition(matrix):
+    """Returns the factors of A = QR (orthonormal Q, upper triangular R) as a dict of matrices."""
+    matrix = backend.dense(matrix)
+    if backend.matrix_kind(matrix) == backend.FLOAT:
+        Q, R = np.linalg.qr(backend.to_float_array(matrix))
+        return {"Q": Q.tolist(), "R": R.tolist()}
+    try:
+        Q, R = sp.Matrix(matrix).QRdecomposition()
+    except sp.matrices.MatrixError as e:
+        raise ValueError(f"QR decomposition failed: {e}")
+    return {"Q": Q.tolist(), "R": R.tolist()}
+
+@profiling.timed
+def cholesky_decomposition(matrix):
+    """Returns the lower triangular L with A = LLᵀ for a symmetric positive-definite A."""
+    if len(matrix) != len(matrix[0]):
+        raise ValueError("Cholesky decomposition is only defined for square matrices.")
+    matrix = backend.dense(matrix)
+    if not matrix_structure(matrix)["symmetric"]:
+        raise ValueError("Cholesky decomposition needs a symmetric matrix.")
+    if backend.matrix_kind(matrix) == backend.FLOAT:
+        try:
+            return {"L": np.linalg.cholesky(backend.to_float_array(matrix)).tolist()}
+        except np.linalg.LinAlgError:
+            raise ValueError("Matrix is not positive definite.")
+    try:
+        L = sp.Matrix(matrix).cholesky(hermitian=False)
+    except (ValueError, sp.matrices.MatrixError):
+        raise ValueError("Matrix is not positive definite.")
+    # SymPy does not check definiteness for exact input; symbolic pivots are left undecided
+    if any(L[i, i].is_positive is False for i in range(L.rows)):
+        raise ValueError("Matrix is not positive definite.")
+    return {"L": L.tolist()}
@@ -0,0 +1,134 @@
+"""Blocked matrix multiplication for large exact and symbolic products.
+
+Float products go straight to BLAS, which is already cache-blocked and
+multithreaded. Integer products (int64 or Python integers, which is also
+what exact rationals become, see backend.scaled_arrays) are split into
+limbs: each entry is cut into signed pieces of a few bits, small enough
+that every sum of limb products stays below 2**53. The limb matrices are then
+multiplied with float BLAS, which is exact for them, and recombined with
+shifts. What is left, symbolic matrices and integers too wide for
+MAX_LIMB_PRODUCTS, is cut into row blocks of A, one per worker process of a
+shared pool, each worker multiplying its block by the whole of B.
+
+The pool has worker_count() processes (configure() changes it) and is
+started on first use. Its workers stop when the process that started them
+exits or is killed, e.g. when a job running a large product is cancelled.
+"""
+import math
+import os
+import numpy as np
+import sympy as sp
+from src import backend
+from src.jobs import WorkerPool
+
+# Largest number of limb-by-limb BLAS products before Python integer arithmetic is cheaper
+MAX_LIMB_PRODUCTS = 64
+# Multiply-adds below which a product is not worth sending to the pool
+MIN_PARALLEL_WORK = {"object": 2**18, "symbolic": 2**9}
+
+_workers = os.cpu_count() or 1
+_pool = None
+
+def configure(workers):
+    """Sets the number of worker processes used for large products (1 keeps them in-process)."""
+    global _workers
+    workers = int(workers)
+    if workers < 1:
+        raise ValueError("The number of workers must be at least 1")
+    if _pool is not None and len(_pool) != workers:
+        shutdown()
+    _workers = workers
+
+def worker_count():
+    return _workers
+
+def with_workers(workers, func, *args):
+    """Calls func(*args) with the given worker count; picklable, for the job runner."""
+    configure(workers)
+    return func(*args)
+
+def shutdown():
+    """Stops the worker pool; the next large product starts a new one."""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+def _get_pool():
+    global _pool
+    if _pool is None or not _pool.alive():
+        shutdown()
+        _pool = WorkerPool(_workers)
+    return _pool
+
+def matmul(A, B):
+    """A @ B for NumPy arrays (numeric or of SymPy objects), through BLAS or the worker pool when large."""
+    if A.dtype.kind in "fc" or B.dtype.kind in "fc":
+        return A @ B
+    if backend.is_integer_matrix(A) and backend.is_integer_matrix(B):
+        C = limb_product(A, B)
+        if C is not None:
+            return C
+        kind = "object"
+    else:
+        kind = "symbolic" if backend.SYMBOLIC in (backend.matrix_kind(A), backend.matrix_kind(B)) else "object"
+    n, k = A.shape
+    m = B.shape[1]
+    parts = min(_workers, n)
+    if parts < 2 or n * k * m < MIN_PARALLEL_WORK[kind]:
+        return multiply_block(A, B, kind)
+    bounds = np.linspace(0, n, parts + 1).astype(int)
+    blocks = _get_pool().map(multiply_block, [(A[r0:r1], B, kind) for r0, r1 in zip(bounds, bounds[1:])])
+    return np.vstack(blocks)
+
+def multiply_block(A, B, kind):
+    """The product of a block of rows of A with B, of Python numbers ("object") or SymPy ones ("symbolic")."""
+    if kind == "object":
+        return A.astype(object) @ B.astype(object)
+    # One Add of all the terms is far cheaper than adding them up one at a time
+    columns = B.T.tolist()
+    C = np.empty((A.shape[0], B.shape[1]), dtype=object)
+    C[:] = [[sp.Add(*[a * b for a, b in zip(row, column)]) for column in columns] for row in A.tolist()]
+    return C
+
+# --- Exact integer products through float BLAS ---
+
+def limb_product(A, B):
+    """Exact A @ B of integer arrays by float BLAS on limbs; None when that would take too many products.
+
+    The result is int64 when it fits, else an array of Python integers,
+    as backend.overflow_safe would give.
+    """
+    a, b = backend.max_abs(A), backend.max_abs(B)
+    k = A.shape[1]
+    if a == 0 or b == 0:
+        return np.zeros((A.shape[0], B.shape[1]), dtype=np.int64)
+    # Every sum of k limb products must stay below 2**53
+    bits = (53 - math.ceil(math.log2(k + 1))) // 2
+    count_a, count_b = -(-a.bit_length() // bits), -(-b.bit_length() // bits)
+    if count_a * count_b > MAX_LIMB_PRODUCTS:
+        return None
+    limbs_a, limbs_b = _limbs(A, bits, count_a), _limbs(B, bits, count_b)
+    wide = a * b * k > backend.INT64_MAX
+    C = None
+    for d in range(count_a + count_b - 1):
+        # All limbs of an entry share its sign, so no partial sum exceeds a * b * k
+        D = sum((limbs_a[i] @ limbs_b[d - i]).astype(np.int64) for i in range(max(0, d - count_b + 1), min(d, count_a - 1) + 1))
+        if wide:
+            D = D.astype(object)
+        term = D << (bits * d) if d else D
+        C = term if C is None else C + term
+    return C
+
+def _limbs(A, bits, count):
+    """Float arrays L[0..count-1] with A = sum(L[i] * 2**(bits*i)), every entry below 2**bits and signed like A."""
+    negative = A < 0
+    if A.dtype == object:
+        magnitude = np.where(negative, -A, A)
+        mask = (1 << bits) - 1
+        pieces = [((magnitude >> (bits * i)) & mask).astype(float) for i in range(count)]
+    else:
+        magnitude = np.abs(A.astype(np.int64)).astype(np.uint64)
+        mask = np.uint64((1 << bits) - 1)
+        pieces = [((magnitude >> np.uint64(bits * i)) & mask).astype(float) for i in range(count)]
+    return [np.where(negative, -p, p) for p in pieces]
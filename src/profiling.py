@@ -0,0 +1,234 @@
+"""Timing and profiling instrumentation for matrix operations.
+
+Every operation gets a record: a dict with the wall time, CPU time and (when
+tracemalloc is tracing) peak memory of each stage (parse, validate, compute,
+transfer, render, format) and of each logic.* call made while computing.
+Finished records go to a rolling session log that can be exported as JSON
+lines and aggregated:
+
+    python -m src.profiling session.jsonl [more.jsonl ...]
+"""
+import argparse
+import cProfile
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Operation records kept in the rolling session log
+SESSION_LOG_SIZE = 1000
+# logic.* calls recorded per operation, and how deeply nested calls are followed
+MAX_CALLS = 200
+MAX_CALL_DEPTH = 4
+# Call lines shown under a result in the Results tab
+MAX_SHOWN_CALLS = 8
+
+def new_record(operation):
+    return {"operation": operation, "started": time.time(), "stages": [], "calls": []}
+
+@contextmanager
+def stage(name, record):
+    """Times the enclosed block as one stage of record."""
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        entry = {"stage": name, "wall": time.perf_counter() - wall, "cpu": time.process_time() - cpu}
+        if tracing:
+            entry["peak_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - base)
+        record["stages"].append(entry)
+
+# --- logic.* call recording ---
+
+class _Recorder:
+    """Where timed() puts its entries; only active inside run()."""
+    def __init__(self):
+        self.record = None
+        self.depth = 0
+
+_recorder = _Recorder()
+
+def timed(func):
+    """Decorator recording the wall and CPU time of a call while an operation is being profiled."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        record = _recorder.record
+        if record is None or _recorder.depth >= MAX_CALL_DEPTH or len(record["calls"]) >= MAX_CALLS:
+            return func(*args, **kwargs)
+        entry = {"name": func.__name__, "depth": _recorder.depth}
+        record["calls"].append(entry)
+        _recorder.depth += 1
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _recorder.depth -= 1
+            entry["wall"] = time.perf_counter() - wall
+            entry["cpu"] = time.process_time() - cpu
+    return wrapper
+
+def run(operation, func, args, memory=False, dump_dir=None):
+    """Runs func(*args) as the compute stage of an operation; returns (result, record).
+
+    Picklable, so it can be handed to the job runner. memory traces peak
+    memory with tracemalloc (which slows the computation down); dump_dir
+    also writes a cProfile and a tracemalloc snapshot there.
+    """
+    record = new_record(operation)
+    start_tracing = (memory or dump_dir) and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if dump_dir else None
+    _recorder.record, _recorder.depth = record, 0
+    try:
+        with stage("compute", record):
+            if profiler:
+                profiler.enable()
+            try:
+                result = func(*args)
+            finally:
+                if profiler:
+                    profiler.disable()
+        if dump_dir:
+            record["dumps"] = dump(operation, profiler, tracemalloc.take_snapshot(), dump_dir)
+    finally:
+        _recorder.record = None
+        if start_tracing:
+            tracemalloc.stop()
+    return result, record
+
+def dump(operation, profiler, snapshot, directory):
+    """Writes <time>-<operation>.prof (cProfile) and .tracemalloc files; returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{operation}")
+    profiler.dump_stats(base + ".prof")
+    snapshot.dump(base + ".tracemalloc")
+    return [base + ".prof", base + ".tracemalloc"]
+
+def merge(record, worker_record, elapsed):
+    """Adds the stages and calls measured in a worker; the rest of elapsed counts as transfer."""
+    record["stages"] += worker_record["stages"]
+    record["calls"] += worker_record["calls"]
+    if "dumps" in worker_record:
+        record["dumps"] = worker_record["dumps"]
+    compute = sum(s["wall"] for s in worker_record["stages"])
+    record["stages"].append({"stage": "transfer", "wall": max(0.0, elapsed - compute), "cpu": 0.0})
+
+# --- Session log ---
+
+class Session:
+    """Rolling log of finished operation records.
+
+    Stages measured outside an operation (such as parsing a grid edit) wait
+    in pending and are attached to the next operation that begins.
+    """
+    def __init__(self, size=SESSION_LOG_SIZE):
+        self.records = deque(maxlen=size)
+        self.pending = {"stages": []}
+
+    def begin(self, operation):
+        record = new_record(operation)
+        record["stages"], self.pending["stages"] = combine(self.pending["stages"]), []
+        return record
+
+    def finish(self, record, error=None):
+        if error is not None:
+            record["error"] = str(error)
+        record["total"] = sum(s["wall"] for s in record["stages"] if s["stage"] != "format")
+        self.records.append(record)
+        return record
+
+    def export(self, path):
+        """Writes the session records to a JSON lines file."""
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+        return len(self.records)
+
+    def clear(self):
+        self.records.clear()
+
+session = Session()
+
+# --- Reporting ---
+
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    return f"{seconds * 1000:.1f} ms"
+
+def combine(stages):
+    """Merges stages of the same name (e.g. several parses or formats) into one, keeping first-seen order."""
+    merged = {}
+    for s in stages:
+        if s["stage"] not in merged:
+            merged[s["stage"]] = dict(s)
+            continue
+        m = merged[s["stage"]]
+        m["wall"] += s["wall"]
+        m["cpu"] += s["cpu"]
+        if "peak_bytes" in s:
+            m["peak_bytes"] = max(m.get("peak_bytes", 0), s["peak_bytes"])
+    return list(merged.values())
+
+def format_record(record):
+    """Text lines summarising a record: one line of stages, then the logic calls in call order."""
+    parts = []
+    for s in combine(record["stages"]):
+        text = f"{s['stage']} {format_seconds(s['wall'])}"
+        extra = []
+        if s["stage"] == "compute":
+            extra.append(f"CPU {format_seconds(s['cpu'])}")
+        if "peak_bytes" in s:
+            extra.append(f"peak {s['peak_bytes'] / 2**20:.2f} MiB")
+        parts.append(text + (f" ({', '.join(extra)})" if extra else ""))
+    lines = ["Timing: " + " · ".join(parts)]
+    for call in record["calls"][:MAX_SHOWN_CALLS]:
+        lines.append(f"  {'  ' * call['depth']}{call['name']} {format_seconds(call['wall'])}")
+    if len(record["calls"]) > MAX_SHOWN_CALLS:
+        lines.append(f"  ... {len(record['calls']) - MAX_SHOWN_CALLS} more calls")
+    for path in record.get("dumps", ()):
+        lines.append(f"  Saved {path}")
+    return lines
+
+def aggregate(records):
+    """Per operation and stage (or logic call): count, mean, 95th percentile and max wall time."""
+    samples = {}
+    for record in records:
+        for s in record["stages"]:
+            samples.setdefault((record["operation"], s["stage"]), []).append(s["wall"])
+        for call in record["calls"]:
+            samples.setdefault((record["operation"], "logic." + call["name"]), []).append(call["wall"])
+    summary = []
+    for (operation, part), walls in sorted(samples.items()):
+        walls.sort()
+        p95 = walls[min(len(walls) - 1, math.ceil(0.95 * len(walls)) - 1)]
+        summary.append({"operation": operation, "part": part, "count": len(walls),
+                        "mean": sum(walls) / len(walls), "p95": p95, "max": walls[-1]})
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.profiling", description="Aggregate exported session logs.")
+    parser.add_argument("files", nargs="+", help="JSON lines files written by Export Log")
+    args = parser.parse_args(argv)
+    records = []
+    for path in args.files:
+        with open(path, encoding="utf-8") as f:
+            records += [json.loads(line) for line in f if line.strip()]
+    print(f"{'operation':<24} {'stage / call':<32} {'count':>6} {'mean':>10} {'p95':>10} {'max':>10}")
+    for row in aggregate(records):
+        print(f"{row['operation']:<24} {row['part']:<32} {row['count']:>6} {format_seconds(row['mean']):>10} "
+              f"{format_seconds(row['p95']):>10} {format_seconds(row['max']):>10}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import numpy as np
+import sympy as sp
+from src import parallel, sparse
+from src.backend import FLOAT, SYMBOLIC, matrix_kind, is_numeric_array, overflow_safe, to_array, to_float_array
+from src.elimination import integer_rows
+from src.sparse import SparseMatrix
+
+# Row block height of the NumPy scan (bounds the temporaries it allocates)
+BLOCK_ROWS = 256
+# A matrix is banded when its band covers at most this share of the columns
+BANDED_MAX_FRACTION = 0.5
+# Relative tolerance of the float orthogonality / idempotency checks
+FLOAT_TOLERANCE = 1e-10
+# Exact matrices up to this order are tested for definiteness exactly, larger ones in floats
+EXACT_DEFINITE_MAX_ORDER = 64
+
+# --- Single-pass structure scan ---
+
+def scan(matrix):
+    """Settles the cheap structural properties in one pass over the matrix.
+
+    Returns a dict with square, symmetric, skew_symmetric, lower/upper
+    bandwidth, the non-zero count and whether the diagonal is all positive.
+    Symmetry checks stop as soon as both have failed; nothing is copied
+    beyond one block of rows at a time.
+    """
+    if isinstance(matrix, SparseMatrix):
+        return sparse.scan(matrix)
+    if is_numeric_array(matrix):
+        return _scan_array(matrix)
+    return _scan_rows(matrix)
+
+def _scan_rows(matrix):
+    n, m = len(matrix), len(matrix[0])
+    square = n == m
+    symmetric = skew = positive_diagonal = square
+    lower = upper = nonzeros = diagonal = 0
+    for i, row in enumerate(matrix):
+        for j, x in enumerate(row):
+            if x == 0:
+                continue
+            nonzeros += 1
+            if j == i:
+                diagonal += 1
+                skew = False
+                positive_diagonal = positive_diagonal and _is_positive(x)
+                continue
+            if j < i:
+                lower = max(lower, i - j)
+            else:
+                upper = max(upper, j - i)
+            # Every mismatched pair has a non-zero side, so checking from the non-zeros is enough
+            if symmetric or skew:
+                y = matrix[j][i]
+                symmetric = symmetric and x == y
+                skew = skew and x == -y
+    return {"square": square, "symmetric": symmetric, "skew_symmetric": skew, "lower_bandwidth": lower,
+            "upper_bandwidth": upper, "nonzeros": nonzeros, "positive_diagonal": positive_diagonal and diagonal == n}
+
+def _scan_array(A):
+    n, m = A.shape
+    square = n == m
+    symmetric = skew = square
+    lower = upper = nonzeros = 0
+    for k0 in range(0, n, BLOCK_ROWS):
+        k1 = min(k0 + BLOCK_ROWS, n)
+        block = A[k0:k1]
+        nz = block != 0
+        nonzeros += int(np.count_nonzero(nz))
+        filled = nz.any(axis=1)
+        if filled.any():
+            index, nz = np.arange(k0, k1)[filled], nz[filled]
+            first = nz.argmax(axis=1)
+            last = m - 1 - nz[:, ::-1].argmax(axis=1)
+            lower = max(lower, int((index - first).max()))
+            upper = max(upper, int((last - index).max()))
+        if symmetric or skew:
+            mirror = A[:, k0:k1].T
+            symmetric = symmetric and np.array_equal(block, mirror)
+            skew = skew and np.array_equal(block, -mirror)
+    diagonal = A.diagonal()
+    positive_diagonal = square and bool(np.all(diagonal.real > 0) and not np.any(diagonal.imag))
+    return {"square": square, "symmetric": symmetric, "skew_symmetric": skew, "lower_bandwidth": lower,
+            "upper_bandwidth": upper, "nonzeros": nonzeros, "positive_diagonal": positive_diagonal}
+
+def _is_positive(x):
+    if isinstance(x, sp.Basic):
+        return x.is_positive is True
+    try:
+        return x > 0
+    except TypeError:
+        return False
+
+def structure(info, shape):
+    """The boolean structure properties and band/sparsity figures implied by a scan."""
+    n, m = shape
+    lower, upper = info["lower_bandwidth"], info["upper_bandwidth"]
+    cells = n * m
+    return {
+        "symmetric": info["symmetric"],
+        "skew_symmetric": info["skew_symmetric"],
+        "diagonal": lower == 0 and upper == 0,
+        "upper_triangular": lower == 0,
+        "lower_triangular": upper == 0,
+        "banded": lower + upper + 1 <= BANDED_MAX_FRACTION * m,
+        "lower_bandwidth": lower,
+        "upper_bandwidth": upper,
+        "sparsity": 1 - info["nonzeros"] / cells if cells else 0.0,
+    }
+
+# --- Algebraic properties (run only when a cheap necessary condition holds) ---
+
+def algebraic(matrix, info):
+    """orthogonal, idempotent and positive_definite of a matrix, given its scan."""
+    if not info["square"]:
+        return {"orthogonal": False, "idempotent": False, "positive_definite": False}
+    kind = matrix_kind(matrix)
+    A = matrix if isinstance(matrix, SparseMatrix) else to_array(matrix)
+    return {"orthogonal": is_orthogonal(A, kind),
+            "idempotent": is_idempotent(A, kind),
+            "positive_definite": is_positive_definite(A, info, kind)}
+
+def is_orthogonal(A, kind):
+    """A Aᵀ = I for a square array or sparse matrix, tried only when its rows (for SymPy input, the first row) have unit norm."""
+    n = A.shape[0]
+    if isinstance(A, SparseMatrix):
+        norms = np.zeros(n, dtype=A.values.dtype)
+        np.add.at(norms, A.rows, A.values * A.values)
+        if not _is_zero(norms - 1, kind):
+            return False
+        return _is_zero(sparse.add(_sparse_product(A, sparse.transpose(A)), sparse.identity(n), -1).values, kind)
+    norms = (A[:1] * A[:1]).sum(axis=1) if A.dtype == object else np.einsum('ij,ij->i', A, A)
+    if not _is_zero(norms - 1, kind):
+        return False
+    return _is_zero(parallel.matmul(A, A.T) - np.eye(n, dtype=A.dtype), kind)
+
+def is_idempotent(A, kind):
+    """A² = A for a square array or sparse matrix, tried only when the first row of A² already matches."""
+    values = A.values if isinstance(A, SparseMatrix) else A
+    scale = max(1.0, float(np.max(np.abs(values)))) ** 2 if values.dtype.kind in "fc" and values.size else 1.0
+    if isinstance(A, SparseMatrix):
+        first = A.rows == 0
+        row = SparseMatrix((1, A.shape[1]), A.rows[first], A.cols[first], A.values[first])
+        if not _is_zero(sparse.add(_sparse_product(row, A), row, -1).values, kind, scale):
+            return False
+        return _is_zero(sparse.add(_sparse_product(A, A), A, -1).values, kind, scale)
+    if not _is_zero(parallel.matmul(A[:1], A) - A[:1], kind, scale):
+        return False
+    return _is_zero(parallel.matmul(A, A) - A, kind, scale)
+
+def is_positive_definite(A, info, kind):
+    """xᵀAx > 0 for all x ≠ 0; tried only for symmetric matrices with a positive diagonal.
+
+    Returns None for sparse matrices too large to factor in dense form.
+    """
+    if not (info["symmetric"] and info["positive_diagonal"]):
+        return False
+    if info["lower_bandwidth"] == 0 and info["upper_bandwidth"] == 0:
+        return True
+    n = A.shape[0]
+    if isinstance(A, SparseMatrix):
+        if n * n > sparse.MAX_DENSE_CELLS:
+            return None
+        A = to_array(A.to_dense())
+    if kind == SYMBOLIC:
+        return sp.Matrix(A.tolist()).is_positive_definite is True
+    if kind == FLOAT or n > EXACT_DEFINITE_MAX_ORDER:
+        try:
+            np.linalg.cholesky(to_float_array(A))
+            return True
+        except np.linalg.LinAlgError:
+            return False
+    return leading_minors_positive(integer_rows(A.tolist())[0])
+
+def leading_minors_positive(rows):
+    """Sylvester's criterion by fraction-free elimination without pivoting.
+
+    The k-th Bareiss pivot is the k-th leading principal minor (scaling rows
+    by positive integers keeps their signs), so this stops at the first
+    non-positive one.
+    """
+    a = [row[:] for row in rows]
+    n = len(a)
+    prev = 1
+    for k in range(n):
+        akk = a[k][k]
+        if akk <= 0:
+            return False
+        rowk = a[k][k + 1:]
+        for i in range(k + 1, n):
+            aik = a[i][k]
+            a[i][k + 1:] = [(akk * x - aik * y) // prev for x, y in zip(a[i][k + 1:], rowk)]
+        prev = akk
+    return True
+
+
+def _sparse_product(A, B):
+    a, b = overflow_safe(A.values.reshape(1, -1), B.values.reshape(1, -1), "matmul")
+    return sparse.matmul(SparseMatrix(A.shape, A.rows, A.cols, a[0]), SparseMatrix(B.shape, B.rows, B.cols, b[0]))
+
+def _is_zero(values, kind, scale=1.0):
+    """True when every value is zero: exactly, within FLOAT_TOLERANCE * scale, or after simplification."""
+    values = np.asarray(values)
+    if values.size == 0:
+        return True
+    if values.dtype == object:
+        if kind == SYMBOLIC:
+            return all(x == 0 or sp.simplify(x) == 0 for x in values.flat)
+        return all(x == 0 for x in values.flat)
+    if values.dtype.kind in "fc":
+        return bool(np.max(np.abs(values)) <= FLOAT_TOLERANCE * scale)
+    return not values.any()
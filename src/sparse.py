@@ -0,0 +1,340 @@
+import re
+import numpy as np
+import sympy as sp
+
+# Matrices with at least this many cells and at most this share of non-zeros are stored sparse
+SPARSE_MIN_CELLS = 10000
+SPARSE_MAX_DENSITY = 0.1
+# Largest matrix (in cells) that operations without sparse support will expand to dense form
+MAX_DENSE_CELLS = 10**8
+
+# Header line of the coordinate text format, e.g. "1000x1000"
+SIZE_HEADER = re.compile(r'(\d+)\s*[x×]\s*(\d+)')
+# Entry line of the coordinate text format, e.g. "3, 4: 1/2" (1-based row and column)
+ENTRY = re.compile(r'(\d+)\s*[,\s]\s*(\d+)\s*:\s*(.+)')
+
+def values_array(values):
+    """Packs element values into an int64, float or (for anything else) object array."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iufcO":
+        return values
+    values = list(values)
+    if all(isinstance(v, (int, np.integer, sp.Integer)) and not isinstance(v, bool) for v in values):
+        try:
+            return np.array([int(v) for v in values], dtype=np.int64)
+        except OverflowError:
+            pass
+    elif all(isinstance(v, (int, float, np.integer, np.floating, sp.Integer, sp.Float)) for v in values):
+        return np.array([float(v) for v in values], dtype=float)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+def _nonzero(values):
+    if values.dtype == object:
+        return np.array([v != 0 for v in values], dtype=bool)
+    return values != 0
+
+class SparseMatrix:
+    """Matrix stored as its non-zero entries in row-major coordinate (COO) form.
+
+    rows, cols and values are parallel NumPy arrays sorted by (row, col), with
+    no duplicates or explicit zeros; values has a numeric or object (SymPy)
+    dtype. m[i][j] and m[i, j] work as for a dense matrix, so code that is not
+    sparse-aware still sees the right elements.
+    """
+    def __init__(self, shape, rows, cols, values):
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.rows, self.cols, self.values = rows, cols, values
+        self._indptr = None
+
+    @classmethod
+    def from_entries(cls, shape, rows, cols, values):
+        """Builds a matrix from unsorted (row, col, value) entries, summing duplicates and dropping zeros."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = values_array(values)
+        if len(rows) and (rows.min() < 0 or cols.min() < 0 or rows.max() >= shape[0] or cols.max() >= shape[1]):
+            raise ValueError(f"Entry outside the {shape[0]}x{shape[1]} matrix")
+        order = np.lexsort((cols, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        if len(rows) > 1:
+            keys = rows * shape[1] + cols
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            if len(starts) < len(keys):
+                values = np.add.reduceat(values, starts)
+                rows, cols = rows[starts], cols[starts]
+        keep = _nonzero(values)
+        return cls(shape, rows[keep], cols[keep], values[keep])
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """Sparse copy of a dense matrix (NumPy array or list of rows)."""
+        if isinstance(matrix, np.ndarray) and matrix.dtype != object:
+            rows, cols = np.nonzero(matrix)
+            return cls(matrix.shape, rows.astype(np.int64), cols.astype(np.int64), matrix[rows, cols])
+        entries = [(i, j, x) for i, row in enumerate(matrix) for j, x in enumerate(row) if x != 0]
+        return cls.from_entries((len(matrix), len(matrix[0])), *zip(*entries)) if entries else \
+            cls((len(matrix), len(matrix[0])), np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.int64))
+
+    # --- Dense-style access ---
+
+    @property
+    def nnz(self):
+        return len(self.values)
+
+    @property
+    def density(self):
+        cells = self.shape[0] * self.shape[1]
+        return self.nnz / cells if cells else 0.0
+
+    @property
+    def indptr(self):
+        """Start of each row's entries (CSR row pointer), computed on first use."""
+        if self._indptr is None:
+            self._indptr = np.searchsorted(self.rows, np.arange(self.shape[0] + 1))
+        return self._indptr
+
+    def zero(self):
+        return self.values.dtype.type(0).item() if self.values.dtype != object else 0
+
+    def get(self, i, j):
+        start, end = self.indptr[i], self.indptr[i + 1]
+        k = start + np.searchsorted(self.cols[start:end], j)
+        if k < end and self.cols[k] == j:
+            value = self.values[k]
+            return value.item() if isinstance(value, np.generic) else value
+        return self.zero()
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self.get(*key)
+        if key < 0:
+            key += self.shape[0]
+        if not 0 <= key < self.shape[0]:
+            raise IndexError("row index out of range")
+        return _SparseRow(self, key)
+
+    def __iter__(self):
+        return (_SparseRow(self, i) for i in range(self.shape[0]))
+
+    def to_dense(self):
+        """Dense copy: a NumPy array for numeric values, else a list of rows."""
+        if self.shape[0] * self.shape[1] > MAX_DENSE_CELLS:
+            raise ValueError(f"A {self.shape[0]}x{self.shape[1]} matrix is too large for this operation in dense form")
+        if self.values.dtype != object:
+            dense = np.zeros(self.shape, dtype=self.values.dtype)
+            dense[self.rows, self.cols] = self.values
+            return dense
+        dense = [[0] * self.shape[1] for _ in range(self.shape[0])]
+        for i, j, x in zip(self.rows.tolist(), self.cols.tolist(), self.values):
+            dense[i][j] = x
+        return dense
+
+    def to_text(self, formatter=str):
+        """Coordinate text: an RxC size line, then one "row, col: value" line per non-zero (1-based)."""
+        lines = [f"{self.shape[0]}x{self.shape[1]}"]
+        lines += [f"{i + 1}, {j + 1}: {formatter(x)}" for i, j, x in zip(self.rows.tolist(), self.cols.tolist(), self.values.tolist())]
+        return "\n".join(lines)
+
+    def with_entry(self, i, j, value):
+        """Copy with element (i, j) replaced."""
+        keep = ~((self.rows == i) & (self.cols == j))
+        values = list(self.values[keep].tolist()) + [value]
+        return SparseMatrix.from_entries(self.shape, np.r_[self.rows[keep], i], np.r_[self.cols[keep], j], values_array(values))
+
+    def resized(self, rows, cols):
+        """Copy cut or padded with zeros to rows x cols."""
+        keep = (self.rows < rows) & (self.cols < cols)
+        return SparseMatrix((rows, cols), self.rows[keep], self.cols[keep], self.values[keep])
+
+    def __getstate__(self):
+        return self.shape, self.rows, self.cols, self.values
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+class _SparseRow:
+    """Read-only view of one row of a SparseMatrix."""
+    def __init__(self, matrix, i):
+        self.matrix, self.i = matrix, i
+
+    def __len__(self):
+        return self.matrix.shape[1]
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return list(self)[j]
+        if j < 0:
+            j += self.matrix.shape[1]
+        if not 0 <= j < self.matrix.shape[1]:
+            raise IndexError("column index out of range")
+        return self.matrix.get(self.i, j)
+
+    def __iter__(self):
+        m = self.matrix
+        row = [m.zero()] * m.shape[1]
+        start, end = m.indptr[self.i], m.indptr[self.i + 1]
+        for j, x in zip(m.cols[start:end].tolist(), m.values[start:end].tolist()):
+            row[j] = x
+        return iter(row)
+
+def should_be_sparse(shape, nnz):
+    """True when a matrix of this shape and non-zero count is worth storing sparse."""
+    cells = shape[0] * shape[1]
+    return cells >= SPARSE_MIN_CELLS and nnz <= SPARSE_MAX_DENSITY * cells
+
+def maybe_sparse(matrix):
+    """Returns a sparse copy of a dense matrix when it is large and mostly zeros, else the matrix."""
+    if isinstance(matrix, np.ndarray) and matrix.dtype != object:
+        nnz = int(np.count_nonzero(matrix))
+    else:
+        nnz = sum(1 for row in matrix for x in row if x != 0)
+    if should_be_sparse((len(matrix), len(matrix[0])), nnz):
+        return SparseMatrix.from_dense(matrix)
+    return matrix
+
+def parse_coordinates(lines, parse_value):
+    """Parses the coordinate text format (size line already split off as lines[0])."""
+    size = SIZE_HEADER.fullmatch(lines[0])
+    shape = (int(size.group(1)), int(size.group(2)))
+    if shape[0] < 1 or shape[1] < 1:
+        raise ValueError("Matrix size must be at least 1x1")
+    rows, cols, values = [], [], []
+    for line in lines[1:]:
+        entry = ENTRY.fullmatch(line)
+        if entry is None:
+            raise ValueError(f"Expected 'row, column: value' but got '{line}'")
+        i, j = int(entry.group(1)) - 1, int(entry.group(2)) - 1
+        if not (0 <= i < shape[0] and 0 <= j < shape[1]):
+            raise ValueError(f"Entry ({i + 1}, {j + 1}) is outside the {shape[0]}x{shape[1]} matrix")
+        rows.append(i)
+        cols.append(j)
+        values.append(parse_value(entry.group(3).strip()))
+    return SparseMatrix.from_entries(shape, rows, cols, values_array(values))
+
+# --- Sparse-aware operations ---
+
+def add(A, B, sign=1):
+    """A + B (or A - B with sign=-1) for two sparse matrices of the same shape."""
+    return SparseMatrix.from_entries(A.shape, np.r_[A.rows, B.rows], np.r_[A.cols, B.cols],
+                                     np.concatenate([A.values, B.values if sign > 0 else -B.values]))
+
+def elementwise(A, B):
+    """Element-wise product of a sparse matrix with a sparse or dense (array) matrix."""
+    if isinstance(B, SparseMatrix):
+        _, ia, ib = np.intersect1d(A.rows * A.shape[1] + A.cols, B.rows * B.shape[1] + B.cols,
+                                   assume_unique=True, return_indices=True)
+        return SparseMatrix.from_entries(A.shape, A.rows[ia], A.cols[ia], A.values[ia] * B.values[ib])
+    return SparseMatrix.from_entries(A.shape, A.rows, A.cols, A.values * B[A.rows, A.cols])
+
+def matmul(A, B):
+    """Matrix product where at least one side is sparse; sparse @ sparse stays sparse, else a dense array."""
+    if isinstance(A, SparseMatrix) and isinstance(B, SparseMatrix):
+        # Pair every entry A[i, k] with the entries of row k of B
+        counts = B.indptr[A.cols + 1] - B.indptr[A.cols]
+        total = int(counts.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        index = np.repeat(B.indptr[A.cols], counts) + offsets
+        return SparseMatrix.from_entries((A.shape[0], B.shape[1]), np.repeat(A.rows, counts), B.cols[index],
+                                         np.repeat(A.values, counts) * B.values[index])
+    if isinstance(A, SparseMatrix):
+        result = np.zeros((A.shape[0], B.shape[1]), dtype=np.result_type(A.values, B))
+        np.add.at(result, A.rows, A.values[:, None] * B[A.cols])
+        return result
+    return matmul(transpose(B), A.T).T
+
+def scale(A, scalar):
+    return SparseMatrix.from_entries(A.shape, A.rows, A.cols, A.values * scalar)
+
+def transpose(A):
+    # Rows are already sorted, so a stable sort by column gives (col, row) order
+    order = np.argsort(A.cols, kind='stable')
+    return SparseMatrix((A.shape[1], A.shape[0]), A.cols[order], A.rows[order], A.values[order])
+
+def trace(A):
+    return sum(A.values[A.rows == A.cols].tolist())
+
+def _same_entries(A, B, negate=False):
+    if A.shape != B.shape or A.nnz != B.nnz:
+        return False
+    if not (np.array_equal(A.rows, B.rows) and np.array_equal(A.cols, B.cols)):
+        return False
+    return bool(np.all(A.values == (-B.values if negate else B.values)))
+
+def identity(n):
+    diagonal = np.arange(n, dtype=np.int64)
+    return SparseMatrix((n, n), diagonal, diagonal, np.ones(n, dtype=np.int64))
+
+def scan(A):
+    """The structure scan of properties.scan, computed from the non-zeros only."""
+    square = A.shape[0] == A.shape[1]
+    T = transpose(A) if square else None
+    symmetric = square and _same_entries(A, T)
+    offsets = A.cols - A.rows
+    diagonal = A.values[offsets == 0]
+    if diagonal.dtype == object:
+        positive = all(sp.sympify(x).is_positive is True for x in diagonal)
+    else:
+        positive = bool(np.all(diagonal.real > 0) and not np.any(diagonal.imag))
+    return {
+        "square": square,
+        "symmetric": symmetric,
+        "skew_symmetric": square and not symmetric and _same_entries(A, T, negate=True),
+        "lower_bandwidth": int(max(0, -offsets.min())) if A.nnz else 0,
+        "upper_bandwidth": int(max(0, offsets.max())) if A.nnz else 0,
+        "nonzeros": A.nnz,
+        "positive_diagonal": square and positive and len(diagonal) == A.shape[0],
+    }
+
+def row_echelon(A, tol=1e-12):
+    """Gaussian elimination with partial pivoting in floats, touching non-zeros only.
+
+    Follows the same steps as the dense gauss_transformation (the pivot for
+    column j goes to row j), so fill-in is limited to what elimination needs.
+    """
+    n, m = A.shape
+    rows = [{} for _ in range(n)]
+    col_rows = {}
+    for i, j, x in zip(A.rows.tolist(), A.cols.tolist(), A.values.astype(float).tolist()):
+        rows[i][j] = x
+        col_rows.setdefault(j, set()).add(i)
+
+    for j in range(min(n, m)):
+        candidates = sorted(i for i in col_rows.get(j, ()) if i >= j)
+        if not candidates:
+            continue
+        pivot_row = max(candidates, key=lambda i: abs(rows[i][j]))
+        if abs(rows[pivot_row][j]) < tol:
+            continue
+        if pivot_row != j:
+            for k in rows[j]:
+                col_rows[k].discard(j)
+            for k in rows[pivot_row]:
+                col_rows[k].discard(pivot_row)
+                col_rows[k].add(j)
+            for k in rows[j]:
+                col_rows[k].add(pivot_row)
+            rows[j], rows[pivot_row] = rows[pivot_row], rows[j]
+        pivot = rows[j]
+        tail = [(k, x) for k, x in pivot.items() if k > j]
+        for i in [i for i in col_rows[j] if i > j]:
+            row = rows[i]
+            factor = row.pop(j) / pivot[j]
+            col_rows[j].discard(i)
+            for k, x in tail:
+                value = row.get(k, 0.0) - factor * x
+                if value:
+                    if k not in row:
+                        col_rows[k].add(i)
+                    row[k] = value
+                elif k in row:
+                    del row[k]
+                    col_rows[k].discard(i)
+
+    entries = [(i, j, x) for i, row in enumerate(rows) for j, x in row.items()]
+    if not entries:
+        return SparseMatrix((n, m), np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0))
+    return SparseMatrix.from_entries((n, m), *zip(*entries))
@@ -0,0 +1,190 @@
+"""Named-matrix workspace: any number of matrices of any size, from inputs, files and results.
+
+Every entry's memory use is estimated when it is stored. When the entries
+held in memory exceed the budget, or the system is short of memory, the
+least recently used large entries are spilled: written to a private
+temporary directory and dropped, then read back on their next use.
+Numeric matrices spill to .npy/.npz, so large ones come back
+memory-mapped (and go to worker processes as a file reference); exact and
+symbolic ones spill to the lossless .sym format. Pinned entries, such as
+the input grids that keep their own copy, are counted but never spilled.
+"""
+import itertools
+import keyword
+import os
+import re
+import shutil
+import tempfile
+import weakref
+import numpy as np
+from src import backend, expression, logic
+from src.sparse import SparseMatrix
+
+# Entries smaller than this stay in memory, as spilling them would free next to nothing
+SPILL_MIN_BYTES = 2**20
+# Spill while the system has less memory available than this, even under the budget
+MIN_AVAILABLE_BYTES = 256 * 2**20
+# Share of physical memory the workspace may hold by default
+DEFAULT_BUDGET_SHARE = 0.25
+
+class Entry:
+    """One named matrix; matrix is None while it is spilled to path."""
+    def __init__(self, name, matrix, source, pinned):
+        self.name = name
+        self.matrix = matrix
+        self.source = source
+        self.pinned = pinned
+        self.shape = (len(matrix), len(matrix[0]))
+        self.kind = "sparse" if isinstance(matrix, SparseMatrix) else backend.matrix_kind(matrix)
+        self.nbytes = footprint(matrix)
+        self.path = None
+        self.used = 0
+
+    def location(self):
+        if self.matrix is None:
+            return "disk"
+        return "mapped" if isinstance(self.matrix, np.memmap) else "memory"
+
+class Workspace:
+    """The named matrices of a session, held within a memory budget."""
+    def __init__(self, max_bytes=None):
+        self.max_bytes = default_budget() if max_bytes is None else max_bytes
+        self.entries = {}
+        self.directory = None
+        self._clock = itertools.count(1)
+
+    def configure(self, max_bytes):
+        """Sets the memory budget in bytes, spilling entries at once if it is exceeded."""
+        if max_bytes < 0:
+            raise ValueError("The memory budget cannot be negative")
+        self.max_bytes = max_bytes
+        self._enforce()
+
+    def put(self, name, matrix, source, pinned=False):
+        """Stores a matrix under name, replacing any entry of that name."""
+        if not valid_name(name):
+            raise ValueError(f"'{name}' cannot name a matrix (use letters, digits and _, starting with a letter)")
+        if not len(matrix):
+            raise ValueError("There is no matrix to store")
+        self.remove(name)
+        entry = Entry(name, matrix, source, pinned)
+        entry.used = next(self._clock)
+        self.entries[name] = entry
+        self._enforce(keep=entry)
+        return entry
+
+    def get(self, name):
+        """The matrix stored under name, read back from disk if it was spilled."""
+        entry = self.entries.get(name)
+        if entry is None:
+            raise ValueError(f"No matrix named '{name}' in the workspace")
+        entry.used = next(self._clock)
+        if entry.matrix is None:
+            entry.matrix = logic.load_matrix(entry.path)
+            entry.nbytes = footprint(entry.matrix)
+        self._enforce(keep=entry)
+        return entry.matrix
+
+    def remove(self, name):
+        entry = self.entries.pop(name, None)
+        if entry is not None and entry.path is not None:
+            os.remove(entry.path)
+
+    def names(self):
+        return list(self.entries)
+
+    def shapes(self):
+        return {name: entry.shape for name, entry in self.entries.items()}
+
+    def free_name(self, prefix):
+        """The first of prefix1, prefix2, ... not in use."""
+        return next(f"{prefix}{i}" for i in itertools.count(1) if f"{prefix}{i}" not in self.entries)
+
+    def stats(self):
+        """Entry count, bytes held in memory, bytes in spill files and the budget."""
+        return {"entries": len(self.entries),
+                "memory_bytes": sum(e.nbytes for e in self.entries.values() if e.matrix is not None),
+                "disk_bytes": sum(os.path.getsize(e.path) for e in self.entries.values() if e.path is not None),
+                "max_bytes": self.max_bytes}
+
+    def close(self):
+        """Forgets every entry and deletes the spill files."""
+        self.entries.clear()
+        if self.directory is not None:
+            self._cleanup()
+            self.directory = None
+
+    # --- Spilling ---
+
+    def _enforce(self, keep=None):
+        """Spills least recently used entries until the rest fit the budget; keep (just stored or read) stays."""
+        held = sum(e.nbytes for e in self.entries.values() if e.matrix is not None)
+        candidates = sorted((e for e in self.entries.values()
+                             if e.matrix is not None and not e.pinned and e is not keep and e.nbytes >= SPILL_MIN_BYTES),
+                            key=lambda e: e.used)
+        for entry in candidates:
+            if held <= self.max_bytes and not memory_is_low():
+                break
+            self._spill(entry)
+            held -= entry.nbytes
+
+    def _spill(self, entry):
+        """Writes an entry to disk (unless an up-to-date copy is already there) and drops it from memory."""
+        if entry.path is None:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix="matrix-workspace-")
+                self._cleanup = weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True)
+            path = os.path.join(self.directory, f"{entry.name}-{next(self._clock)}{spill_format(entry.matrix)}")
+            logic.save_matrix(entry.matrix, path)
+            entry.path = path
+        entry.matrix = None
+
+def spill_format(matrix):
+    """File type that stores a matrix exactly: NumPy for machine numbers, .sym for the rest."""
+    if isinstance(matrix, SparseMatrix):
+        return ".npz" if matrix.values.dtype != object else ".sym"
+    if backend.is_numeric_array(matrix):
+        return ".npy"
+    # Float results come back as lists of Python floats, which .npy holds exactly
+    if all(type(x) in (float, complex) for row in matrix for x in row):
+        return ".npy"
+    return ".sym"
+
+def footprint(matrix):
+    """Bytes a matrix keeps in memory; memory-mapped arrays are backed by their file instead."""
+    if isinstance(matrix, np.memmap):
+        return 0
+    return logic.estimate_size(matrix)
+
+def valid_name(name):
+    """Names must be identifiers an expression can use, other than keywords and its function names."""
+    return re.fullmatch(r"[A-Za-z]\w*", name) is not None and not keyword.iskeyword(name) and name not in expression.FUNCTIONS
+
+def name_from(text):
+    """A valid matrix name made from text such as a file name."""
+    name = re.sub(r"\W", "_", text)
+    if not name or not name[0].isalpha():
+        name = "M_" + name
+    return name if valid_name(name) else name + "_"
+
+def default_budget():
+    """DEFAULT_BUDGET_SHARE of physical memory, or 1 GiB where that is unknown."""
+    try:
+        return int(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") * DEFAULT_BUDGET_SHARE)
+    except (AttributeError, ValueError, OSError):
+        return 2**30
+
+def available_memory():
+    """Bytes the system can still hand out (MemAvailable), or None where that is unknown."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def memory_is_low():
+    available = available_memory()
+    return available is not None and available < MIN_AVAILABLE_BYTES
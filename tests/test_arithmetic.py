@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic
+
+x = sp.Symbol("x")
+
+class NumericFastPathTest(unittest.TestCase):
+    """NumPy results against SymPy's, for the operations that skip SymPy on numeric input."""
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.ints = [rng.integers(-50, 50, (4, 4)) for _ in range(3)]
+        self.floats = [rng.uniform(-5, 5, (4, 4)) for _ in range(3)]
+
+    def test_integers_match_sympy(self):
+        A, B, C = self.ints
+        MA, MB, MC = (sp.Matrix(m.tolist()) for m in self.ints)
+        self.assertEqual(sp.Matrix(logic.add_matrices([A, B, C])), MA + MB + MC)
+        self.assertEqual(sp.Matrix(logic.subtract_matrices([A, B, C])), MA - MB - MC)
+        self.assertEqual(sp.Matrix(logic.multiply_matrices([A, B, C])), MA * MB * MC)
+        self.assertEqual(sp.Matrix(logic.elementwise_multiply([A, B])), MA.multiply_elementwise(MB))
+        self.assertEqual(sp.Matrix(logic.scalar_multiply(A, 3)), 3 * MA)
+
+    def test_floats_match_numpy(self):
+        A, B, C = self.floats
+        self.assertTrue(np.allclose(logic.add_matrices([A, B, C]), A + B + C))
+        self.assertTrue(np.allclose(logic.multiply_matrices([A, B, C]), A @ B @ C))
+        self.assertTrue(np.allclose(logic.scalar_multiply(A, 1.5), 1.5 * A))
+
+    def test_results_are_lists(self):
+        result = logic.add_matrices(self.ints[:2])
+        self.assertIsInstance(result, list)
+        self.assertIsInstance(result[0][0], int)
+
+    def test_int64_overflow_promotes_to_python_ints(self):
+        big = np.array([[2**62, 2**62], [1, 1]], dtype=np.int64)
+        self.assertEqual(logic.add_matrices([big, big])[0][0], 2**63)
+        self.assertEqual(logic.multiply_matrices([big, big])[0][0], 2**124 + 2**62)
+        self.assertEqual(logic.elementwise_multiply([big, big])[0][0], 2**124)
+        self.assertEqual(logic.scalar_multiply(big, 4)[0][0], 2**64)
+
+    def test_mixed_int_and_float(self):
+        A, B = self.ints[0], self.floats[0]
+        self.assertTrue(np.allclose(logic.add_matrices([A, B]), A + B))
+
+    def test_symbolic_falls_back(self):
+        A = [[x, 1], [2, 3]]
+        self.assertEqual(sp.Matrix(logic.multiply_matrices([A, [[1, 0], [0, 2]]])), sp.Matrix([[x, 2], [2, 6]]))
+        self.assertEqual(logic.scalar_multiply([[1, 2]], x), [[x, 2 * x]])
+
+    def test_incompatible_dimensions(self):
+        with self.assertRaises(ValueError):
+            logic.add_matrices([self.ints[0], np.ones((3, 4), dtype=np.int64)])
+        with self.assertRaises(ValueError):
+            logic.multiply_matrices([self.ints[0], np.ones((3, 4), dtype=np.int64)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic
+
+class ResultCacheTest(unittest.TestCase):
+    def test_lru_eviction_within_budget(self):
+        cache = logic.ResultCache(max_bytes=3 * logic.estimate_size([0] * 100))
+        for key in "abc":
+            cache.put(key, [0] * 100)
+        cache.peek("a")
+        cache.put("d", [0] * 100)
+        self.assertIsNone(cache.peek("b"))
+        self.assertEqual(sorted(cache.entries), ["a", "c", "d"])
+        self.assertLessEqual(cache.bytes, cache.max_bytes)
+
+    def test_oversized_values_are_not_stored(self):
+        cache = logic.ResultCache(max_bytes=100)
+        self.assertEqual(cache.get_or_compute("big", lambda: [0] * 1000), [0] * 1000)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_hits_and_misses(self):
+        cache = logic.ResultCache()
+        calls = []
+        compute = lambda: calls.append(1) or 42
+        self.assertEqual([cache.get_or_compute("k", compute) for _ in range(3)], [42] * 3)
+        self.assertEqual((len(calls), cache.hits, cache.misses), (1, 2, 1))
+
+class MatrixKeyTest(unittest.TestCase):
+    def test_distinguishes_values_types_and_shapes(self):
+        keys = {logic.matrix_key(m) for m in ([[1, 2]], [[1.0, 2]], [[1], [2]], [[1, 3]], [[sp.Rational(1, 2), 2]],
+                                              [[sp.Float("0.5"), 2]], [[sp.Symbol("x"), 2]])}
+        self.assertEqual(len(keys), 7)
+
+    def test_equal_content_shares_a_key(self):
+        self.assertEqual(logic.matrix_key([[1, 2]]), logic.matrix_key([[sp.Integer(1), 2]]))
+        a = np.arange(6).reshape(2, 3)
+        self.assertEqual(logic.matrix_key(a), logic.matrix_key(a.copy()))
+
+class CachedOperationsTest(unittest.TestCase):
+    def setUp(self):
+        logic.clear_cache()
+
+    def test_repeat_is_a_hit_with_the_same_result(self):
+        A = [[2, 1], [1, 1]]
+        first = logic.determinant(A)
+        self.assertEqual(logic.determinant([[2, 1], [1, 1]]), first)
+        self.assertEqual(logic.cache_stats()["hits"], 1)
+
+    def test_callers_cannot_change_cached_results(self):
+        A = [[2, 1], [1, 1]]
+        for operation in (logic.inverse, logic.rref):
+            with self.subTest(operation=operation.__name__):
+                result = operation(A)
+                expected = [row[:] for row in result]
+                result[0][0] = 99
+                self.assertEqual(operation(A), expected)
+
+    def test_disabled_cache_still_computes(self):
+        logic.configure_cache(0)
+        try:
+            self.assertEqual(logic.determinant([[1, 2], [3, 4]]), -2)
+            self.assertEqual(logic.cache_stats()["entries"], 0)
+        finally:
+            logic.configure_cache(256 * 2**20)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic
+
+def brute_force_cost(shapes):
+    """Cheapest multiply-add count over every parenthesization."""
+    if len(shapes) == 1:
+        return 0
+    return min(brute_force_cost(shapes[:k]) + brute_force_cost(shapes[k:]) + shapes[0][0] * shapes[k][0] * shapes[-1][1]
+               for k in range(1, len(shapes)))
+
+class ChainOrderTest(unittest.TestCase):
+    def test_textbook_example(self):
+        # CLRS 15.2: 30x35, 35x15, 15x5, 5x10, 10x20, 20x25
+        dims = [30, 35, 15, 5, 10, 20, 25]
+        shapes = list(zip(dims, dims[1:]))
+        _, cost = logic.chain_order(shapes)
+        self.assertEqual(cost, 15125)
+        names = list("ABCDEF")
+        plan = logic.multiplication_plan([[[0] * c for _ in range(r)] for r, c in shapes], names)
+        self.assertEqual(plan["order"], "((A·(B·C))·((D·E)·F))")
+        self.assertLess(plan["cost"], plan["left_to_right_cost"])
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(4)
+        for length in range(2, 7):
+            dims = rng.integers(1, 20, length + 1).tolist()
+            shapes = list(zip(dims, dims[1:]))
+            with self.subTest(dims=dims):
+                self.assertEqual(logic.chain_order(shapes)[1], brute_force_cost(shapes))
+
+    def test_product_unchanged_by_reordering(self):
+        rng = np.random.default_rng(5)
+        dims = [3, 9, 2, 8, 1, 4]
+        ints = [rng.integers(-5, 5, (r, c)) for r, c in zip(dims, dims[1:])]
+        expected = sp.Matrix(ints[0].tolist())
+        for m in ints[1:]:
+            expected = expected * sp.Matrix(m.tolist())
+        self.assertEqual(sp.Matrix(logic.multiply_matrices(ints)), expected)
+        exact = [[[sp.Rational(int(v), 3) for v in row] for row in m.tolist()] for m in ints]
+        self.assertEqual(sp.Matrix(logic.multiply_matrices(exact)), expected / 3 ** len(ints))
+
+    def test_incompatible_chain(self):
+        with self.assertRaises(ValueError):
+            logic.multiply_matrices([[[1, 2]], [[1, 2]]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+from src import cli
+
+SCRIPT = """# a comment
+A:
+1, 2
+3, 4
+
+B:
+x  1
+0  x
+
+det A
+multiply A B
+power A 3
+scalar A 1/2
+solve A B
+eval inv(A)*B + T(A)*B
+"""
+
+class ParseScriptTest(unittest.TestCase):
+    def test_jobs_in_order(self):
+        jobs = cli.parse_script(SCRIPT)
+        self.assertEqual([job["operation"] for job in jobs],
+                         ["determinant", "matrix_multiply", "matrix_power", "scalar_multiply", "solve", "expression"])
+        self.assertEqual(jobs[0]["source"], "<stdin>:10")
+        self.assertEqual(jobs[2]["argument"], "3")
+
+    def test_errors_name_the_line(self):
+        for script, message in (("frobnicate A", "unknown operation"), ("det A", "undefined matrix"),
+                                ("A:\n1\n\nsolve A", "needs two matrices"), ("A:\n1\n\npower A", "needs a power")):
+            with self.subTest(script=script):
+                with self.assertRaisesRegex(ValueError, message):
+                    cli.parse_script(script, "s.txt")
+
+class RunTest(unittest.TestCase):
+    def test_results_match_the_gui_operations(self):
+        records = [cli.run_job(job) for job in cli.parse_script(SCRIPT)]
+        self.assertEqual(records[0]["result"], "-2")
+        self.assertEqual(records[1]["result"], [["x", "2*x + 1"], ["3*x", "4*x + 3"]])
+        self.assertEqual(records[2]["result"], [["37", "54"], ["81", "118"]])
+        self.assertEqual(records[3]["result"], [["1/2", "1"], ["3/2", "2"]])
+        self.assertEqual(records[4]["result"], [["-2*x", "x - 2"], ["3*x/2", "3/2 - x/2"]])
+        self.assertNotIn("error", records[5])
+
+    def test_job_errors_are_reported_not_raised(self):
+        jobs = cli.parse_script("A:\n1, 2\n2, 4\n\ninv A\n")
+        self.assertIn("singular", cli.run_job(jobs[0])["error"])
+
+    def test_main_writes_json_and_exit_status(self):
+        with tempfile.TemporaryDirectory() as directory:
+            script, output = os.path.join(directory, "jobs.txt"), os.path.join(directory, "out.json")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write("A:\n1, 2\n3, 4\n\ndet A\ninv A\nB:\n1, 2\n2, 4\n\ninv B\n")
+            status = cli.main([script, "--format", "json", "--workers", "1", "-o", output])
+            with open(output, encoding="utf-8") as f:
+                records = json.load(f)
+        self.assertEqual(status, 1)
+        self.assertEqual([r["operation"] for r in records], ["determinant", "inverse", "inverse"])
+        self.assertEqual(records[1]["result"], [["-2", "1"], ["3/2", "-1/2"]])
+        self.assertIn("error", records[2])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic
+
+x = sp.Symbol("x")
+
+EXACT = [[2, 1, 3], [4, sp.Rational(1, 2), 1], [0, 5, -1]]
+SINGULAR = [[1, 2, 3], [2, 4, 6], [1, 0, 1]]
+SYMBOLIC = [[x, 1], [2, x]]
+
+class RrefTest(unittest.TestCase):
+    def setUp(self):
+        logic.clear_cache()
+
+    def test_matches_sympy(self):
+        for matrix in (EXACT, SINGULAR, [[1, 2, 3, 4], [2, 4, 6, 8]], SYMBOLIC):
+            with self.subTest(matrix=matrix):
+                R, pivots = sp.Matrix(matrix).rref()
+                self.assertEqual(sp.simplify(sp.Matrix(logic.rref(matrix)) - R), sp.zeros(*R.shape))
+                self.assertEqual(logic.rank(matrix), len(pivots))
+
+    def test_float_rref(self):
+        A = np.array([[1.0, 2.0, 3.0], [2.0, 4.5, 6.0], [0.5, 1.0, 1.5]])
+        R = logic.rref(A.tolist())
+        self.assertTrue(np.allclose(R, np.array(sp.Matrix(A.tolist()).rref()[0].tolist(), dtype=float)))
+        self.assertEqual(logic.rank(A.tolist()), 2)
+
+    def test_nullspace_solves_ax_zero(self):
+        for matrix in (SINGULAR, [[1, 2, 3, 4], [2, 4, 6, 8]]):
+            with self.subTest(matrix=matrix):
+                N = sp.Matrix(logic.nullspace(matrix))
+                self.assertEqual(sp.Matrix(matrix) * N, sp.zeros(len(matrix), N.cols))
+                self.assertEqual(N.cols, len(sp.Matrix(matrix).nullspace()))
+        self.assertEqual(logic.nullspace(EXACT), [[0], [0], [0]])
+
+class DecompositionTest(unittest.TestCase):
+    def setUp(self):
+        logic.clear_cache()
+
+    def assert_lu(self, matrix, factors, exact=True):
+        P, L, U = (sp.Matrix(factors[k]) for k in "PLU")
+        self.assertTrue(L.is_lower and U.is_upper)
+        self.assertTrue(all(float(L[i, i]) == 1 for i in range(L.rows)))
+        if exact:
+            self.assertEqual(sp.simplify(P * sp.Matrix(matrix) - L * U), sp.zeros(*U.shape))
+        else:
+            self.assertTrue(np.allclose(np.array(P * sp.Matrix(matrix) - L * U, dtype=float), 0))
+
+    def test_lu(self):
+        for matrix in (EXACT, [[0, 1], [1, 1]], SINGULAR, SYMBOLIC):
+            with self.subTest(matrix=matrix):
+                self.assert_lu(matrix, logic.lu_decomposition(matrix))
+        floats = [[0.5, 2.0, 1.0], [4.0, 1.0, 3.0], [1.5, 0.25, 2.0]]
+        self.assert_lu(floats, logic.lu_decomposition(floats), exact=False)
+
+    def test_lu_non_square(self):
+        with self.assertRaises(ValueError):
+            logic.lu_decomposition([[1, 2, 3]])
+
+    def test_qr(self):
+        for matrix in (EXACT, [[1.0, 2.0], [3.0, 4.0], [5.0, 6.5]]):
+            with self.subTest(matrix=matrix):
+                factors = logic.qr_decomposition(matrix)
+                Q = np.array(sp.Matrix(factors["Q"]).evalf(), dtype=float)
+                R = np.array(sp.Matrix(factors["R"]).evalf(), dtype=float)
+                self.assertTrue(np.allclose(Q @ R, np.array(sp.Matrix(matrix).evalf(), dtype=float)))
+                self.assertTrue(np.allclose(Q.T @ Q, np.eye(Q.shape[1])))
+                self.assertTrue(np.allclose(R, np.triu(R)))
+
+    def test_cholesky(self):
+        A = [[4, 2, 0], [2, 5, 1], [0, 1, 3]]
+        L = sp.Matrix(logic.cholesky_decomposition(A)["L"])
+        self.assertEqual(L, sp.Matrix(A).cholesky())
+        floats = [[4.0, 1.0], [1.0, 3.0]]
+        self.assertTrue(np.allclose(logic.cholesky_decomposition(floats)["L"], np.linalg.cholesky(floats)))
+        for matrix in ([[1, 2], [3, 4]], [[1, 2], [2, 1]], [[1.0, 2.0], [2.0, 1.0]]):
+            with self.subTest(matrix=matrix):
+                with self.assertRaises(ValueError):
+                    logic.cholesky_decomposition(matrix)
+
+    def test_gauss_transformation(self):
+        A = [[2.0, 1.0, -1.0], [-3.0, -1.0, 2.0], [-2.0, 1.0, 2.0]]
+        U = np.array(logic.gauss_transformation(A))
+        self.assertTrue(np.allclose(U, np.triu(U)))
+        self.assertAlmostEqual(abs(np.prod(np.diag(U))), abs(np.linalg.det(A)))
+
+if __name__ == "__main__":
+    unittest.main()
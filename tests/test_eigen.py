@@ -0,0 +1,43 @@
+import unittest
+import sympy as sp
+from src import eigen, logic
+
+def listed_values(text):
+    """The eigenvalue texts of an eigenvalues() report."""
+    return [line.split("λ = ")[1].split(" (multiplicity")[0] for line in text.splitlines() if "λ = " in line]
+
+class NumericEigenTest(unittest.TestCase):
+    def test_complex_eigenvalue_to_30_digits(self):
+        sqrt2 = sp.N(sp.sqrt(2), 30)
+        values = listed_values(logic.eigenvalues([[1, -2], [1, 1]], mode="numeric", digits=30))
+        self.assertEqual(values, [f"1.0 - {sqrt2}*I", f"1.0 + {sqrt2}*I"])
+
+    def test_high_precision_matches_exact(self):
+        A = [[2, 1, 0], [1, 3, 1], [0, 1, 4]]
+        exact = sorted(sp.Matrix(A).eigenvals(multiple=True), key=lambda v: sp.N(v, 50))
+        values, _, solver = logic._numeric_eigensystem(A, 40, vectors=False)
+        self.assertEqual(solver, "symmetric/Hermitian")
+        for value, expected in zip(values, exact):
+            self.assertLess(abs(sp.N(sp.Float(value.real, 45) - expected, 50)), sp.Float("1e-38"))
+
+    def test_double_precision_matches_exact(self):
+        A = [[4, 1], [2, 3]]
+        values = listed_values(logic.eigenvalues(A, mode="numeric", digits=10))
+        self.assertEqual(values, ["2", "5"])
+
+    def test_hermitian_detection_agrees_across_precisions(self):
+        hermitian, complex_symmetric = [[2, 1 + sp.I], [1 - sp.I, 3]], [[2, 1 + sp.I], [1 + sp.I, 3]]
+        for digits in (10, 30):
+            with self.subTest(digits=digits):
+                self.assertEqual(logic._numeric_eigensystem(hermitian, digits, False)[2], "symmetric/Hermitian")
+                self.assertEqual(logic._numeric_eigensystem(complex_symmetric, digits, False)[2], "general")
+        # Complex symmetric input must not go to the Hermitian solver: its eigenvalues are not real
+        values = listed_values(logic.eigenvalues(complex_symmetric, mode="numeric", digits=30))
+        self.assertTrue(all("I" in v for v in values))
+
+    def test_format_number_drops_negligible_parts(self):
+        self.assertEqual(eigen.format_number(complex(2, 1e-20), 10), "2")
+        self.assertEqual(eigen.format_number(complex(1e-20, -3), 10), "-3*I")
+
+if __name__ == "__main__":
+    unittest.main()
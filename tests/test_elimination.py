@@ -0,0 +1,62 @@
+import random
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic
+
+x, y = sp.symbols("x y")
+
+def random_exact(rng, n, fractions=False):
+    pick = (lambda: sp.Rational(rng.randint(-9, 9), rng.randint(1, 9))) if fractions else (lambda: sp.Integer(rng.randint(-9, 9)))
+    return [[pick() for _ in range(n)] for _ in range(n)]
+
+class DeterminantInverseTest(unittest.TestCase):
+    """Elimination results against SymPy's, which the cofactor code matched."""
+    def setUp(self):
+        logic.clear_cache()
+
+    def test_exact(self):
+        rng = random.Random(1)
+        for n in (1, 2, 3, 5, 8):
+            for fractions in (False, True):
+                with self.subTest(n=n, fractions=fractions):
+                    A = random_exact(rng, n, fractions)
+                    M = sp.Matrix(A)
+                    self.assertEqual(logic.determinant(A), M.det())
+                    if M.det() != 0:
+                        self.assertEqual(sp.Matrix(logic.inverse(A)), M.inv())
+
+    def test_integer_array(self):
+        A = logic.parse_matrix("2, -1, 0\n-1, 2, -1\n0, -1, 2")
+        self.assertEqual(logic.determinant(A), 4)
+        self.assertEqual(sp.Matrix(logic.inverse(A)), sp.Matrix(A.tolist()).inv())
+
+    def test_float(self):
+        rng = np.random.default_rng(1)
+        A = rng.uniform(-1, 1, (6, 6)) + 6 * np.eye(6)
+        self.assertAlmostEqual(logic.determinant(A.tolist()), np.linalg.det(A), places=8)
+        self.assertTrue(np.allclose(logic.inverse(A.tolist()), np.linalg.inv(A)))
+
+    def test_symbolic(self):
+        A = [[x, 1, 0], [1, y, 1], [0, 1, x]]
+        M = sp.Matrix(A)
+        self.assertEqual(sp.expand(logic.determinant(A) - M.det()), 0)
+        self.assertEqual(sp.simplify(sp.Matrix(logic.inverse(A)) - M.inv()), sp.zeros(3, 3))
+
+    def test_big_integers_stay_exact(self):
+        A = [[10**20 + 1, 10**20], [10**20, 10**20 - 1]]
+        self.assertEqual(logic.determinant(A), sp.Matrix(A).det())
+
+    def test_singular(self):
+        for A in ([[1, 2], [2, 4]], [[1.0, 2.0], [2.0, 4.0]], [[x, x], [x, x]]):
+            with self.subTest(A=A):
+                self.assertTrue(sp.simplify(logic.determinant(A)).is_zero)
+                with self.assertRaises(ValueError):
+                    logic.inverse(A)
+
+    def test_non_square(self):
+        with self.assertRaises(ValueError):
+            logic.determinant([[1, 2, 3], [4, 5, 6]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+import sympy as sp
+from src import logic
+
+def random_text(rng, n, m=None, big=False):
+    """A matrix of integers and fractions, with a fraction first so it is never all integers."""
+    hi = 10**12 if big else 9
+    fraction = lambda: f"{rng.randint(-hi, hi)}/{rng.randint(2, hi)}"
+    cells = [[rng.choice([fraction, lambda: str(rng.randint(-hi, hi))])() for _ in range(m or n)] for _ in range(n)]
+    cells[0][0] = fraction()
+    return "\n".join(", ".join(row) for row in cells)
+
+class ScaledRationalTest(unittest.TestCase):
+    """The scaled-integer fast path against SymPy's own rational arithmetic."""
+    def assert_exact(self, result, expected):
+        self.assertEqual(sp.Matrix(result), expected)
+        for row in result:
+            for x in row:
+                self.assertIsInstance(x, sp.Rational)
+
+    def test_matches_sympy(self):
+        rng = random.Random(17)
+        for big in (False, True):
+            for n in (1, 3, 6):
+                with self.subTest(big=big, n=n):
+                    A, B, C = (logic.parse_matrix(random_text(rng, n, big=big)) for _ in range(3))
+                    MA, MB, MC = sp.Matrix(A), sp.Matrix(B), sp.Matrix(C)
+                    self.assert_exact(logic.add_matrices([A, B, C]), MA + MB + MC)
+                    self.assert_exact(logic.subtract_matrices([A, B]), MA - MB)
+                    self.assert_exact(logic.multiply_matrices([A, B, C]), MA * MB * MC)
+                    self.assert_exact(logic.elementwise_multiply([A, B]), MA.multiply_elementwise(MB))
+                    self.assert_exact(logic.matrix_power(A, 5), MA ** 5)
+                    self.assert_exact(logic.scalar_multiply(A, sp.Rational(-5, 6)), MA * sp.Rational(-5, 6))
+                    if MA.det() != 0:
+                        self.assert_exact(logic.matrix_power(A, -2), MA ** -2)
+
+    def test_same_types_as_inverse(self):
+        A = logic.parse_matrix("1, 2\n3, 4")
+        power, inverse = logic.matrix_power(A, -2), logic.inverse(A)
+        self.assertTrue(all(isinstance(x, sp.Rational) for row in power + inverse for x in row))
+        self.assertEqual(sp.Matrix(power), sp.Matrix(inverse) ** 2)
+
+    def test_integer_valued_results(self):
+        result = logic.add_matrices([logic.parse_matrix("1/2, 1/3"), logic.parse_matrix("1/2, 2/3")])
+        self.assertEqual(result, [[1, 1]])
+        self.assertTrue(all(isinstance(x, sp.Integer) for x in result[0]))
+
+    def test_symbols_fall_back_to_sympy(self):
+        result = logic.add_matrices([logic.parse_matrix("x, 1/2"), logic.parse_matrix("1/2, 1/2")])
+        self.assertEqual(result, [[sp.Symbol("x") + sp.Rational(1, 2), 1]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import ast
+import unittest
+from unittest import mock
+import numpy as np
+import sympy as sp
+from src import expression, logic
+
+x = sp.Symbol("x")
+OPERANDS = {
+    "numeric": {"A": [[4.0, 1.0, 0.5], [1.0, 3.0, 0.0], [0.5, 2.0, 5.0]], "B": [[1.0, 2.0, 0.0], [0.0, 1.0, 3.0], [2.0, 0.0, 1.0]]},
+    "exact": {"A": [[2, 1, 0], [1, 3, 1], [0, 1, 4]], "B": [[1, 2, 0], [0, 1, 3], [2, 0, 1]]},
+    "symbolic": {"A": [[2, 1, 0], [1, 3, 1], [0, 1, 4]], "B": [[x, 1, 0], [0, x, 3], [2, 0, 1]]},
+}
+TEXTS = ["inv(A)*B + T(A)*B", "B*inv(A)", "A^-1*B*A^-1", "det(A*B)", "det(T(A)) + trace(T(B))", "T(T(A))*B",
+         "det(inv(A))", "rank(T(A))", "A*B*A + 2*A", "solve(A, B) - inv(A)*B", "2*A^3 - trace(B)*A"]
+
+def unrewritten(text, shapes):
+    """The expression as written, without any rewrite."""
+    builder = expression._Builder(shapes)
+    return expression.Expression(text, builder.build(ast.parse(text.replace("^", "**"), mode="eval").body), [])
+
+def assert_same(test, a, b, kind):
+    a, b = sp.Matrix(a if isinstance(a, list) else [[a]]), sp.Matrix(b if isinstance(b, list) else [[b]])
+    test.assertEqual(a.shape, b.shape)
+    if kind == "numeric":
+        test.assertTrue(np.allclose(np.array(a.evalf(), dtype=complex), np.array(b.evalf(), dtype=complex)))
+    else:
+        test.assertEqual(sp.simplify(a - b), sp.zeros(*a.shape))
+
+class RewriteTest(unittest.TestCase):
+    def evaluate_both(self, text, matrices):
+        shapes = {name: (len(m), len(m[0])) for name, m in matrices.items()}
+        return (expression.evaluate(expression.parse(text, shapes), matrices),
+                expression.evaluate(unrewritten(text, shapes), matrices))
+
+    def test_rewritten_matches_unrewritten(self):
+        for kind, matrices in OPERANDS.items():
+            for text in TEXTS:
+                with self.subTest(kind=kind, text=text):
+                    logic.clear_cache()
+                    assert_same(self, *self.evaluate_both(text, matrices), kind)
+
+    def test_rewrites_are_applied(self):
+        parsed = expression.parse("trace(inv(A)*B) + det(A*B) + det(T(A))", {"A": (3, 3), "B": (3, 3)})
+        self.assertEqual(len(parsed.rewrites), 3)
+        self.assertNotIn("inverse", {n.op for n in expression._postorder(parsed.root)})
+
+    def test_solve_failure_falls_back_to_inverse(self):
+        matrices = OPERANDS["symbolic"]
+        expected = logic.multiply_matrices([logic.inverse(matrices["A"]), matrices["B"]])
+        with mock.patch.object(logic, "solve", side_effect=ValueError("unsupported operands")):
+            result = expression.evaluate(expression.parse("inv(A)*B", {"A": (3, 3), "B": (3, 3)}), matrices)
+        assert_same(self, result, expected, "symbolic")
+
+    def test_singular_operand_still_fails(self):
+        parsed = expression.parse("inv(A)*B", {"A": (2, 2), "B": (2, 2)})
+        with self.assertRaises(ValueError):
+            expression.evaluate(parsed, {"A": [[1, 2], [2, 4]], "B": [[1, 0], [0, 1]]})
+
+class DagTest(unittest.TestCase):
+    def test_shared_subexpression_computed_once(self):
+        parsed = expression.parse("A*B + A*B", {"A": (2, 2), "B": (2, 2)})
+        self.assertEqual(sum("A·B" in step for step in parsed.steps()), 1)
+
+    def test_huge_powers_are_not_folded(self):
+        parsed = expression.parse("2**10**10", {})
+        self.assertEqual(parsed.root.op, "pow")
+        self.assertEqual(expression.evaluate(expression.parse("2**3**2 + 1", {}), {}), 513)
+
+    def test_shape_errors(self):
+        with self.assertRaises(ValueError):
+            expression.parse("A*B", {"A": (2, 3), "B": (2, 3)})
+        with self.assertRaises(ValueError):
+            expression.parse("det(A)", {"A": (2, 3)})
+
+if __name__ == "__main__":
+    unittest.main()
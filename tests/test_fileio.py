@@ -0,0 +1,96 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+import sympy as sp
+from src import fileio, logic
+from src.sparse import SparseMatrix
+
+class SymFileTest(unittest.TestCase):
+    def write_sym(self, element):
+        handle, path = tempfile.mkstemp(suffix=".sym")
+        with os.fdopen(handle, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"format": fileio.SYM_FORMAT, "shape": [1, 1]}) + "\n")
+            f.write(json.dumps([element]) + "\n")
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_round_trip(self):
+        x = sp.Symbol("x", real=True)
+        matrix = [[sp.Rational(1, 3), sp.sqrt(2) + sp.I], [sp.Float("1.25", 40) * sp.sin(x), sp.Function("f")(x) - sp.oo]]
+        handle, path = tempfile.mkstemp(suffix=".sym")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        logic.save_matrix(matrix, path)
+        self.assertEqual(logic.load_matrix(path), matrix)
+
+    def test_rejects_code_in_strings(self):
+        marker = os.path.join(tempfile.gettempdir(), "sym-loader-ran-code")
+        payload = f"__import__('pathlib').Path({marker!r}).touch()"
+        for element in (f"Tuple({payload!r})", f"Lambda(Symbol('x'), {payload!r})", f"Add({payload!r}, Integer(1))",
+                        f"Float({payload!r})", f"sympify({payload!r})"):
+            with self.subTest(element=element):
+                with self.assertRaises(ValueError):
+                    logic.load_matrix(self.write_sym(element))
+                self.assertFalse(os.path.exists(marker))
+
+class NumericFileTest(unittest.TestCase):
+    def path(self, suffix):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return os.path.join(directory.name, "m" + suffix)
+
+    def round_trip(self, matrix, suffix):
+        path = self.path(suffix)
+        logic.save_matrix(matrix, path)
+        return logic.load_matrix(path)
+
+    def test_arrays_round_trip(self):
+        for matrix in (np.arange(12, dtype=np.int64).reshape(3, 4) - 5, np.array([[0.1, 1e-300], [np.pi, -2.5]])):
+            for suffix in (".npy", ".npz", ".csv"):
+                with self.subTest(dtype=matrix.dtype, suffix=suffix):
+                    loaded = self.round_trip(matrix, suffix)
+                    self.assertEqual(loaded.dtype, matrix.dtype)
+                    self.assertTrue(np.array_equal(loaded, matrix))
+
+    def test_large_files_are_memory_mapped(self):
+        matrix = np.arange(fileio.MMAP_MIN_BYTES // 8 + 64, dtype=np.int64).reshape(-1, 8)
+        for suffix in (".npy", ".npz"):
+            with self.subTest(suffix=suffix):
+                path = self.path(suffix)
+                if suffix == ".npz":
+                    np.savez(path, matrix=matrix)
+                else:
+                    np.save(path, matrix)
+                loaded = logic.load_matrix(path)
+                self.assertIsInstance(loaded, np.memmap)
+                self.assertTrue(np.array_equal(loaded, matrix))
+                self.assertTrue(np.array_equal(pickle.loads(pickle.dumps(loaded)), matrix))
+
+    def test_sparse_npz(self):
+        matrix = SparseMatrix.from_entries((300, 200), [0, 299], [5, 199], [2.5, -1.0])
+        loaded = self.round_trip(matrix, ".npz")
+        self.assertIsInstance(loaded, SparseMatrix)
+        self.assertEqual((loaded.shape, loaded.rows.tolist(), loaded.cols.tolist(), loaded.values.tolist()),
+                         ((300, 200), [0, 299], [5, 199], [2.5, -1.0]))
+
+    def test_csv_exact_and_symbolic(self):
+        x = sp.Symbol("x")
+        matrix = [[sp.Rational(1, 3), sp.sqrt(2)], [x + 1, sp.Integer(10) ** 30]]
+        self.assertEqual(sp.Matrix(self.round_trip(matrix, ".csv")), sp.Matrix(matrix))
+        path = self.path(".csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("1 2 3\n4 5\n")
+        with self.assertRaisesRegex(ValueError, "Line 2"):
+            logic.load_matrix(path)
+
+    def test_exact_matrices_need_sym(self):
+        with self.assertRaisesRegex(ValueError, ".sym"):
+            logic.save_matrix([[sp.Rational(1, 3)]], self.path(".npy"))
+        with self.assertRaisesRegex(ValueError, "Unsupported file type"):
+            logic.save_matrix([[1]], self.path(".txt"))
+
+if __name__ == "__main__":
+    unittest.main()
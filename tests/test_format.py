@@ -0,0 +1,56 @@
+import re
+import unittest
+from unittest import mock
+import sympy as sp
+from src import logic
+
+x = sp.Symbol("x")
+
+def reparse(text):
+    return sp.sympify(re.sub(r"√(\d+|[a-z])", r"sqrt(\1)", text).replace("√", "sqrt"))
+
+class FormatSymbolicTest(unittest.TestCase):
+    def setUp(self):
+        logic.clear_cache()
+
+    def test_atoms_print_unchanged(self):
+        for expr, text in ((sp.Integer(3), "3"), (sp.Rational(-1, 3), "-1/3"), (x, "x"), (sp.sqrt(2), "√2")):
+            with self.subTest(expr=expr):
+                self.assertEqual(logic.format_symbolic(expr), text)
+
+    def test_cheap_rewrites_keep_the_value(self):
+        for expr in (1 / sp.sqrt(2), (x**2 - 1) / (x - 1), sp.sqrt(x + 1), 1 / (1 + sp.sqrt(3)),
+                     sp.Integral(x, (x, 0, 1)), x / 2 + x / 3):
+            with self.subTest(expr=expr):
+                text = logic.format_symbolic(expr)
+                self.assertEqual(sp.simplify(reparse(text) - expr.doit()), 0)
+                self.assertLessEqual(len(text), len(str(expr)))
+        self.assertEqual(logic.format_symbolic((x**2 - 1) / (x - 1)), "x + 1")
+        self.assertEqual(logic.format_symbolic(1 / sp.sqrt(2)), "√2/2")
+
+    def test_full_simplify_matches_simplify(self):
+        expr = sp.sin(x)**2 + sp.cos(x)**2
+        self.assertEqual(logic.format_symbolic(expr), "sin(x)**2 + cos(x)**2")
+        self.assertEqual(logic.format_symbolic(expr, full_simplify=True), str(sp.simplify(expr)))
+
+    def test_no_budget_still_formats(self):
+        with mock.patch.object(logic, "FORMAT_TIME_BUDGET", -1):
+            self.assertEqual(reparse(logic.format_symbolic((x**2 - 1) / (x - 1))), (x**2 - 1) / (x - 1))
+
+    def test_unprintable_integers(self):
+        self.assertEqual(logic.format_symbolic(sp.Integer(10)**5000), "1.00000000000000e+5000")
+
+    def test_results_are_memoized(self):
+        logic.format_symbolic(x / 2 + x / 3)
+        logic.format_symbolic(x / 2 + x / 3)
+        self.assertEqual(logic._format_cached.cache_info().hits, 1)
+        self.assertEqual(logic.format_symbolic([1, 2]), "[1, 2]")
+
+class FormatMatrixTest(unittest.TestCase):
+    def test_columns_are_aligned(self):
+        text = logic.format_matrix([[1, sp.Rational(1, 2)], [sp.sqrt(3), 10]])
+        self.assertEqual(text, "[  1   1/2  ]\n[  √3  10   ]\n")
+        self.assertEqual(logic.format_matrix([]), "Empty matrix")
+
+if __name__ == "__main__":
+    unittest.main()
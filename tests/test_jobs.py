@@ -0,0 +1,61 @@
+import time
+import unittest
+from src import logic
+from src.jobs import JobRunner, WorkerPool
+
+def wait(runner, timeout=30):
+    """Polls until the runner is idle; returns the finished jobs in completion order."""
+    finished, deadline = [], time.monotonic() + timeout
+    while runner.busy():
+        if time.monotonic() > deadline:
+            raise AssertionError("jobs did not finish")
+        finished += runner.poll()
+        time.sleep(0.01)
+    return finished
+
+class JobRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.runner = JobRunner()
+        self.addCleanup(self.runner.shutdown)
+
+    def test_result_matches_in_process_call(self):
+        job = self.runner.submit("determinant", logic.determinant, [[1, 2], [3, 4]])
+        wait(self.runner)
+        self.assertEqual((job.status, job.result), ("done", logic.determinant([[1, 2], [3, 4]])))
+
+    def test_value_errors_come_back_as_value_errors(self):
+        job = self.runner.submit("inverse", logic.inverse, [[1, 2], [2, 4]])
+        wait(self.runner)
+        self.assertEqual(job.status, "failed")
+        self.assertIsInstance(job.error, ValueError)
+
+    def test_queued_jobs_run_in_order(self):
+        jobs = [self.runner.submit("trace", logic.trace, [[i]]) for i in range(4)]
+        self.assertEqual([job.id for job in wait(self.runner)], [job.id for job in jobs])
+        self.assertEqual([job.result for job in jobs], [0, 1, 2, 3])
+
+    def test_cancel_running_job(self):
+        slow = self.runner.submit("sleep", time.sleep, 60)
+        after = self.runner.submit("trace", logic.trace, [[7]])
+        self.assertIs(self.runner.cancel(slow), slow)
+        self.assertEqual(slow.status, "cancelled")
+        wait(self.runner)
+        self.assertEqual((after.status, after.result), ("done", 7))
+
+    def test_cancel_queued_job(self):
+        first = self.runner.submit("trace", logic.trace, [[1]])
+        queued = self.runner.submit("trace", logic.trace, [[2]])
+        self.runner.cancel(queued)
+        wait(self.runner)
+        self.assertEqual((first.status, queued.status), ("done", "cancelled"))
+
+class WorkerPoolTest(unittest.TestCase):
+    def test_map_keeps_order(self):
+        pool = WorkerPool(2)
+        self.addCleanup(pool.close)
+        self.assertEqual(pool.map(logic.trace, [([[1]],), ([[2]],)]), [1, 2])
+        with self.assertRaises(ValueError):
+            pool.map(logic.trace, [([[1, 2]],)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+import sympy as sp
+from src import parallel
+
+x = sp.Symbol("x")
+
+def python_product(A, B):
+    """The textbook triple loop on Python integers (or SymPy objects)."""
+    A, B = A.tolist(), B.tolist()
+    return [[sum(a * b for a, b in zip(row, column)) for column in zip(*B)] for row in A]
+
+class LimbProductTest(unittest.TestCase):
+    def test_matches_python_integers(self):
+        rng = np.random.default_rng(20)
+        for bits in (8, 31, 62, 100, 300):
+            A = np.array([[int(v) << (bits - 8) for v in row] for row in rng.integers(-2**7, 2**7, (9, 13)).tolist()], dtype=object)
+            B = np.array([[int(v) << (bits - 8) for v in row] for row in rng.integers(-2**7, 2**7, (13, 5)).tolist()], dtype=object)
+            with self.subTest(bits=bits):
+                C = parallel.matmul(A, B)
+                self.assertEqual(C.tolist(), python_product(A, B))
+
+    def test_int64_results_stay_int64(self):
+        A = np.arange(12, dtype=np.int64).reshape(3, 4) - 6
+        self.assertEqual(parallel.limb_product(A, A.T).dtype, np.int64)
+        self.assertTrue(np.array_equal(parallel.limb_product(A, A.T), A @ A.T))
+        big = np.full((2, 2), 2**40, dtype=np.int64)
+        self.assertEqual(parallel.limb_product(big, big).tolist(), python_product(big, big))
+
+    def test_too_wide_for_limbs(self):
+        A = np.array([[2**4000, 1], [3, -2**4000]], dtype=object)
+        self.assertIsNone(parallel.limb_product(A, A))
+        self.assertEqual(parallel.matmul(A, A).tolist(), python_product(A, A))
+
+    def test_zero_and_float(self):
+        self.assertTrue(np.array_equal(parallel.matmul(np.zeros((2, 3), dtype=np.int64), np.ones((3, 2), dtype=np.int64)),
+                                       np.zeros((2, 2))))
+        A = np.array([[0.5, 1.5], [2.0, -1.0]])
+        self.assertTrue(np.allclose(parallel.matmul(A, A), A @ A))
+
+class PooledProductTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(parallel.configure, parallel.worker_count())
+        self.addCleanup(parallel.shutdown)
+        parallel.configure(2)
+
+    def test_symbolic_blocks_match_sympy(self):
+        A = np.array([[x + i - j for j in range(12)] for i in range(10)], dtype=object)
+        B = np.array([[x * int(i == j) + j for j in range(9)] for i in range(12)], dtype=object)
+        C = parallel.matmul(A, B)
+        self.assertIsNotNone(parallel._pool)
+        self.assertEqual(sp.expand(sp.Matrix(C.tolist()) - sp.Matrix(A.tolist()) * sp.Matrix(B.tolist())), sp.zeros(10, 9))
+
+    def test_single_worker_stays_in_process(self):
+        parallel.configure(1)
+        A = np.array([[x, 1], [2, x]], dtype=object)
+        self.assertEqual(sp.expand(sp.Matrix(parallel.matmul(A, A).tolist())), sp.expand(sp.Matrix(A.tolist()) ** 2))
+        self.assertIsNone(parallel._pool)
+        with self.assertRaises(ValueError):
+            parallel.configure(0)
+
+if __name__ == "__main__":
+    unittest.main()
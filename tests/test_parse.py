@@ -0,0 +1,57 @@
+import re
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic
+from src.sparse import SparseMatrix
+
+def sympified(text):
+    """What parse_matrix produced before the tokenizer: sympify on every element."""
+    rows = [line.split(',') if ',' in line else line.split() for line in text.split('\n')]
+    return [[sp.sympify(re.sub(r'√(\d+|[a-z])', r'sqrt(\1)', e.strip()).replace('√', 'sqrt')) for e in row if e.strip()] for row in rows if any(map(str.strip, row))]
+
+class ParseMatrixTest(unittest.TestCase):
+    def test_plain_numbers_become_arrays(self):
+        ints = logic.parse_matrix("1 2\n-3 4")
+        self.assertEqual(ints.dtype, np.int64)
+        self.assertEqual(ints.tolist(), [[1, 2], [-3, 4]])
+        floats = logic.parse_matrix("1.5, 2e3\n.25, -4")
+        self.assertEqual(floats.dtype, np.float64)
+        self.assertEqual(floats.tolist(), [[1.5, 2000.0], [0.25, -4.0]])
+
+    def test_matches_sympify(self):
+        for text in ("1/2, 3\n-4/6, x", "√2 √(3)\n2*y 0.5", "1 2\n3 99999999999999999999999",
+                     "0.12345678901234567891 1\n2 3"):
+            with self.subTest(text=text):
+                self.assertEqual(sp.Matrix(logic.parse_matrix(text)), sp.Matrix(sympified(text)))
+
+    def test_exact_types_are_kept(self):
+        matrix = logic.parse_matrix("1/3, 2\n0.5, x")
+        self.assertIsInstance(matrix[0][0], sp.Rational)
+        self.assertIsInstance(matrix[0][1], sp.Integer)
+        self.assertIsInstance(matrix[1][0], sp.Float)
+        # Beyond double precision the literal stays a SymPy Float with all its digits
+        long = logic.parse_matrix("0.12345678901234567891 1")
+        self.assertIsInstance(long[0][0], sp.Float)
+        self.assertEqual(long[0][0], sp.Float("0.12345678901234567891"))
+
+    def test_malformed_numeric_text_falls_back(self):
+        self.assertEqual(sp.Matrix(logic.parse_matrix("1-2 3")), sp.Matrix([[-1, 3]]))
+
+    def test_division_by_zero(self):
+        for text in ("1/0 2", "2/(1-1) 1"):
+            with self.subTest(text=text):
+                with self.assertRaisesRegex(ValueError, "Division by zero"):
+                    logic.parse_matrix(text)
+
+    def test_coordinate_input(self):
+        matrix = logic.parse_matrix("3x3\n1, 1: 5\n3 2: 1/2")
+        self.assertIsInstance(matrix, SparseMatrix)
+        self.assertEqual(sp.Matrix(matrix.to_dense()), sp.Matrix([[5, 0, 0], [0, 0, 0], [0, sp.Rational(1, 2), 0]]))
+
+    def test_ragged_rows_are_returned_as_lists(self):
+        self.assertEqual(logic.parse_matrix("1 2\n3"), [[1, 2], [3]])
+        self.assertEqual(logic.parse_matrix("  \n"), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic
+
+n = sp.Symbol("n")
+
+class MatrixPowerTest(unittest.TestCase):
+    def setUp(self):
+        logic.clear_cache()
+
+    def test_integer_powers_match_repeated_products(self):
+        A = [[1, 1], [1, 0]]
+        for power in (0, 1, 2, 7, 30, 100):
+            with self.subTest(power=power):
+                self.assertEqual(sp.Matrix(logic.matrix_power(A, power)), sp.Matrix(A) ** power)
+
+    def test_large_power_stays_exact(self):
+        # Fibonacci numbers well beyond int64
+        self.assertEqual(logic.matrix_power([[1, 1], [1, 0]], 200)[0][1], sp.fibonacci(200))
+
+    def test_negative_powers(self):
+        A = [[2, 1], [1, 1]]
+        self.assertEqual(sp.Matrix(logic.matrix_power(A, -3)), sp.Matrix(A).inv() ** 3)
+        with self.assertRaises(ValueError):
+            logic.matrix_power([[1, 2], [2, 4]], -1)
+
+    def test_float_and_symbolic(self):
+        A = np.array([[0.5, 0.25], [0.125, 1.0]])
+        self.assertTrue(np.allclose(logic.matrix_power(A.tolist(), 9), np.linalg.matrix_power(A, 9)))
+        x = sp.Symbol("x")
+        self.assertEqual(sp.expand(sp.Matrix(logic.matrix_power([[x, 1], [0, x]], 5)) - sp.Matrix([[x, 1], [0, x]]) ** 5),
+                         sp.zeros(2, 2))
+
+    def test_symbolic_exponent_closed_form(self):
+        closed = sp.Matrix(logic.matrix_power([[2, 0], [0, 3]], n))
+        self.assertEqual(closed, sp.Matrix([[2**n, 0], [0, 3**n]]))
+        fib = sp.Matrix(logic.matrix_power([[1, 1], [1, 0]], n))
+        self.assertEqual(sp.simplify(fib.subs(n, 10)), sp.Matrix([[89, 55], [55, 34]]))
+
+    def test_non_square(self):
+        with self.assertRaises(ValueError):
+            logic.matrix_power([[1, 2, 3]], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+from src import logic, profiling
+
+class RunTest(unittest.TestCase):
+    def setUp(self):
+        logic.clear_cache()
+
+    def test_result_is_unchanged_and_calls_are_recorded(self):
+        A = [[2, 1], [1, 3]]
+        result, record = profiling.run("solve", logic.solve, (A, [[1], [2]]))
+        self.assertEqual(result, logic.solve(A, [[1], [2]]))
+        self.assertEqual([s["stage"] for s in record["stages"]], ["compute"])
+        self.assertEqual((record["calls"][0]["name"], record["calls"][0]["depth"]), ("solve", 0))
+        self.assertTrue(all(c["depth"] > 0 for c in record["calls"][1:]))
+
+    def test_calls_outside_run_are_not_recorded(self):
+        logic.determinant([[1, 2], [3, 4]])
+        self.assertIsNone(profiling._recorder.record)
+
+    def test_memory_and_dumps(self):
+        with tempfile.TemporaryDirectory() as directory:
+            _, record = profiling.run("inverse", logic.inverse, ([[1, 2], [3, 4]],), memory=True, dump_dir=directory)
+            self.assertIn("peak_bytes", record["stages"][0])
+            self.assertTrue(all(os.path.exists(path) for path in record["dumps"]))
+
+class SessionTest(unittest.TestCase):
+    def test_pending_stages_join_the_next_operation(self):
+        session = profiling.Session(size=2)
+        for wall in (0.25, 0.5):
+            session.pending["stages"].append({"stage": "parse", "wall": wall, "cpu": wall})
+        record = session.begin("determinant")
+        record["stages"].append({"stage": "format", "wall": 9.0, "cpu": 0.0})
+        session.finish(record)
+        self.assertEqual(record["stages"][0], {"stage": "parse", "wall": 0.75, "cpu": 0.75})
+        self.assertEqual(record["total"], 0.75)
+        for _ in range(3):
+            session.finish(session.begin("trace"), error=ValueError("bad"))
+        self.assertEqual([r["operation"] for r in session.records], ["trace", "trace"])
+
+    def test_export_and_aggregate(self):
+        session = profiling.Session()
+        for wall in (0.1, 0.2, 0.3):
+            record = session.begin("determinant")
+            record["stages"].append({"stage": "compute", "wall": wall, "cpu": wall})
+            record["calls"].append({"name": "determinant", "depth": 0, "wall": wall, "cpu": wall})
+            session.finish(record)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.jsonl")
+            self.assertEqual(session.export(path), 3)
+            with open(path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+        rows = {row["part"]: row for row in profiling.aggregate(records)}
+        self.assertEqual(set(rows), {"compute", "logic.determinant"})
+        self.assertEqual((rows["compute"]["count"], rows["compute"]["max"], rows["compute"]["p95"]), (3, 0.3, 0.3))
+        self.assertAlmostEqual(rows["compute"]["mean"], 0.2)
+
+    def test_format_record(self):
+        record = {"stages": [{"stage": "compute", "wall": 1.5, "cpu": 0.002}],
+                  "calls": [{"name": "f", "depth": d % 2, "wall": 0.001} for d in range(10)]}
+        lines = profiling.format_record(record)
+        self.assertEqual(lines[0], "Timing: compute 1.50 s (CPU 2.0 ms)")
+        self.assertEqual(lines[2], "    f 1.0 ms")
+        self.assertEqual(lines[-1], "  ... 2 more calls")
+
+if __name__ == "__main__":
+    unittest.main()
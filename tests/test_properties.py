@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic, sparse
+
+x = sp.Symbol("x", positive=True)
+r = sp.sqrt(2) / 2
+
+def reference(matrix):
+    """The properties worked out with SymPy, one by one."""
+    M = sp.Matrix(matrix)
+    square = M.is_square
+    offsets = [j - i for i in range(M.rows) for j in range(M.cols) if M[i, j] != 0]
+    lower, upper = max([0] + [-o for o in offsets]), max([0] + offsets)
+    return {
+        "symmetric": square and M == M.T,
+        "skew_symmetric": square and M == -M.T,
+        "diagonal": M.is_diagonal(),
+        "upper_triangular": M.is_upper,
+        "lower_triangular": M.is_lower,
+        "orthogonal": square and sp.simplify(M * M.T - sp.eye(M.rows)).is_zero_matrix is True,
+        "idempotent": square and sp.simplify(M * M - M).is_zero_matrix is True,
+        "positive_definite": square and M == M.T and M.is_positive_definite is True,
+        "banded": lower + upper + 1 <= 0.5 * M.cols,
+        "lower_bandwidth": lower,
+        "upper_bandwidth": upper,
+        "sparsity": 1 - len(offsets) / (M.rows * M.cols),
+    }
+
+CASES = {
+    "general": [[1, 2, 0], [3, 4, 5], [0, 6, 7]],
+    "symmetric definite": [[4, 1, 0], [1, 3, 1], [0, 1, 2]],
+    "symmetric indefinite": [[1, 2], [2, 1]],
+    "skew": [[0, 2, -1], [-2, 0, 3], [1, -3, 0]],
+    "diagonal": [[2, 0, 0], [0, 5, 0], [0, 0, 1]],
+    "upper": [[1, 2, 3], [0, 4, 5], [0, 0, 6]],
+    "permutation": [[0, 1, 0], [0, 0, 1], [1, 0, 0]],
+    "projection": [[1, 0], [1, 0]],
+    "rotation": [[r, -r], [r, r]],
+    "rational": [[sp.Rational(1, 2), sp.Rational(1, 3)], [sp.Rational(1, 3), sp.Rational(1, 4)]],
+    "symbolic": [[x, 1], [1, x + 2]],
+    "rectangular": [[1, 2, 3], [0, 4, 5]],
+    "tridiagonal": [[2 if i == j else -1 if abs(i - j) == 1 else 0 for j in range(8)] for i in range(8)],
+}
+
+class CharacteristicsTest(unittest.TestCase):
+    def setUp(self):
+        logic.clear_cache()
+
+    def test_matches_sympy(self):
+        for name, matrix in CASES.items():
+            with self.subTest(case=name):
+                self.assertEqual(logic.characteristics(matrix), reference(matrix))
+
+    def test_arrays_and_sparse_agree_with_rows(self):
+        for name in ("general", "symmetric definite", "skew", "permutation", "projection", "tridiagonal"):
+            matrix = CASES[name]
+            for form in (np.array(matrix, dtype=np.int64), np.array(matrix, dtype=float),
+                         sparse.SparseMatrix.from_dense(matrix)):
+                with self.subTest(case=name, form=type(form).__name__):
+                    self.assertEqual(logic.characteristics(form), reference(matrix))
+
+    def test_float_tolerance(self):
+        c, s = np.cos(0.3), np.sin(0.3)
+        result = logic.characteristics([[c, -s], [s, c]])
+        self.assertTrue(result["orthogonal"])
+        self.assertFalse(logic.characteristics([[c, -s], [s, c + 1e-6]])["orthogonal"])
+
+    def test_large_definite_matrices(self):
+        n = 80
+        band = [[4 if i == j else 1 if abs(i - j) == 1 else 0 for j in range(n)] for i in range(n)]
+        self.assertTrue(logic.characteristics(band)["positive_definite"])
+        band[n - 1][n - 2] = band[n - 2][n - 1] = 5
+        self.assertFalse(logic.characteristics(band)["positive_definite"])
+
+    def test_format_property(self):
+        self.assertEqual([logic.format_property(v) for v in (True, False, None, 0.25, 3)],
+                         ["✓ Yes", "✗ No", "? Not determined", "25.0%", "3"])
+
+if __name__ == "__main__":
+    unittest.main()
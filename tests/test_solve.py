@@ -0,0 +1,33 @@
+import unittest
+import sympy as sp
+from src import logic
+
+x = sp.Symbol("x")
+
+def residual(A, X, B):
+    return sp.simplify(sp.Matrix(A) * sp.Matrix(X) - sp.Matrix(B))
+
+class SolveTest(unittest.TestCase):
+    def test_exact_matrix_symbolic_rhs(self):
+        A, B = [[1, 2], [3, 4]], [[x, 1], [0, x]]
+        X = logic.solve(A, B)
+        self.assertEqual(residual(A, X, B), sp.zeros(2, 2))
+        self.assertEqual(sp.Matrix(X), sp.Matrix(A).LUsolve(sp.Matrix(B)).applyfunc(sp.expand))
+
+    def test_symbolic_matrix_exact_rhs(self):
+        A, B = [[x, 1], [1, 2]], [[1], [0]]
+        self.assertEqual(residual(A, logic.solve(A, B), B), sp.zeros(2, 1))
+
+    def test_float_matrix_symbolic_rhs(self):
+        A, B = [[1.5, 2], [3, 5]], [[x], [1]]
+        X = sp.Matrix(logic.solve(A, B))
+        self.assertLess(max(abs(c) for e in (sp.Matrix(A) * X - sp.Matrix(B)) for c in sp.Poly(e, x).coeffs()), 1e-12)
+
+    def test_singular_symbolic_system(self):
+        with self.assertRaises(ValueError):
+            logic.solve([[x, x], [x, x]], [[1], [1]])
+        with self.assertRaises(ValueError):
+            logic.solve([[1, 2], [2, 4]], [[x], [1]])
+
+if __name__ == "__main__":
+    unittest.main()
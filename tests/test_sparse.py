@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+import sympy as sp
+from src import logic, sparse
+from src.sparse import SparseMatrix
+
+x = sp.Symbol("x")
+
+def random_sparse(rng, shape, nnz=400):
+    dense = np.zeros(shape, dtype=np.int64)
+    dense.flat[rng.choice(dense.size, nnz, replace=False)] = rng.integers(1, 9, nnz) * rng.choice([-1, 1], nnz)
+    return dense
+
+def dense(matrix):
+    return np.array(matrix.to_dense() if isinstance(matrix, SparseMatrix) else matrix, dtype=object)
+
+class SparseOperationsTest(unittest.TestCase):
+    def setUp(self):
+        logic.clear_cache()
+        rng = np.random.default_rng(13)
+        self.a, self.b = random_sparse(rng, (120, 100)), random_sparse(rng, (120, 100))
+        self.c = random_sparse(rng, (100, 120))
+        self.A, self.B, self.C = (sparse.maybe_sparse(m) for m in (self.a, self.b, self.c))
+
+    def test_large_mostly_zero_matrices_become_sparse(self):
+        self.assertIsInstance(self.A, SparseMatrix)
+        self.assertEqual(self.A.nnz, np.count_nonzero(self.a))
+        self.assertIsInstance(sparse.maybe_sparse(np.ones((120, 100))), np.ndarray)
+        self.assertEqual(len(self.A[3]), 100)
+        self.assertEqual([self.A[i][j] for i, j in ((0, 0), (5, 7))], [self.a[0, 0], self.a[5, 7]])
+
+    def test_results_match_dense(self):
+        cases = (
+            (logic.add_matrices([self.A, self.B]), self.a + self.b),
+            (logic.subtract_matrices([self.A, self.B]), self.a - self.b),
+            (logic.multiply_matrices([self.A, self.C]), self.a @ self.c),
+            (logic.multiply_matrices([self.A, self.c]), self.a @ self.c),
+            (logic.multiply_matrices([self.c, self.A]), self.c @ self.a),
+            (logic.elementwise_multiply([self.A, self.B]), self.a * self.b),
+            (logic.transpose(self.A), self.a.T),
+        )
+        for i, (result, expected) in enumerate(cases):
+            with self.subTest(case=i):
+                self.assertTrue(np.array_equal(dense(result), expected.astype(object)))
+        self.assertEqual(logic.trace(logic.multiply_matrices([self.A, self.C])), np.trace(self.a @ self.c))
+
+    def test_exact_and_symbolic_values(self):
+        half = logic.scalar_multiply(self.A, sp.Rational(1, 2))
+        self.assertEqual(sp.Matrix(dense(half).tolist()), sp.Matrix(self.a.tolist()) / 2)
+        symbolic = logic.scalar_multiply(self.A, x)
+        self.assertEqual(sp.Matrix(dense(symbolic).tolist()), sp.Matrix(self.a.tolist()) * x)
+        self.assertEqual(sp.expand(logic.trace(logic.multiply_matrices([symbolic, self.C]))),
+                         x * int(np.trace(self.a @ self.c)))
+
+    def test_cancelling_entries_are_dropped(self):
+        self.assertEqual(logic.subtract_matrices([self.A, self.A]).nnz, 0)
+
+    def test_coordinate_entries(self):
+        m = SparseMatrix.from_entries((2, 3), [1, 0, 1], [2, 1, 2], [1, 5, 2])
+        self.assertEqual((m.rows.tolist(), m.cols.tolist(), m.values.tolist()), ([0, 1], [1, 2], [5, 3]))
+        with self.assertRaises(ValueError):
+            SparseMatrix.from_entries((2, 3), [2], [0], [1])
+
+if __name__ == "__main__":
+    unittest.main()
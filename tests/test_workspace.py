@@ -0,0 +1,101 @@
+import os
+import unittest
+from unittest import mock
+import numpy as np
+import sympy as sp
+from src import logic, sparse, workspace
+from src.workspace import Workspace
+
+x = sp.Symbol("x")
+
+MATRICES = {
+    "F": np.linspace(-1, 1, 64).reshape(8, 8),
+    "I": np.arange(64, dtype=np.int64).reshape(8, 8) - 30,
+    "Q": [[sp.Rational(i + 1, j + 2) for j in range(5)] for i in range(5)],
+    "S": [[x + i, sp.sqrt(2) * j] for i, j in ((1, 2), (3, 4))],
+    "L": [[0.5, 1.25], [-3.0, 1e-300]],
+    "Z": sparse.SparseMatrix.from_entries((200, 100), [3, 150], [7, 99], [sp.Rational(1, 3), 5]),
+}
+
+def same(a, b):
+    if isinstance(a, sparse.SparseMatrix):
+        a, b = a.to_dense(), b.to_dense()
+    return sp.Matrix(np.asarray(a, dtype=object).tolist()) == sp.Matrix(np.asarray(b, dtype=object).tolist())
+
+class WorkspaceTest(unittest.TestCase):
+    def setUp(self):
+        self.workspace = Workspace(max_bytes=2**30)
+        self.addCleanup(self.workspace.close)
+        patcher = mock.patch.object(workspace, "memory_is_low", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_put_and_get(self):
+        for name, matrix in MATRICES.items():
+            self.workspace.put(name, matrix, "input")
+        self.assertEqual(self.workspace.names(), list(MATRICES))
+        self.assertEqual(self.workspace.shapes()["Z"], (200, 100))
+        self.assertIs(self.workspace.get("Q"), MATRICES["Q"])
+        with self.assertRaises(ValueError):
+            self.workspace.get("missing")
+
+    def test_spilled_entries_come_back_unchanged(self):
+        with mock.patch.object(workspace, "SPILL_MIN_BYTES", 0):
+            for name, matrix in MATRICES.items():
+                self.workspace.put(name, matrix, "input")
+            self.workspace.configure(0)
+            self.assertEqual([e.location() for e in self.workspace.entries.values()], ["disk"] * len(MATRICES))
+            self.assertEqual(self.workspace.stats()["memory_bytes"], 0)
+            self.assertGreater(self.workspace.stats()["disk_bytes"], 0)
+            for name, matrix in MATRICES.items():
+                with self.subTest(name=name):
+                    self.assertTrue(same(self.workspace.get(name), matrix))
+            self.assertEqual(self.workspace.get("I").dtype, np.int64)
+            self.assertIsInstance(self.workspace.get("Q")[0][1], sp.Rational)
+            self.assertEqual(self.workspace.get("L")[1][1], 1e-300)
+
+    def test_least_recently_used_entry_spills_first(self):
+        with mock.patch.object(workspace, "SPILL_MIN_BYTES", 0):
+            size = logic.estimate_size(MATRICES["F"])
+            self.workspace.configure(2 * size)
+            for name in "ABC":
+                self.workspace.put(name, MATRICES["F"] + ord(name), "result")
+                self.workspace.get("A")
+            self.assertEqual({n: e.location() for n, e in self.workspace.entries.items()},
+                             {"A": "memory", "B": "disk", "C": "memory"})
+
+    def test_pinned_entries_stay_in_memory(self):
+        with mock.patch.object(workspace, "SPILL_MIN_BYTES", 0):
+            self.workspace.put("P", MATRICES["F"], "grid", pinned=True)
+            self.workspace.configure(0)
+            self.assertEqual(self.workspace.entries["P"].location(), "memory")
+
+    def test_remove_and_close_delete_spill_files(self):
+        with mock.patch.object(workspace, "SPILL_MIN_BYTES", 0):
+            self.workspace.put("A", MATRICES["Q"], "input")
+            self.workspace.put("B", MATRICES["S"], "input")
+            self.workspace.configure(0)
+            path, directory = self.workspace.entries["A"].path, self.workspace.directory
+            self.workspace.remove("A")
+            self.assertFalse(os.path.exists(path))
+            self.workspace.close()
+            self.assertFalse(os.path.exists(directory))
+
+    def test_names(self):
+        self.workspace.put("R1", [[1]], "result")
+        self.assertEqual(self.workspace.free_name("R"), "R2")
+        for name in ("A", "M_2", "big_matrix"):
+            self.assertTrue(workspace.valid_name(name), name)
+        for name in ("2A", "_A", "for", "inv", "T", "A-B", ""):
+            self.assertFalse(workspace.valid_name(name), name)
+            with self.assertRaises(ValueError):
+                self.workspace.put(name, [[1]], "input")
+        self.assertEqual(workspace.name_from("data 2024.csv"), "data_2024_csv")
+        self.assertTrue(workspace.valid_name(workspace.name_from("2x2")))
+
+    def test_budget_cannot_be_negative(self):
+        with self.assertRaises(ValueError):
+            self.workspace.configure(-1)
+
+if __name__ == "__main__":
+    unittest.main()